@@ -16,6 +16,8 @@
 import asyncio
 import decimal
 
+import sortedcontainers
+
 import async_channel.enums as channel_enums
 import octobot_commons.enums as commons_enums
 import octobot_commons.configuration as configuration
@@ -25,6 +27,79 @@ import octobot_trading.exchange_channel as exchanges_channel
 import octobot_trading.api as trading_api
 
 
+class _PriceThresholdsIndex:
+    """
+    PriceThreshold triggers of an exchange symbol sorted by target price.
+    Its single mark price consumer finds every crossed target price of an update by bisecting
+    between the previous and the current mark price.
+    """
+
+    def __init__(self, exchange_id, symbol):
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+        self.triggers = sortedcontainers.SortedKeyList(key=lambda trigger: trigger.target_price)
+        self.last_price = None
+        self.consumer = None
+
+    async def register_consumer(self):
+        self.consumer = await exchanges_channel.get_chan(
+            channels_name.OctoBotTradingChannelsName.MARK_PRICE_CHANNEL.value,
+            self.exchange_id
+        ).new_consumer(
+            self.mark_price_callback,
+            priority_level=channel_enums.ChannelConsumerPriorityLevels.MEDIUM.value,
+            symbol=self.symbol
+        )
+
+    async def mark_price_callback(
+            self, exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, mark_price
+    ):
+        for trigger in self.get_crossed_triggers(mark_price):
+            trigger.on_threshold_crossed()
+        self.last_price = mark_price
+
+    def get_crossed_triggers(self, mark_price) -> list:
+        if self.last_price is None:
+            return []
+        if mark_price > self.last_price:
+            # last_price < target_price <= mark_price
+            return self.triggers[
+                self.triggers.bisect_key_right(self.last_price):self.triggers.bisect_key_right(mark_price)
+            ]
+        # mark_price <= target_price < last_price
+        return self.triggers[
+            self.triggers.bisect_key_left(mark_price):self.triggers.bisect_key_left(self.last_price)
+        ]
+
+
+# price thresholds indexes by exchange id and symbol, shared by PriceThreshold triggers
+_PRICE_THRESHOLDS_INDEXES = {}
+
+
+async def _add_to_price_thresholds_index(trigger, exchange_id) -> _PriceThresholdsIndex:
+    key = (exchange_id, trigger.symbol)
+    try:
+        index = _PRICE_THRESHOLDS_INDEXES[key]
+    except KeyError:
+        # registered before awaiting: concurrently added triggers use the same index
+        index = _PRICE_THRESHOLDS_INDEXES[key] = _PriceThresholdsIndex(exchange_id, trigger.symbol)
+        try:
+            await index.register_consumer()
+        except Exception:
+            _PRICE_THRESHOLDS_INDEXES.pop(key, None)
+            raise
+    index.triggers.add(trigger)
+    return index
+
+
+async def _remove_from_price_thresholds_index(trigger, index):
+    index.triggers.remove(trigger)
+    if not index.triggers and _PRICE_THRESHOLDS_INDEXES.get((index.exchange_id, index.symbol)) is index:
+        _PRICE_THRESHOLDS_INDEXES.pop((index.exchange_id, index.symbol))
+        if index.consumer is not None:
+            await index.consumer.stop()
+
+
 class PriceThreshold(abstract_trigger_event.AbstractTriggerEvent):
     TARGET_PRICE = "target_price"
     SYMBOL = "symbol"
@@ -36,51 +111,28 @@ class PriceThreshold(abstract_trigger_event.AbstractTriggerEvent):
         self.waiter_task = None
         self.symbol = None
         self.target_price = None
-        self.last_price = None
         self.trigger_event = asyncio.Event()
         self.registered_consumer = False
-        self.consumers = []
+        self.price_thresholds_indexes = []
 
     async def _register_consumer(self):
         self.registered_consumer = True
         for exchange_id in trading_api.get_exchange_ids():
-            self.consumers.append(
-                await exchanges_channel.get_chan(
-                    channels_name.OctoBotTradingChannelsName.MARK_PRICE_CHANNEL.value,
-                    exchange_id
-                ).new_consumer(
-                    self.mark_price_callback,
-                    priority_level=channel_enums.ChannelConsumerPriorityLevels.MEDIUM.value,
-                    symbol=self.symbol
-                )
-            )
+            self.price_thresholds_indexes.append(await _add_to_price_thresholds_index(self, exchange_id))
 
-    async def mark_price_callback(
-            self, exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, mark_price
-    ):
+    def on_threshold_crossed(self):
         if self.should_stop:
             # do not go any further if the action has been stopped
             return
-        self._check_threshold(mark_price)
-        self._update_last_price(mark_price)
-
-    def _update_last_price(self, mark_price):
-        self.last_price = mark_price
-
-    def _check_threshold(self, mark_price):
-        if self.last_price is None:
-            return
-        if mark_price >= self.target_price > self.last_price or mark_price <= self.target_price < self.last_price:
-            # mark_price crossed self.target_price threshold
-            self.trigger_event.set()
+        self.trigger_event.set()
 
     async def stop(self):
         await super().stop()
         if self.waiter_task is not None and not self.waiter_task.done():
             self.waiter_task.cancel()
-        for consumer in self.consumers:
-            await consumer.stop()
-        self.consumers = []
+        for index in self.price_thresholds_indexes:
+            await _remove_from_price_thresholds_index(self, index)
+        self.price_thresholds_indexes = []
 
     async def _get_next_event(self):
         if self.should_stop:
@@ -123,8 +175,12 @@ class PriceThreshold(abstract_trigger_event.AbstractTriggerEvent):
 
     def apply_config(self, config):
         self.trigger_event.clear()
-        self.last_price = None
+        # indexes are sorted by target price
+        for index in self.price_thresholds_indexes:
+            index.triggers.remove(self)
         self.symbol = config[self.SYMBOL]
         self.target_price = decimal.Decimal(str(config[self.TARGET_PRICE]))
+        for index in self.price_thresholds_indexes:
+            index.triggers.add(self)
         self.trigger_only_once = config[self.TRIGGER_ONLY_ONCE]
         self.max_trigger_frequency = config[self.MAX_TRIGGER_FREQUENCY]
@@ -0,0 +1,103 @@
+#  This file is part of OctoBot (https://github.com/Drakkar-Software/OctoBot)
+#  Copyright (c) 2023 Drakkar-Software, All rights reserved.
+#
+#  OctoBot is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  OctoBot is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
+import decimal
+
+import mock
+import pytest
+
+import tentacles.Automation.trigger_events.price_threshold_event.price_threshold as price_threshold
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SYMBOL = "BTC/USDT"
+
+
+def _trigger(target_price, symbol=SYMBOL):
+    trigger = price_threshold.PriceThreshold()
+    trigger.apply_config({
+        price_threshold.PriceThreshold.SYMBOL: symbol,
+        price_threshold.PriceThreshold.TARGET_PRICE: target_price,
+        price_threshold.PriceThreshold.TRIGGER_ONLY_ONCE: False,
+        price_threshold.PriceThreshold.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    return trigger
+
+
+@pytest.fixture
+def channel_mock():
+    consumer = mock.Mock(stop=mock.AsyncMock())
+    channel = mock.Mock(new_consumer=mock.AsyncMock(return_value=consumer))
+    with mock.patch.object(price_threshold.trading_api, "get_exchange_ids", mock.Mock(return_value=["1", "2"])), \
+         mock.patch.object(price_threshold.exchanges_channel, "get_chan", mock.Mock(return_value=channel)):
+        yield channel
+    price_threshold._PRICE_THRESHOLDS_INDEXES.clear()
+
+
+async def _mark_price(exchange_id, mark_price, symbol=SYMBOL):
+    await price_threshold._PRICE_THRESHOLDS_INDEXES[(exchange_id, symbol)].mark_price_callback(
+        "binance", exchange_id, "BTC", symbol, decimal.Decimal(str(mark_price))
+    )
+
+
+def _triggered(triggers):
+    triggered = [trigger.target_price for trigger in triggers if trigger.trigger_event.is_set()]
+    for trigger in triggers:
+        trigger.trigger_event.clear()
+    return triggered
+
+
+async def test_shared_price_thresholds_index(channel_mock):
+    triggers = [_trigger(price) for price in (100, 200, 200, 300, 400)]
+    other_symbol_trigger = _trigger(250, symbol="ETH/USDT")
+    for trigger in triggers + [other_symbol_trigger]:
+        await trigger._register_consumer()
+    # one consumer per exchange and symbol
+    assert channel_mock.new_consumer.await_count == 4
+    assert [trigger.target_price for trigger in price_threshold._PRICE_THRESHOLDS_INDEXES[("1", SYMBOL)].triggers] \
+        == [100, 200, 200, 300, 400]
+
+    # no previous price
+    await _mark_price("1", 150)
+    assert _triggered(triggers) == []
+    await _mark_price("1", 300)
+    assert _triggered(triggers) == [200, 200, 300]
+    await _mark_price("1", 300)
+    assert _triggered(triggers) == []
+    await _mark_price("1", 99)
+    assert _triggered(triggers) == [100, 200, 200]
+    await _mark_price("1", 1000)
+    assert _triggered(triggers) == [100, 200, 200, 300, 400]
+    assert _triggered([other_symbol_trigger]) == []
+
+    # updated target price
+    triggers[0].apply_config({
+        price_threshold.PriceThreshold.SYMBOL: SYMBOL,
+        price_threshold.PriceThreshold.TARGET_PRICE: 500,
+        price_threshold.PriceThreshold.TRIGGER_ONLY_ONCE: False,
+        price_threshold.PriceThreshold.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    await _mark_price("1", 450)
+    assert _triggered(triggers) == [500]
+
+    # stopped triggers are removed from indexes, consumers are stopped with their last trigger
+    for trigger in triggers[1:]:
+        await trigger.stop()
+    await _mark_price("1", 350)
+    assert _triggered(triggers) == []
+    await triggers[0].stop()
+    assert list(price_threshold._PRICE_THRESHOLDS_INDEXES) == [("1", "ETH/USDT"), ("2", "ETH/USDT")]
+    assert channel_mock.new_consumer.return_value.stop.await_count == 2
@@ -14,9 +14,9 @@
 #  You should have received a copy of the GNU General Public
 #  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
 import asyncio
+import collections
 import decimal
 import time
-import sortedcontainers
 
 import async_channel.enums as channel_enums
 import octobot_commons.enums as commons_enums
@@ -74,14 +74,18 @@ class ProfitabilityThreshold(abstract_trigger_event.AbstractTriggerEvent):
         self._check_threshold(profitability_percent)
 
     def _update_profitability_by_time(self, profitability_percent):
-        self.profitability_by_time[int(time.time())] = profitability_percent
-        current_time = time.time()
-        for profitability_time in list(self.profitability_by_time):
-            if profitability_time - current_time > self.time_period:
-                self.profitability_by_time.pop(profitability_time)
+        # (time, profitability) by increasing time, at most one value per second
+        profitability_time = int(time.time())
+        if self.profitability_by_time and self.profitability_by_time[-1][0] == profitability_time:
+            self.profitability_by_time[-1] = (profitability_time, profitability_percent)
+        else:
+            self.profitability_by_time.append((profitability_time, profitability_percent))
+        # remove values that are older than the time period
+        while profitability_time - self.profitability_by_time[0][0] > self.time_period:
+            self.profitability_by_time.popleft()
 
     def _check_threshold(self, profitability_percent):
-        oldest_compared_profitability = next(iter(self.profitability_by_time.values()))
+        oldest_compared_profitability = self.profitability_by_time[0][1]
         if trading_constants.ZERO < self.percent_change <= profitability_percent - oldest_compared_profitability:
             # profitability_percent reached or when above self.percent_change
             self.trigger_event.set()
@@ -141,7 +145,7 @@ class ProfitabilityThreshold(abstract_trigger_event.AbstractTriggerEvent):
 
     def apply_config(self, config):
         self.trigger_event.clear()
-        self.profitability_by_time = sortedcontainers.SortedDict()
+        self.profitability_by_time = collections.deque()
         self.percent_change = decimal.Decimal(str(config[self.PERCENT_CHANGE]))
         self.time_period = config[self.TIME_PERIOD] * commons_constants.MINUTE_TO_SECONDS
         self.trigger_only_once = config[self.TRIGGER_ONLY_ONCE]
@@ -0,0 +1,104 @@
+#  This file is part of OctoBot (https://github.com/Drakkar-Software/OctoBot)
+#  Copyright (c) 2023 Drakkar-Software, All rights reserved.
+#
+#  OctoBot is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  OctoBot is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
+import decimal
+import gc
+import tracemalloc
+
+import mock
+import pytest
+
+import tentacles.Automation.trigger_events.profitability_threshold_event.profitability_threshold as profitability_threshold
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+START_TIME = 1700000000
+
+
+def _trigger(percent_change, time_period_minutes):
+    trigger = profitability_threshold.ProfitabilityThreshold()
+    trigger.apply_config({
+        profitability_threshold.ProfitabilityThreshold.PERCENT_CHANGE: percent_change,
+        profitability_threshold.ProfitabilityThreshold.TIME_PERIOD: time_period_minutes,
+        profitability_threshold.ProfitabilityThreshold.TRIGGER_ONLY_ONCE: False,
+        profitability_threshold.ProfitabilityThreshold.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    return trigger
+
+
+async def _callback(trigger, current_time, profitability_percent):
+    with mock.patch.object(profitability_threshold.time, "time", mock.Mock(return_value=current_time)):
+        await trigger.balance_profitability_callback(
+            "binance", "1", None, decimal.Decimal(str(profitability_percent)), None, None
+        )
+
+
+async def test_rolling_profitability_window():
+    trigger = _trigger(10, 1)
+    await _callback(trigger, START_TIME, 0)
+    # same second: value is replaced
+    await _callback(trigger, START_TIME + 0.5, 1)
+    assert list(trigger.profitability_by_time) == [(START_TIME, decimal.Decimal("1"))]
+    await _callback(trigger, START_TIME + 30, 5)
+    assert not trigger.trigger_event.is_set()
+    await _callback(trigger, START_TIME + 60, 11)
+    # compared to START_TIME profitability
+    assert trigger.trigger_event.is_set()
+    trigger.trigger_event.clear()
+    await _callback(trigger, START_TIME + 61, 11)
+    # START_TIME profitability is out of the window: compared to START_TIME + 30 profitability
+    assert [profitability_time for profitability_time, _ in trigger.profitability_by_time] == \
+        [START_TIME + 30, START_TIME + 60, START_TIME + 61]
+    assert not trigger.trigger_event.is_set()
+    await _callback(trigger, START_TIME + 200, -20)
+    assert list(trigger.profitability_by_time) == [(START_TIME + 200, decimal.Decimal("-20"))]
+    assert not trigger.trigger_event.is_set()
+
+
+async def test_negative_percent_change():
+    trigger = _trigger(-10, 1)
+    await _callback(trigger, START_TIME, 30)
+    await _callback(trigger, START_TIME + 10, 20)
+    assert trigger.trigger_event.is_set()
+
+
+async def test_rolling_profitability_window_soak():
+    # two days of one balance profitability update per second
+    time_period_minutes = 5
+    updates_count = 2 * 24 * 3600
+    trigger = _trigger(1000, time_period_minutes)
+    profitability = decimal.Decimal("1.5")
+    current_time = [START_TIME]
+    # not a Mock: mocks keep every call
+    with mock.patch.object(profitability_threshold.time, "time", lambda: current_time[0]):
+        tracemalloc.start()
+        try:
+            for second in range(updates_count):
+                current_time[0] = START_TIME + second
+                trigger._update_profitability_by_time(profitability)
+                trigger._check_threshold(profitability)
+                if second == updates_count // 10:
+                    gc.collect()
+                    warmed_up_memory, _ = tracemalloc.get_traced_memory()
+            gc.collect()
+            end_memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    # bounded window
+    assert len(trigger.profitability_by_time) == time_period_minutes * 60 + 1
+    # flat memory: a value per second would take megabytes
+    assert end_memory - warmed_up_memory < 10000
+    assert not trigger.trigger_event.is_set()
@@ -34,12 +34,13 @@ import octobot_commons.databases as databases
 import octobot_backtesting.data as data
 import octobot_trading.api as trading_api
 import octobot_trading.errors as trading_errors
-import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Backtesting.converters.exchanges.columnar_data_converter as columnar_data_converter
+import tentacles.Backtesting.importers.exchanges.columnar_exchange_importer as columnar_exchange_importer
 
 
 
 class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnapshotCollector):
-    IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
+    IMPORTER = columnar_exchange_importer.ColumnarExchangeDataImporter
     OHLCV = "ohlcv"
     KLINE = "kline"
 
@@ -85,6 +86,8 @@ class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnaps
     def finalize_database(self):
         if os.path.isfile(self.file_path):
             os.remove(self.file_path)
+        # built from the replaced data file
+        columnar_exchange_importer.ColumnarCandlesStorage(self.file_path).delete()
         os.rename(self.temp_file_path, self.file_path)
 
     async def _check_database_content(self):
@@ -179,6 +182,7 @@ class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnaps
         if should_stop_database:
             await self.database.stop()
             self.finalize_database()
+            await self._add_columnar_candles_storage()
         await self.fetch_exchange_manager.stop()
         self.exchange_manager = None
         self.in_progress = False
@@ -200,6 +204,12 @@ class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnaps
                                        symbols=json.dumps([symbol.symbol_str for symbol in self.symbols]),
                                        time_frames=json.dumps([tf.value for tf in self.time_frames]))
 
+    async def _add_columnar_candles_storage(self):
+        # read by IMPORTER in backtesting: no candle JSON parsing when running backtests on this data file
+        converter = columnar_data_converter.ColumnarDataConverter(self.file_path)
+        if await converter.can_convert():
+            await converter.convert()
+
     async def get_ticker_history(self, exchange, symbol):
         pass
 
@@ -247,43 +257,52 @@ class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnaps
             last_progress = progress_over_all_steps
         return last_progress
 
-    def find_candle(self, candles, timestamp):
-        for candle in candles:
-            if candle[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value] == timestamp:
-                return candle[-1], candle[0]
-        return None, None
-
     async def update_ohlcv(self, exchange, symbol, time_frame, time_frame_sec,
                            database_candles, current_bot_candles):
-        to_add_candles = []
         symbol_id = str(symbol)
+        cryptocurrency = self.exchange_manager.exchange.get_pair_cryptocurrency(symbol_id)
+        # index database candles by candle time once: reconciliation is O(database_candles + current_bot_candles)
+        database_candle_by_time = {
+            candle[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value]: candle
+            for candle in database_candles
+        }
+        to_add_candles = []
+        updated_candle_by_timestamp = {}
         for up_to_date_candle in current_bot_candles:
             current_candle_time = up_to_date_candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
-            equivalent_db_candle, candle_timestamp = self.find_candle(database_candles, current_candle_time)
-            if equivalent_db_candle is None:
+            try:
+                candle_timestamp, *_, equivalent_db_candle = database_candle_by_time[current_candle_time]
+            except KeyError:
                 to_add_candles.append(up_to_date_candle)
-            elif equivalent_db_candle != up_to_date_candle:
-                updated_value_by_column = {
-                    "candle": json.dumps(up_to_date_candle)
-                }
-                await self.database.update(backtesting_enums.ExchangeDataTables.OHLCV,
-                                           updated_value_by_column=updated_value_by_column,
-                                           exchange_name=exchange,
-                                           cryptocurrency=
-                                           self.exchange_manager.exchange.get_pair_cryptocurrency(symbol_id),
-                                           symbol=symbol.symbol_str,
-                                           time_frame=time_frame.value,
-                                           timestamp=str(candle_timestamp))
+                continue
+            if equivalent_db_candle != up_to_date_candle:
+                updated_candle_by_timestamp[candle_timestamp] = up_to_date_candle
+        if updated_candle_by_timestamp:
+            await self._update_ohlcv_candles(exchange, cryptocurrency, symbol.symbol_str, time_frame,
+                                             updated_candle_by_timestamp)
         if to_add_candles:
             await self.save_ohlcv(
                 exchange=exchange,
-                cryptocurrency=self.exchange_manager.exchange.get_pair_cryptocurrency(symbol_id),
-                symbol=symbol, time_frame=time_frame, candle=to_add_candles,
+                cryptocurrency=cryptocurrency,
+                symbol=symbol.symbol_str, time_frame=time_frame, candle=to_add_candles,
                 timestamp=[candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + time_frame_sec
                            for candle in to_add_candles],
                 multiple=True
             )
 
+    async def _update_ohlcv_candles(self, exchange, cryptocurrency, symbol, time_frame, candle_by_timestamp):
+        # SQLiteDatabase.update updates a single row: use one prepared statement and commit for every candle
+        async with self.database.aio_cursor() as cursor:
+            await cursor.executemany(
+                f"UPDATE {backtesting_enums.ExchangeDataTables.OHLCV.value} SET candle = ? "
+                f"WHERE timestamp = ? AND exchange_name = ? AND cryptocurrency = ? AND symbol = ? AND time_frame = ?",
+                [
+                    (json.dumps(candle), timestamp, exchange, cryptocurrency, symbol, time_frame.value)
+                    for timestamp, candle in candle_by_timestamp.items()
+                ]
+            )
+        await self.database.connection.commit()
+
     async def _check_ohlcv_integrity(self, database_candles):
         # ensure no timestamp is here twice
         all_timestamps = [candle[-1][0] for candle in database_candles]
@@ -20,3 +20,9 @@ from octobot_backtesting.collectors.exchanges.exchange_collector cimport Abstrac
 cdef class ExchangeHistoryDataCollector(AbstractExchangeHistoryCollector):
     cdef public object exchange
     cdef public object exchange_manager
+    cdef public int max_concurrent_fetches
+    cdef public dict progress_by_pair
+    cdef public bint is_resumed
+    cdef dict _pending_ohlcv
+    cdef object _database_lock
+    cdef bint _has_persisted_candles
@@ -13,17 +13,22 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import json
 import logging
 import os
 import time
 
 import octobot_backtesting.collectors as collector
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.data as backtesting_data
 import octobot_backtesting.enums as backtesting_enums
 import octobot_backtesting.errors as errors
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
 import octobot_commons.time_frame_manager as time_frame_manager
-import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Backtesting.converters.exchanges.columnar_data_converter as columnar_data_converter
+import tentacles.Backtesting.importers.exchanges.columnar_exchange_importer as columnar_exchange_importer
 
 try:
     import octobot_trading.api as trading_api
@@ -34,7 +39,12 @@ except ImportError:
 
 
 class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
-    IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
+    IMPORTER = columnar_exchange_importer.ColumnarExchangeDataImporter
+    # (symbol, time frame) pairs collected at the same time: requests are still spaced by the exchange rate limiter,
+    # collecting pairs concurrently avoids waiting for each request response before sending the next one
+    MAX_CONCURRENT_FETCHES = 5
+    # candles to fetch before writing them into the database
+    OHLCV_WRITE_BATCH_SIZE = 5000
 
     def __init__(self, config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
                  use_all_available_timeframes=False,
@@ -46,6 +56,13 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
                          start_timestamp=start_timestamp, end_timestamp=end_timestamp)
         self.exchange = None
         self.exchange_manager = None
+        self.max_concurrent_fetches = self.MAX_CONCURRENT_FETCHES
+        self.progress_by_pair = {}
+        self._pending_ohlcv = self._get_empty_pending_ohlcv()
+        self._database_lock = asyncio.Lock()
+        # True when collecting into the data file of an interrupted collection
+        self.is_resumed = False
+        self._has_persisted_candles = False
 
     async def start(self):
         self.should_stop = False
@@ -66,30 +83,28 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
 
             await self.check_timestamps()
 
-            # create description
-            await self._create_description()
+            if not await self._resume_interrupted_collection_if_any():
+                # create description
+                await self._create_description()
 
             self.total_steps = len(self.time_frames) * len(self.symbols)
             self.in_progress = True
 
             self.logger.info(f"Start collecting history on {self.exchange_name}")
-            for symbol_index, symbol in enumerate(self.symbols):
+            for symbol in self.symbols:
                 self.logger.info(f"Collecting history for {symbol}...")
                 await self.get_ticker_history(self.exchange_name, symbol)
                 await self.get_order_book_history(self.exchange_name, symbol)
                 await self.get_recent_trades_history(self.exchange_name, symbol)
-
-                for time_frame_index, time_frame in enumerate(self.time_frames):
-                    self.current_step_index = (symbol_index * len(self.time_frames)) + time_frame_index + 1
-                    self.logger.info(
-                        f"[{time_frame_index}/{len(self.time_frames)}] Collecting {symbol} history on {time_frame}...")
-                    await self.get_ohlcv_history(self.exchange_name, symbol, time_frame)
-                    await self.get_kline_history(self.exchange_name, symbol, time_frame)
+            await self._collect_time_frames_history()
         except Exception as err:
             await self.database.stop()
             should_stop_database = False
-            # Do not keep errored data file
-            if os.path.isfile(self.temp_file_path):
+            if self._is_resumable():
+                self.logger.warning(f"Keeping collected data in {self.temp_file_path}: the collection will be "
+                                    f"resumed when restarting it with the same settings")
+            elif os.path.isfile(self.temp_file_path):
+                # Do not keep errored data file
                 os.remove(self.temp_file_path)
             if not self.should_stop:
                 self.logger.exception(err, True, f"Error when collecting {self.exchange_name} history for "
@@ -98,6 +113,147 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         finally:
             await self.stop(should_stop_database=should_stop_database)
 
+    def _is_resumable(self):
+        # only collections on a given time range can be resumed, collections stopped by the user are not
+        return self.start_timestamp is not None and self._has_persisted_candles and not self.should_stop
+
+    async def _resume_interrupted_collection_if_any(self):
+        """
+        Looks for the data file of an interrupted collection with the same settings and uses it when found.
+        Pairs are then collected starting from their last collected candle.
+        :return: True when an interrupted collection is resumed
+        """
+        if self.start_timestamp is None:
+            return False
+        file_prefix = f"{self.__class__.__name__}{backtesting_constants.BACKTESTING_DATA_FILE_SEPARATOR}"
+        for file_name in sorted(os.listdir(self.path), reverse=True):
+            file_path = os.path.join(self.path, file_name)
+            if file_path == self.temp_file_path or not file_name.startswith(file_prefix) \
+                    or not file_name.endswith(backtesting_constants.BACKTESTING_DATA_FILE_TEMP_EXT):
+                continue
+            try:
+                description = await backtesting_data.get_file_description(file_path)
+            except Exception as err:
+                # no collected candle in this file
+                self.logger.debug(f"Ignored {file_name} temporary data file: {err}")
+                continue
+            if description is None or not self._is_same_collection(description):
+                continue
+            self.logger.info(f"Resuming interrupted collection from {file_name}")
+            await self.database.stop()
+            os.remove(self.temp_file_path)
+            self.temp_file_path = file_path
+            self.file_path = file_path[:-len(backtesting_constants.BACKTESTING_DATA_FILE_TEMP_EXT)]
+            self.file_name = os.path.basename(self.file_path)
+            if self.end_timestamp is None:
+                # collect up to the initial collection end time
+                self.end_timestamp = description[backtesting_enums.DataFormatKeys.END_TIMESTAMP.value] \
+                    * commons_constants.MSECONDS_TO_SECONDS
+            self.database = None
+            self.create_database()
+            await self.database.initialize()
+            self.is_resumed = self._has_persisted_candles = True
+            return True
+        return False
+
+    def _is_same_collection(self, description):
+        return (
+            description[backtesting_enums.DataFormatKeys.EXCHANGE.value] == self.exchange_name
+            and description[backtesting_enums.DataFormatKeys.SYMBOLS.value]
+            == [symbol.symbol_str for symbol in self.symbols]
+            and description[backtesting_enums.DataFormatKeys.TIME_FRAMES.value] == self.time_frames
+            and description[backtesting_enums.DataFormatKeys.START_TIMESTAMP.value] == int(self.start_timestamp / 1000)
+            and (self.end_timestamp is None
+                 or description[backtesting_enums.DataFormatKeys.END_TIMESTAMP.value] == int(self.end_timestamp / 1000))
+        )
+
+    async def _get_last_collected_candle_close_time(self, symbol, time_frame):
+        """
+        Candles of a pair are written in time order: its last candle is its collection checkpoint
+        :return: the close time in milliseconds of the last collected candle of this pair, None if any
+        """
+        last_close_time = (await self.database.select_max(
+            backtesting_enums.ExchangeDataTables.OHLCV, ["timestamp"],
+            symbol=symbol.symbol_str, time_frame=time_frame.value
+        ))[0][0]
+        return None if last_close_time is None else float(last_close_time) * commons_constants.MSECONDS_TO_SECONDS
+
+    async def _collect_time_frames_history(self):
+        fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        self.progress_by_pair = {}
+        tasks = [
+            asyncio.create_task(self._collect_time_frame_history(fetch_semaphore, symbol, time_frame))
+            for symbol in self.symbols
+            for time_frame in self.time_frames
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # wait for cancelled tasks not to use the database or exchange after this call
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not self.should_stop:
+                # also save fetched candles on error for them not to be fetched again when resuming
+                await self._flush_ohlcv()
+
+    async def _collect_time_frame_history(self, fetch_semaphore, symbol, time_frame):
+        async with fetch_semaphore:
+            if self.should_stop:
+                return
+            self.logger.info(f"[{self.current_step_index}/{self.total_steps}] Collecting {symbol} history on "
+                             f"{time_frame}...")
+            self._update_progress(symbol, time_frame, 0)
+            await self.get_ohlcv_history(self.exchange_name, symbol, time_frame)
+            await self.get_kline_history(self.exchange_name, symbol, time_frame)
+            self.current_step_index += 1
+            self._update_progress(symbol, time_frame, None)
+
+    def _update_progress(self, symbol, time_frame, percent):
+        """
+        Sets current_step_percent to the average progress of the pairs being collected
+        :param percent: the progress of the given pair, None when its collection is over
+        """
+        if percent is None:
+            self.progress_by_pair.pop((symbol.symbol_str, time_frame), None)
+        else:
+            self.progress_by_pair[(symbol.symbol_str, time_frame)] = percent
+        self.current_step_percent = sum(self.progress_by_pair.values()) / len(self.progress_by_pair) \
+            if self.progress_by_pair else 0
+
+    def _get_empty_pending_ohlcv(self):
+        # ordered as database columns
+        return {
+            "timestamp": [],
+            "exchange_name": [],
+            "cryptocurrency": [],
+            "symbol": [],
+            "time_frame": [],
+            "candle": [],
+        }
+
+    async def _add_ohlcv(self, exchange, cryptocurrency, symbol, time_frame, candles, timestamps):
+        self._pending_ohlcv["timestamp"] += timestamps
+        self._pending_ohlcv["exchange_name"] += [exchange] * len(candles)
+        self._pending_ohlcv["cryptocurrency"] += [cryptocurrency] * len(candles)
+        self._pending_ohlcv["symbol"] += [symbol] * len(candles)
+        self._pending_ohlcv["time_frame"] += [time_frame.value] * len(candles)
+        self._pending_ohlcv["candle"] += [json.dumps(candle) for candle in candles]
+        if len(self._pending_ohlcv["timestamp"]) >= self.OHLCV_WRITE_BATCH_SIZE:
+            await self._flush_ohlcv()
+
+    async def _flush_ohlcv(self):
+        """
+        Writes pending candles of every collected pair at once
+        """
+        if not self._pending_ohlcv["timestamp"]:
+            return
+        pending_ohlcv = self._pending_ohlcv
+        self._pending_ohlcv = self._get_empty_pending_ohlcv()
+        async with self._database_lock:
+            await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV, **pending_ohlcv)
+        self._has_persisted_candles = True
+
     def _load_all_available_timeframes(self):
         allowed_timeframes = set(tf.value for tf in commons_enums.TimeFrames)
         self.time_frames = [commons_enums.TimeFrames(time_frame)
@@ -111,11 +267,18 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         if should_stop_database:
             await self.database.stop()
             self.finalize_database()
+            await self._add_columnar_candles_storage()
         self.exchange_manager = None
         self.in_progress = False
         self.finished = True
         return self.finished
 
+    async def _add_columnar_candles_storage(self):
+        # read by IMPORTER in backtesting: no candle JSON parsing when running backtests on this data file
+        converter = columnar_data_converter.ColumnarDataConverter(self.file_path)
+        if await converter.can_convert():
+            await converter.convert()
+
     async def get_ticker_history(self, exchange, symbol):
         pass
 
@@ -126,7 +289,6 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         pass
 
     async def get_ohlcv_history(self, exchange, symbol, time_frame):
-        self.current_step_percent = 0
         # use time_frame_sec to add time to save the candle closing time
         time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
         symbol_id = str(symbol)
@@ -139,28 +301,32 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
             ) * 1000
             if self.start_timestamp < first_candle_timestamp:
                 start_time = first_candle_timestamp
+            if self.is_resumed and \
+                    (last_close_time := await self._get_last_collected_candle_close_time(symbol, time_frame)):
+                if last_close_time >= end_time:
+                    self.logger.info(f"{symbol} {time_frame} history is already collected")
+                    return
+                # only fetch missing candles
+                start_time = max(start_time, last_close_time)
             async for hist_candles in trading_api.get_historical_ohlcv(self.exchange_manager, symbol_id, time_frame,
                                                                        start_time, end_time):
                 if hist_candles:
-                    self.current_step_percent = \
+                    pair_percent = \
                         (hist_candles[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value] - start_time / 1000) / \
                         ((end_time - start_time) / 1000) * 100
-                    self.logger.info(f"[{self.current_step_percent}%] historical data fetched for {symbol} {time_frame}")
-                    await self.save_ohlcv(
-                        exchange=exchange,
-                        cryptocurrency=cryptocurrency,
-                        symbol=symbol.symbol_str, time_frame=time_frame, candle=hist_candles,
-                        timestamp=[candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + time_frame_sec
-                                   for candle in hist_candles],
-                        multiple=True)
+                    self._update_progress(symbol, time_frame, pair_percent)
+                    self.logger.info(f"[{pair_percent}%] historical data fetched for {symbol} {time_frame}")
+                    await self._add_ohlcv(
+                        exchange, cryptocurrency, symbol.symbol_str, time_frame, hist_candles,
+                        [candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + time_frame_sec
+                         for candle in hist_candles]
+                    )
         else:
             try:
                 candles = await self.exchange.get_symbol_prices(symbol_id, time_frame)
                 if candles:
-                    await self.save_ohlcv(exchange=exchange,
-                                          cryptocurrency=cryptocurrency,
-                                          symbol=symbol.symbol_str, time_frame=time_frame, candle=candles,
-                                          timestamp=[candle[0] + time_frame_sec for candle in candles], multiple=True)
+                    await self._add_ohlcv(exchange, cryptocurrency, symbol.symbol_str, time_frame, candles,
+                                          [candle[0] + time_frame_sec for candle in candles])
                 else:
                     self.logger.error(f"No candles for {symbol} on {time_frame} ({exchange})")
             except trading_errors.FailedRequest as err:
@@ -172,12 +338,17 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
 
     async def check_timestamps(self):
         if self.start_timestamp is not None:
-            lowest_timestamp = min([
-                await self.get_first_candle_timestamp(
-                    self.start_timestamp, symbol, time_frame_manager.find_min_time_frame(self.time_frames)
-                )
+            min_time_frame = time_frame_manager.find_min_time_frame(self.time_frames)
+            fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+
+            async def _get_first_candle_timestamp(symbol):
+                async with fetch_semaphore:
+                    return await self.get_first_candle_timestamp(self.start_timestamp, symbol, min_time_frame)
+
+            lowest_timestamp = min(await asyncio.gather(*(
+                _get_first_candle_timestamp(symbol)
                 for symbol in self.symbols
-            ])
+            )))
             if lowest_timestamp > self.start_timestamp:
                 self.start_timestamp = lowest_timestamp
             if self.start_timestamp > (self.end_timestamp if self.end_timestamp else (time.time() * 1000)):
@@ -18,6 +18,7 @@ import os
 import contextlib
 import json
 import asyncio
+import mock
 
 import octobot_commons.databases as databases
 import octobot_commons.symbols as commons_symbols
@@ -28,6 +29,7 @@ import octobot_backtesting.errors as errors
 import octobot_trading.enums as trading_enums
 import tests.test_utils.config as test_utils_config
 import tentacles.Backtesting.collectors.exchanges as collector_exchanges
+import tentacles.Backtesting.importers.exchanges as importers_exchanges
 import tentacles.Trading.Exchange as tentacles_exchanges
 
 # All test coroutines will be treated as marked.
@@ -51,6 +53,8 @@ async def data_collector(exchange_name, tentacles_setup_config, symbols, time_fr
         await collector_instance.initialize()
         yield collector_instance
     finally:
+        if collector_instance.file_path:
+            importers_exchanges.ColumnarCandlesStorage(collector_instance.file_path).delete()
         if collector_instance.file_path and os.path.isfile(collector_instance.file_path):
             os.remove(collector_instance.file_path)
         if collector_instance.temp_file_path and os.path.isfile(collector_instance.temp_file_path):
@@ -171,6 +175,53 @@ async def test_collect_valid_date_range():
             assert end_time <= max_timestamp <= end_time + (31 * 24 * 60 * 60 * 1000)
 
 
+async def test_resume_interrupted_collection():
+    tentacles_setup_config = test_utils_config.load_test_tentacles_config()
+    symbols = ["ETH/BTC"]
+    time_frames = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+    start_time = 1569413160000
+    end_time = 1569914160000
+    async with data_collector(BINANCEUS, tentacles_setup_config, symbols, time_frames, False, start_time,
+                              end_time) as collector:
+        get_ohlcv_history = collector.get_ohlcv_history
+
+        async def _failing_get_ohlcv_history(exchange, symbol, time_frame):
+            if time_frame is commons_enums.TimeFrames.FOUR_HOURS:
+                raise RuntimeError("error")
+            await get_ohlcv_history(exchange, symbol, time_frame)
+
+        with mock.patch.object(collector, "get_ohlcv_history", _failing_get_ohlcv_history), \
+             pytest.raises(errors.DataCollectorError):
+            await collector.start()
+        # collected candles are kept
+        assert os.path.isfile(collector.temp_file_path)
+        assert not os.path.isfile(collector.file_path)
+
+        async with data_collector(BINANCEUS, tentacles_setup_config, symbols, time_frames, False, start_time,
+                                  end_time) as resumed_collector:
+            await resumed_collector.start()
+            assert resumed_collector.is_resumed
+            assert resumed_collector.file_path == collector.file_path
+            assert not os.path.isfile(collector.temp_file_path)
+            assert os.path.isfile(collector.file_path)
+            async with collector_database(resumed_collector) as database:
+                for time_frame in time_frames:
+                    time_frame_ohlcv = await database.select(enums.ExchangeDataTables.OHLCV,
+                                                             time_frame=time_frame.value)
+                    timestamps = [
+                        json.loads(candle[-1])[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+                        for candle in time_frame_ohlcv
+                    ]
+                    # ensure no duplicate
+                    assert len(set(timestamps)) == len(timestamps)
+                    # ensure no missing
+                    interval = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+                    assert sorted(timestamps) == list(range(min(timestamps), max(timestamps) + 1, interval))
+                    assert max(timestamps) * 1000 + interval * 1000 >= end_time
+                assert len(await database.select(enums.ExchangeDataTables.OHLCV,
+                                                 time_frame=commons_enums.TimeFrames.ONE_HOUR.value)) == 139
+
+
 async def test_collect_invalid_date_range():
     tentacles_setup_config = test_utils_config.load_test_tentacles_config()
     symbols = ["ETH/BTC"]
@@ -239,3 +290,90 @@ async def test_stop_collect():
         assert collector.exchange_manager is None
         assert not os.path.isfile(collector.temp_file_path)
         assert not os.path.isfile(collector.file_path)
+
+
+async def test_collect_time_frames_history_concurrently():
+    tentacles_setup_config = test_utils_config.load_test_tentacles_config()
+    symbols = ["ETH/BTC", "BTC/USDT", "LTC/BTC"]
+    time_frames = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+    async with data_collector(BINANCEUS, tentacles_setup_config, symbols, time_frames, False) as collector:
+        collector.max_concurrent_fetches = 2
+        collector.total_steps = len(symbols) * len(time_frames)
+        running_fetches = []
+        max_running_fetches = 0
+
+        async def get_ohlcv_history(exchange, symbol, time_frame):
+            nonlocal max_running_fetches
+            running_fetches.append((symbol, time_frame))
+            max_running_fetches = max(max_running_fetches, len(running_fetches))
+            await asyncio.sleep(0.01)
+            await collector._add_ohlcv(exchange, symbol.base, symbol.symbol_str, time_frame,
+                                       [[1, 2, 3, 4, 5, 6]], [1])
+            running_fetches.remove((symbol, time_frame))
+
+        collector.get_ohlcv_history = get_ohlcv_history
+        await collector._collect_time_frames_history()
+        assert max_running_fetches == 2
+        assert collector.current_step_index == collector.total_steps
+        assert collector.current_step_percent == 0
+        assert collector.progress_by_pair == {}
+        ohlcv = await collector.database.select(enums.ExchangeDataTables.OHLCV)
+        assert len(ohlcv) == len(symbols) * len(time_frames)
+        await collector.database.stop()
+
+
+async def test_collect_time_frames_history_progress():
+    symbols = ["ETH/BTC", "BTC/USDT"]
+    time_frames = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+    # no exchange: only uses the collector database
+    async with data_collector(BINANCEUS, None, symbols, time_frames, False) as collector:
+        collector.total_steps = len(symbols) * len(time_frames)
+        progresses = []
+
+        async def get_ohlcv_history(exchange, symbol, time_frame):
+            # symbols are octobot_commons Symbol instances
+            assert isinstance(symbol, commons_symbols.Symbol)
+            collector._update_progress(symbol, time_frame, 50)
+            progresses.append(collector.current_step_percent)
+            await asyncio.sleep(0)
+            await collector._add_ohlcv(exchange, symbol.base, symbol.symbol_str, time_frame,
+                                       [[1, 2, 3, 4, 5, 6]], [1])
+
+        collector.get_ohlcv_history = get_ohlcv_history
+        try:
+            await collector._collect_time_frames_history()
+            assert len(progresses) == len(symbols) * len(time_frames)
+            assert all(0 < progress <= 50 for progress in progresses)
+            assert collector.current_step_index == collector.total_steps
+            assert collector.current_step_percent == 0
+            assert collector.progress_by_pair == {}
+            ohlcv = await collector.database.select(enums.ExchangeDataTables.OHLCV)
+            assert len(ohlcv) == len(symbols) * len(time_frames)
+        finally:
+            await collector.database.stop()
+
+
+async def test_stop_adds_columnar_candles_storage():
+    symbols = ["ETH/BTC"]
+    time_frames = [commons_enums.TimeFrames.ONE_HOUR]
+    # no exchange: only uses the collector database
+    async with data_collector(BINANCEUS, None, symbols, time_frames, False,
+                              start_timestamp=1000, end_timestamp=10000000) as collector:
+        await collector._create_description()
+        candles = [[index * 3600, 2, 3, 1, 2.5, 10] for index in range(3)]
+        await collector._add_ohlcv(BINANCEUS, "ETH", "ETH/BTC", commons_enums.TimeFrames.ONE_HOUR,
+                                   candles, [candle[0] + 3600 for candle in candles])
+        await collector._flush_ohlcv()
+        await collector.stop()
+        assert os.path.isfile(collector.file_path)
+        candles_storage = importers_exchanges.ColumnarCandlesStorage(collector.file_path)
+        assert candles_storage.is_up_to_date()
+        importer = importers_exchanges.ColumnarExchangeDataImporter({}, collector.file_path)
+        await importer.initialize()
+        try:
+            assert importer.candles_storage is not None
+            assert [row[-1] for row in await importer.get_ohlcv_from_timestamps(
+                BINANCEUS, "ETH/BTC", commons_enums.TimeFrames.ONE_HOUR
+            )] == candles
+        finally:
+            await importer.stop()
@@ -0,0 +1 @@
+from .columnar_converter import ColumnarDataConverter
\ No newline at end of file
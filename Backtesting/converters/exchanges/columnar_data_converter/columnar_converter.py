@@ -0,0 +1,93 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import os.path as path
+
+import octobot_backtesting.converters as converters
+import octobot_backtesting.data as backtesting_data
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.importers.exchanges.columnar_exchange_importer as columnar_exchange_importer
+
+
+class ColumnarDataConverter(converters.DataConverter):
+    """
+    ColumnarDataConverter adds a columnar candles storage to a backtesting data file.
+    Candles are then read by ColumnarExchangeDataImporter without JSON parsing.
+    The data file itself is left unchanged. Storages built from a data file that changed since then are rebuilt.
+    """
+
+    def __init__(self, backtesting_file_to_convert):
+        super().__init__(backtesting_file_to_convert)
+        self.exchange_name = ""
+        self.symbols = []
+        self.time_frames = []
+        self.database = None
+        self.converted_file = path.basename(backtesting_file_to_convert)
+
+    async def can_convert(self, ) -> bool:
+        if not path.isfile(self.file_to_convert) \
+                or columnar_exchange_importer.ColumnarCandlesStorage(self.file_to_convert).is_up_to_date():
+            return False
+        try:
+            description = await backtesting_data.get_file_description(self.file_to_convert)
+        except Exception:
+            # not a data file or no candles in this data file
+            return False
+        if description is None:
+            return False
+        self.exchange_name = description[backtesting_enums.DataFormatKeys.EXCHANGE.value]
+        self.symbols = description[backtesting_enums.DataFormatKeys.SYMBOLS.value]
+        self.time_frames = description[backtesting_enums.DataFormatKeys.TIME_FRAMES.value]
+        return bool(self.symbols and self.time_frames)
+
+    async def convert(self) -> bool:
+        candles_storage = columnar_exchange_importer.ColumnarCandlesStorage(self.file_to_convert)
+        # rebuild outdated storages
+        candles_storage.delete()
+        try:
+            data_file_signature = candles_storage.get_data_file_signature()
+            self.database = databases.SQLiteDatabase(self.file_to_convert)
+            await self.database.initialize()
+            for symbol in self.symbols:
+                for time_frame in self.time_frames:
+                    await self._convert_ohlcv(candles_storage, symbol, time_frame)
+            # saving the index makes the storage available to importers
+            candles_storage.save(data_file_signature)
+            return True
+        except Exception as e:
+            self.logger.exception(e, True, f"Error while converting data file: {e}")
+            candles_storage.delete()
+            return False
+        finally:
+            if self.database is not None:
+                await self.database.stop()
+
+    async def _convert_ohlcv(self, candles_storage, symbol, time_frame):
+        ohlcvs = await self.database.select(backtesting_enums.ExchangeDataTables.OHLCV,
+                                            sort=commons_enums.DataBaseOrderBy.ASC.value,
+                                            exchange_name=self.exchange_name, symbol=symbol,
+                                            time_frame=time_frame.value)
+        if not ohlcvs:
+            return
+        candles_storage.add_candles(
+            self.exchange_name, symbol, time_frame.value,
+            # exchange, symbol, time frame and cryptocurrency (when available) columns
+            ohlcvs[0][1:-1],
+            [ohlcv[0] for ohlcv in ohlcvs],
+            [json.loads(ohlcv[-1]) for ohlcv in ohlcvs]
+        )
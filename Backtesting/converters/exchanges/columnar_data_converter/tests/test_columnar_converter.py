@@ -0,0 +1,182 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import os
+import time
+
+import pytest
+import pytest_asyncio
+
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges as converters_exchanges
+import tentacles.Backtesting.importers.exchanges as importers_exchanges
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+TIME_FRAMES = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+START_TIME = 1569412800
+
+
+def _candles(time_frame, count, price):
+    time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+    return [
+        [START_TIME + index * time_frame_sec, price + index, price + index + 2.5, price + index - 1.25,
+         price + index + 0.5, 10.1 * index]
+        for index in range(count)
+    ]
+
+
+async def _create_data_file(file_path):
+    database = databases.SQLiteDatabase(file_path)
+    await database.initialize()
+    try:
+        await database.insert(backtesting_enums.DataTables.DESCRIPTION,
+                              timestamp=time.time(),
+                              version="1.1",
+                              exchange=EXCHANGE,
+                              symbols=json.dumps(SYMBOLS),
+                              time_frames=json.dumps([tf.value for tf in TIME_FRAMES]),
+                              start_timestamp=START_TIME,
+                              end_timestamp=START_TIME + 200 * 3600)
+        for symbol_index, symbol in enumerate(SYMBOLS):
+            for time_frame in TIME_FRAMES:
+                time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+                candles = _candles(time_frame, 200 if time_frame is commons_enums.TimeFrames.ONE_HOUR else 50,
+                                   1000 * (symbol_index + 1))
+                await database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                          timestamp=[candle[0] + time_frame_sec for candle in candles],
+                                          exchange_name=EXCHANGE, cryptocurrency=symbol.split("/")[0],
+                                          symbol=symbol, time_frame=time_frame.value,
+                                          candle=[json.dumps(candle) for candle in candles])
+    finally:
+        await database.stop()
+
+
+@pytest_asyncio.fixture
+async def data_file(tmp_path):
+    file_path = os.path.join(tmp_path, "ExchangeHistoryDataCollector_1.data")
+    await _create_data_file(file_path)
+    return file_path
+
+
+async def test_convert_and_import(data_file):
+    converter = converters_exchanges.ColumnarDataConverter(data_file)
+    assert await converter.can_convert()
+    assert await converter.convert()
+    assert converter.converted_file == os.path.basename(data_file)
+    candles_storage = importers_exchanges.ColumnarCandlesStorage(data_file)
+    assert candles_storage.exists()
+    # already converted
+    assert not await converters_exchanges.ColumnarDataConverter(data_file).can_convert()
+
+    columnar_importer = importers_exchanges.ColumnarExchangeDataImporter({}, data_file)
+    database_importer = importers_exchanges.GenericExchangeDataImporter({}, data_file)
+    await columnar_importer.initialize()
+    await database_importer.initialize()
+    try:
+        assert columnar_importer.candles_storage is not None
+        for symbol in SYMBOLS:
+            for time_frame in TIME_FRAMES:
+                # same rows as selected from database
+                for inferior_timestamp, superior_timestamp in (
+                    (-1, -1),
+                    (START_TIME + 10 * 3600, -1),
+                    (-1, START_TIME + 30 * 3600),
+                    (START_TIME + 10 * 3600, START_TIME + 30 * 3600),
+                    (START_TIME + 20 * 3600 + 1, START_TIME + 20 * 3600 + 2),
+                ):
+                    database_importer.reset_cache()
+                    assert await columnar_importer.get_ohlcv_from_timestamps(
+                        EXCHANGE, symbol, time_frame,
+                        inferior_timestamp=inferior_timestamp, superior_timestamp=superior_timestamp
+                    ) == await database_importer.get_ohlcv_from_timestamps(
+                        EXCHANGE, symbol, time_frame,
+                        inferior_timestamp=inferior_timestamp, superior_timestamp=superior_timestamp
+                    )
+                for kwargs in (
+                    {},
+                    {"limit": 5},
+                    {"timestamps": [str(START_TIME + 30 * 3600)],
+                     "operations": [commons_enums.DataBaseOperations.INF_EQUALS.value]},
+                    {"timestamps": [str(START_TIME + 30 * 3600), str(START_TIME + 10 * 3600)],
+                     "operations": [commons_enums.DataBaseOperations.INF.value,
+                                    commons_enums.DataBaseOperations.SUP.value]},
+                ):
+                    assert await columnar_importer.get_ohlcv(EXCHANGE, symbol, time_frame, **kwargs) == \
+                        await database_importer.get_ohlcv(EXCHANGE, symbol, time_frame, **kwargs)
+        # not in columnar storage: read from database
+        assert await columnar_importer.get_ohlcv_from_timestamps(
+            EXCHANGE, SYMBOLS[0], commons_enums.TimeFrames.ONE_DAY
+        ) == []
+    finally:
+        await columnar_importer.stop()
+        await database_importer.stop()
+
+
+async def test_outdated_storage(data_file):
+    converter = converters_exchanges.ColumnarDataConverter(data_file)
+    assert await converter.can_convert()
+    assert await converter.convert()
+    candles_storage = importers_exchanges.ColumnarCandlesStorage(data_file)
+    assert candles_storage.is_up_to_date()
+
+    # data file updated after conversion
+    new_candle = [START_TIME + 200 * 3600, 1, 2, 0.5, 1.5, 10]
+    database = databases.SQLiteDatabase(data_file)
+    await database.initialize()
+    try:
+        await database.insert(backtesting_enums.ExchangeDataTables.OHLCV,
+                              timestamp=new_candle[0] + 3600, exchange_name=EXCHANGE, cryptocurrency="BTC",
+                              symbol=SYMBOLS[0], time_frame=commons_enums.TimeFrames.ONE_HOUR.value,
+                              candle=json.dumps(new_candle))
+    finally:
+        await database.stop()
+    assert candles_storage.exists()
+    assert not candles_storage.is_up_to_date()
+
+    # outdated storage is ignored
+    columnar_importer = importers_exchanges.ColumnarExchangeDataImporter({}, data_file)
+    await columnar_importer.initialize()
+    try:
+        assert columnar_importer.candles_storage is None
+        assert (await columnar_importer.get_ohlcv_from_timestamps(
+            EXCHANGE, SYMBOLS[0], commons_enums.TimeFrames.ONE_HOUR
+        ))[-1][-1] == new_candle
+    finally:
+        await columnar_importer.stop()
+
+    # and rebuilt on conversion
+    converter = converters_exchanges.ColumnarDataConverter(data_file)
+    assert await converter.can_convert()
+    assert await converter.convert()
+    assert candles_storage.is_up_to_date()
+    columnar_importer = importers_exchanges.ColumnarExchangeDataImporter({}, data_file)
+    await columnar_importer.initialize()
+    try:
+        assert columnar_importer.candles_storage is not None
+        rows = await columnar_importer.get_ohlcv_from_timestamps(
+            EXCHANGE, SYMBOLS[0], commons_enums.TimeFrames.ONE_HOUR
+        )
+        assert len(rows) == 201
+        assert rows[-1][-1] == new_candle
+    finally:
+        await columnar_importer.stop()
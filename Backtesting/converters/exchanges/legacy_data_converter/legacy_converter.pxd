@@ -25,6 +25,5 @@ cdef class LegacyDataConverter(DataConverter):
     cdef dict file_content
     cdef DataBase database
 
-    cdef list _get_formatted_candles(self, object time_frame)
     cdef dict _read_data_file(self)
     cdef dict _read_data_file(self)
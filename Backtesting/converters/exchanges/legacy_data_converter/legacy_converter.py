@@ -18,6 +18,9 @@ import json
 import enum
 import os.path as path
 import datetime
+import time
+
+import numpy as np
 
 import octobot_backtesting.collectors.exchanges as exchanges
 import octobot_backtesting.constants as backtesting_constants
@@ -37,6 +40,8 @@ class LegacyDataConverter(converters.DataConverter):
     DATA_FILE_EXT = ".data"
     VERSION = "1.0"
     DATA_FILE_TIME_DATE_FORMAT = '%Y%m%d%H%M%S'
+    # candles to format and insert at once: bounds the memory used by a time frame conversion
+    CANDLES_CHUNK_SIZE = 50000
 
     class PriceIndexes(enum.Enum):
         IND_PRICE_TIME = 0
@@ -54,7 +59,8 @@ class LegacyDataConverter(converters.DataConverter):
         self.time_frames = []
         self.file_content = {}
         self.database = None
-        self.converted_file = backtesting_data.get_backtesting_file_name(exchanges.AbstractExchangeHistoryCollector)
+        self.converted_file = backtesting_data.get_backtesting_file_name(exchanges.AbstractExchangeHistoryCollector,
+                                                                         time.time)
 
     async def can_convert(self, ) -> bool:
         self.exchange_name, self.symbol, self.time_data = LegacyDataConverter._interpret_file_name(self.file_to_convert)
@@ -104,30 +110,33 @@ class LegacyDataConverter(converters.DataConverter):
     async def _convert_ohlcv(self, time_frame):
         # use time_frame_sec to add time to save the candle closing time
         time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
-        candles = self._get_formatted_candles(time_frame)
-        await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
-                                       timestamp=[candle[0] + time_frame_sec for candle in candles],
-                                       exchange_name=self.exchange_name, symbol=self.symbol,
-                                       time_frame=time_frame.value, candle=[json.dumps(c) for c in candles])
+        for candles in self._get_formatted_candles_chunks(time_frame):
+            await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                           timestamp=[candle[0] + time_frame_sec for candle in candles],
+                                           exchange_name=self.exchange_name, symbol=self.symbol,
+                                           time_frame=time_frame.value, candle=[json.dumps(c) for c in candles])
+        # release parsed data of this time frame
+        self.file_content.pop(time_frame.value, None)
 
-    def _get_formatted_candles(self, time_frame):
+    def _get_formatted_candles_chunks(self, time_frame):
+        """
+        Yields candles of the given time frame by chunks of CANDLES_CHUNK_SIZE.
+        Legacy data files store one list per candle value, ordered as PriceIndexes: candles are their transposition.
+        """
         data = self.file_content[time_frame.value]
-        candles = []
-        for i in range(len(data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value])):
-            candles.insert(i, [None] * len(LegacyDataConverter.PriceIndexes))
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_CLOSE.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_CLOSE.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_OPEN.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_OPEN.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_HIGH.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_HIGH.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_LOW.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_LOW.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_VOL.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_VOL.value][i]
-        return candles
+        candles_count = len(data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value])
+        time_index = LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value
+        for start in range(0, candles_count, self.CANDLES_CHUNK_SIZE):
+            end = start + self.CANDLES_CHUNK_SIZE
+            values = np.array([data[price_index.value][start:end] for price_index in LegacyDataConverter.PriceIndexes],
+                              dtype=np.float64)
+            candles = values.T.tolist()
+            times = values[time_index]
+            if np.array_equal(times, np.floor(times)):
+                # keep integer candle times
+                for candle, candle_time in zip(candles, times.astype(np.int64).tolist()):
+                    candle[time_index] = candle_time
+            yield candles
 
     def _read_data_file(self):
         try:
@@ -0,0 +1,105 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Compares the previous LegacyDataConverter OHLCV conversion to the chunked conversion on a synthetic legacy data file.
+Each conversion runs in its own process to measure its peak memory.
+Run with: python -m tentacles.Backtesting.converters.exchanges.legacy_data_converter.tests.benchmark_legacy_converter
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges as converters_exchanges
+from tentacles.Backtesting.converters.exchanges.legacy_data_converter.tests import test_legacy_converter
+
+CANDLES_COUNT = 2000000
+
+
+class PreviousLegacyDataConverter(converters_exchanges.LegacyDataConverter):
+    async def _convert_ohlcv(self, time_frame):
+        time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+        candles = self._get_formatted_candles(time_frame)
+        await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                       timestamp=[candle[0] + time_frame_sec for candle in candles],
+                                       exchange_name=self.exchange_name, symbol=self.symbol,
+                                       time_frame=time_frame.value, candle=[json.dumps(c) for c in candles])
+
+    def _get_formatted_candles(self, time_frame):
+        data = self.file_content[time_frame.value]
+        candles = []
+        for i in range(len(data[self.PriceIndexes.IND_PRICE_TIME.value])):
+            candles.insert(i, [None] * len(self.PriceIndexes))
+            for price_index in self.PriceIndexes:
+                candles[i][price_index.value] = data[price_index.value][i]
+        return candles
+
+
+async def _convert(converter_class, file_path, output_path):
+    converter = converter_class(file_path)
+    assert await converter.can_convert()
+    converter.database = databases.SQLiteDatabase(output_path)
+    await converter.database.initialize()
+    try:
+        start = time.perf_counter()
+        for time_frame in converter.time_frames:
+            await converter._convert_ohlcv(time_frame)
+        return time.perf_counter() - start
+    finally:
+        await converter.database.stop()
+
+
+def _run_conversion(converter_class, file_path, output_path, results):
+    initial_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    elapsed = asyncio.run(_convert(converter_class, file_path, output_path))
+    # ru_maxrss is in KB on linux
+    results.put((elapsed, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - initial_memory) / 1024))
+
+
+def _print_conversion(name, converter_class, file_path, directory):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_run_conversion,
+        args=(converter_class, file_path, os.path.join(directory, f"{name}.data"), results)
+    )
+    process.start()
+    elapsed, memory = results.get()
+    process.join()
+    print(f"{name}: {CANDLES_COUNT / elapsed:.0f} candles/s ({elapsed:.2f}s), "
+          f"conversion peak memory increase: {memory:.0f}MB")
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        file_path, _ = test_legacy_converter.create_legacy_data_file(directory, CANDLES_COUNT)
+        print(f"{CANDLES_COUNT} candles legacy data file: {os.path.getsize(file_path) / 1024 / 1024:.0f}MB")
+        previous_time = _print_conversion("previous implementation", PreviousLegacyDataConverter, file_path,
+                                          directory)
+        chunked_time = _print_conversion("chunked conversion", converters_exchanges.LegacyDataConverter, file_path,
+                                         directory)
+        print(f"x{previous_time / chunked_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import gzip
+import json
+import os
+
+import numpy as np
+import pytest
+
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges as converters_exchanges
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+LEGACY_FILE_NAME = "binance_BTC_USDT_20200101_000000.data"
+
+
+def create_legacy_data_file(directory, candles_count, time_frames=(commons_enums.TimeFrames.ONE_MINUTE, )):
+    random = np.random.default_rng(42)
+    content = {}
+    for time_frame in time_frames:
+        time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * 60
+        closes = np.round(np.cumsum(random.normal(0, 10, candles_count)) + 20000, 2)
+        content[time_frame.value] = [
+            list(range(1577836800, 1577836800 + candles_count * time_frame_sec, time_frame_sec)),
+            (closes - 1.5).tolist(),
+            (closes + 10.25).tolist(),
+            (closes - 10.5).tolist(),
+            closes.tolist(),
+            np.round(random.lognormal(3, 1, candles_count), 4).tolist(),
+        ]
+    file_path = os.path.join(directory, LEGACY_FILE_NAME)
+    with gzip.open(file_path, "w") as legacy_file:
+        legacy_file.write(json.dumps(content).encode())
+    return file_path, content
+
+
+def get_legacy_candles(time_frame_content):
+    # candles as built by the previous LegacyDataConverter implementation
+    return [list(candle) for candle in zip(*time_frame_content)]
+
+
+async def test_convert(tmp_path):
+    time_frames = (commons_enums.TimeFrames.ONE_MINUTE, commons_enums.TimeFrames.ONE_HOUR)
+    file_path, content = create_legacy_data_file(tmp_path, 1234, time_frames)
+    converter = converters_exchanges.LegacyDataConverter(file_path)
+    converter.CANDLES_CHUNK_SIZE = 100
+    assert await converter.can_convert()
+    assert converter.time_frames == list(time_frames)
+    chunks = list(converter._get_formatted_candles_chunks(commons_enums.TimeFrames.ONE_MINUTE))
+    assert [len(chunk) for chunk in chunks] == [100] * 12 + [34]
+    candles = [candle for chunk in chunks for candle in chunk]
+    assert candles == get_legacy_candles(content[commons_enums.TimeFrames.ONE_MINUTE.value])
+    assert all(isinstance(candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value], int) for candle in candles)
+
+    converter.database = databases.SQLiteDatabase(os.path.join(tmp_path, "converted.data"))
+    await converter.database.initialize()
+    try:
+        for time_frame in time_frames:
+            await converter._convert_ohlcv(time_frame)
+            ohlcvs = await converter.database.select(backtesting_enums.ExchangeDataTables.OHLCV,
+                                                     sort=commons_enums.DataBaseOrderBy.ASC.value,
+                                                     time_frame=time_frame.value)
+            assert [json.loads(ohlcv[-1]) for ohlcv in ohlcvs] == get_legacy_candles(content[time_frame.value])
+            assert [ohlcv[0] for ohlcv in ohlcvs] == [
+                candle[0] + commons_enums.TimeFramesMinutes[time_frame] * 60
+                for candle in get_legacy_candles(content[time_frame.value])
+            ]
+        # parsed data is released once converted
+        assert converter.file_content == {}
+    finally:
+        await converter.database.stop()
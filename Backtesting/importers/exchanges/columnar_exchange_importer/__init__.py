@@ -0,0 +1 @@
+from .columnar_exchange_importer import ColumnarExchangeDataImporter, ColumnarCandlesStorage
\ No newline at end of file
@@ -0,0 +1,223 @@
+#  Drakkar-Software OctoBot-Backtesting
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import os
+import shutil
+
+import numpy as np
+
+import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+
+
+class ColumnarCandlesStorage:
+    """
+    OHLCV storage as typed columns, next to a backtesting data file.
+    Each (exchange, symbol, time frame) candles are saved in a .npy file holding a (7, candles) float64 array:
+    the database timestamp (candle close time) row followed by one row per PriceIndexes candle value.
+    Files are memory-mapped when read: candles are selected by timestamp without reading the whole file.
+    The index records the size and modification time of the data file it was built from: the storage is
+    outdated as soon as the data file changes.
+    """
+    STORAGE_DIRECTORY_EXT = ".columns"
+    INDEX_FILE = "index.json"
+    VERSION = 2
+    TIMESTAMP_ROW = 0
+    CANDLE_ROWS = slice(1, None)
+
+    def __init__(self, data_file_path):
+        self.data_file_path = data_file_path
+        self.directory = f"{data_file_path}{self.STORAGE_DIRECTORY_EXT}"
+        self.pairs = {}
+        self._mapped_columns = {}
+
+    def exists(self):
+        return os.path.isfile(os.path.join(self.directory, self.INDEX_FILE))
+
+    def get_data_file_signature(self):
+        stat = os.stat(self.data_file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_up_to_date(self) -> bool:
+        """
+        :return: True when the storage exists and has been built from the current content of its data file
+        """
+        if not self.exists():
+            return False
+        try:
+            index = self._read_index()
+            return index.get("version") == self.VERSION \
+                and index.get("data_file") == self.get_data_file_signature()
+        except (OSError, ValueError):
+            return False
+
+    def load(self):
+        index = self._read_index()
+        self.pairs = {
+            (pair["exchange_name"], pair["symbol"], pair["time_frame"]): pair
+            for pair in index["pairs"]
+        }
+        self._mapped_columns = {}
+
+    def save(self, data_file_signature):
+        """
+        :param data_file_signature: the get_data_file_signature() of the data file before reading its candles
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, self.INDEX_FILE), "w") as index_file:
+            json.dump({
+                "version": self.VERSION,
+                "data_file": data_file_signature,
+                "pairs": list(self.pairs.values())
+            }, index_file)
+
+    def _read_index(self):
+        with open(os.path.join(self.directory, self.INDEX_FILE)) as index_file:
+            return json.load(index_file)
+
+    def delete(self):
+        self.pairs = {}
+        self._mapped_columns = {}
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    def has_candles(self, exchange_name, symbol, time_frame) -> bool:
+        return (exchange_name, symbol, time_frame) in self.pairs
+
+    def add_candles(self, exchange_name, symbol, time_frame, row_values, timestamps, candles):
+        """
+        :param row_values: the database row values between timestamp and candle, identical for each candle
+        :param timestamps: the database timestamp of each candle
+        :param candles: candles ordered by time
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        columns = np.empty((len(commons_enums.PriceIndexes) + 1, len(candles)), dtype=np.float64)
+        columns[self.TIMESTAMP_ROW] = timestamps
+        if candles:
+            columns[self.CANDLE_ROWS] = np.asarray(candles, dtype=np.float64).T
+        file_name = f"{len(self.pairs)}.npy"
+        np.save(os.path.join(self.directory, file_name), columns)
+        self.pairs[(exchange_name, symbol, time_frame)] = {
+            "exchange_name": exchange_name,
+            "symbol": symbol,
+            "time_frame": time_frame,
+            "row_values": list(row_values),
+            "file": file_name,
+        }
+
+    def get_columns(self, exchange_name, symbol, time_frame):
+        key = (exchange_name, symbol, time_frame)
+        try:
+            return self._mapped_columns[key]
+        except KeyError:
+            columns = self._mapped_columns[key] = np.load(
+                os.path.join(self.directory, self.pairs[key]["file"]), mmap_mode="r"
+            )
+            return columns
+
+    def get_rows(self, exchange_name, symbol, time_frame,
+                 inferior_timestamp=commons_constants.DEFAULT_IGNORED_VALUE,
+                 superior_timestamp=commons_constants.DEFAULT_IGNORED_VALUE,
+                 inclusive_inferior=True, inclusive_superior=True):
+        """
+        :return: the OHLCV database rows with inferior_timestamp <= timestamp <= superior_timestamp, ordered by time.
+        """
+        columns = self.get_columns(exchange_name, symbol, time_frame)
+        timestamps = columns[self.TIMESTAMP_ROW]
+        start = 0 if inferior_timestamp == commons_constants.DEFAULT_IGNORED_VALUE else \
+            int(np.searchsorted(timestamps, inferior_timestamp, side="left" if inclusive_inferior else "right"))
+        end = len(timestamps) if superior_timestamp == commons_constants.DEFAULT_IGNORED_VALUE else \
+            int(np.searchsorted(timestamps, superior_timestamp, side="right" if inclusive_superior else "left"))
+        if start >= end:
+            return []
+        selected = np.array(columns[:, start:end])
+        candles = selected[self.CANDLE_ROWS].T.tolist()
+        candle_times = selected[self.CANDLE_ROWS][commons_enums.PriceIndexes.IND_PRICE_TIME.value].astype(np.int64)
+        for candle, candle_time in zip(candles, candle_times.tolist()):
+            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = candle_time
+        row_values = self.pairs[(exchange_name, symbol, time_frame)]["row_values"]
+        return [
+            [timestamp, *row_values, candle]
+            for timestamp, candle in zip(selected[self.TIMESTAMP_ROW].tolist(), candles)
+        ]
+
+
+class ColumnarExchangeDataImporter(generic_exchange_importer.GenericExchangeDataImporter):
+    """
+    Reads OHLCV from the columnar candles storage of the data file when available, from the data file otherwise.
+    Data files get a columnar candles storage when converted by ColumnarDataConverter, which collectors
+    do after each collection.
+    """
+
+    def __init__(self, config, file_path):
+        super().__init__(config, file_path)
+        self.candles_storage = None
+
+    async def initialize(self) -> None:
+        await super().initialize()
+        candles_storage = ColumnarCandlesStorage(self.adapt_file_path_if_necessary())
+        if candles_storage.is_up_to_date():
+            candles_storage.load()
+            self.candles_storage = candles_storage
+            self.logger.debug(f"Using columnar candles storage from {candles_storage.directory}")
+        elif candles_storage.exists():
+            self.logger.warning(f"Ignored outdated columnar candles storage: {candles_storage.directory}, "
+                                f"its data file changed since it has been built")
+
+    def _has_columnar_candles(self, exchange_name, symbol, time_frame):
+        return self.candles_storage is not None and time_frame is not None \
+            and self.candles_storage.has_candles(exchange_name, symbol, time_frame.value)
+
+    async def get_ohlcv(self, exchange_name=None, symbol=None,
+                        time_frame=commons_enums.TimeFrames.ONE_HOUR,
+                        limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                        timestamps=None,
+                        operations=None):
+        if not self._has_columnar_candles(exchange_name, symbol, time_frame) \
+                or commons_enums.DataBaseOperations.EQUALS.value in (operations or []):
+            return await super().get_ohlcv(exchange_name=exchange_name, symbol=symbol, time_frame=time_frame,
+                                           limit=limit, timestamps=timestamps, operations=operations)
+        bounds = {}
+        for timestamp, operation in zip(timestamps or [], operations or []):
+            operation = commons_enums.DataBaseOperations(operation)
+            if operation in (commons_enums.DataBaseOperations.SUP, commons_enums.DataBaseOperations.SUP_EQUALS):
+                bounds["inferior_timestamp"] = float(timestamp)
+                bounds["inclusive_inferior"] = operation is commons_enums.DataBaseOperations.SUP_EQUALS
+            else:
+                bounds["superior_timestamp"] = float(timestamp)
+                bounds["inclusive_superior"] = operation is commons_enums.DataBaseOperations.INF_EQUALS
+        rows = self.candles_storage.get_rows(exchange_name, symbol, time_frame.value, **bounds)
+        # same order as database selects: most recent first
+        rows.reverse()
+        return rows if limit == databases.SQLiteDatabase.DEFAULT_SIZE else rows[:limit]
+
+    async def get_ohlcv_from_timestamps(self, exchange_name=None, symbol=None,
+                                        time_frame=commons_enums.TimeFrames.ONE_HOUR,
+                                        limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                                        inferior_timestamp=-1, superior_timestamp=-1) -> list:
+        """
+        Selects candles in the memory-mapped columns: no need for a chronological cache
+        """
+        if not self._has_columnar_candles(exchange_name, symbol, time_frame):
+            return await super().get_ohlcv_from_timestamps(
+                exchange_name=exchange_name, symbol=symbol, time_frame=time_frame, limit=limit,
+                inferior_timestamp=inferior_timestamp, superior_timestamp=superior_timestamp
+            )
+        return self.candles_storage.get_rows(exchange_name, symbol, time_frame.value,
+                                             inferior_timestamp=inferior_timestamp,
+                                             superior_timestamp=superior_timestamp)
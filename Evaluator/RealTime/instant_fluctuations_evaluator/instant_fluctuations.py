@@ -14,14 +14,17 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import math
-import tulipy
-import numpy as np
 
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
 import octobot_commons.channels_name as channels_name
 import octobot_evaluators.evaluators as evaluators
 import octobot_evaluators.util as evaluators_util
+import tentacles.Evaluator.Util as EvaluatorUtil
+
+
+def _get_time_frame_seconds(time_frame):
+    return commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)] * commons_constants.MINUTE_TO_SECONDS
 
 
 class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
@@ -40,11 +43,9 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
         self.something_is_happening = False
         self.last_notification_eval = 0
 
-        self.average_prices = {}
         self.last_price = 0
 
         # Volume
-        self.average_volumes = {}
         self.last_volume = 0
 
         # Constants
@@ -54,6 +55,11 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
         self.MIN_TRIGGERING_DELTA = 0.15
         self.candle_segments = [10, 8, 6, 5, 4, 3, 2, 1]
 
+        # rolling windows of the last candle_segments closes and volumes
+        self.price_windows = {segment: EvaluatorUtil.RingBuffer(segment) for segment in self.candle_segments}
+        self.volume_windows = {segment: EvaluatorUtil.RingBuffer(segment) for segment in self.candle_segments}
+        self.last_candle_time = None
+
     def init_user_inputs(self, inputs: dict) -> None:
         """
         Called right before starting the tentacle, should define all the tentacle's user inputs unless
@@ -75,25 +81,38 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle):
-        volume_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
-            get_symbol_volume_candles(self.candle_segments[0])
-        close_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
-            get_symbol_close_candles(self.candle_segments[0])
-        for segment in self.candle_segments:
-            volume_data = [d for d in volume_data[-segment:] if d is not None]
-            price_data = [d for d in close_data[-segment:] if d is not None]
-            self.average_volumes[segment] = np.mean(volume_data)
-            self.average_prices[segment] = np.mean(price_data)
+        candle_time = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+        if self.last_candle_time is not None \
+                and candle_time - self.last_candle_time == _get_time_frame_seconds(time_frame):
+            # next candle: add it to windows
+            self._add_to_windows(candle[commons_enums.PriceIndexes.IND_PRICE_VOL.value],
+                                 candle[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
+        else:
+            # first candle or missed candles: reload windows from candles history
+            symbol_candles = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame)
+            for window in (*self.volume_windows.values(), *self.price_windows.values()):
+                window.clear()
+            for volume, close in zip(symbol_candles.get_symbol_volume_candles(self.candle_segments[0]),
+                                     symbol_candles.get_symbol_close_candles(self.candle_segments[0])):
+                self._add_to_windows(volume, close)
+        self.last_candle_time = candle_time
 
         try:
-            self.last_volume = volume_data[-1]
-            self.last_price = close_data[-1]
+            self.last_volume = self.volume_windows[self.candle_segments[0]].last()
+            self.last_price = self.price_windows[self.candle_segments[0]].last()
             await self._trigger_evaluation(cryptocurrency, symbol,
                                            evaluators_util.get_eval_time(full_candle=candle, time_frame=time_frame))
         except IndexError:
             # candles data history is probably not yet available
             self.logger.debug(f"Impossible to evaluate, no historical data for {symbol} on {time_frame}")
 
+    def _add_to_windows(self, volume, close):
+        for segment in self.candle_segments:
+            if volume is not None:
+                self.volume_windows[segment].append(volume)
+            if close is not None:
+                self.price_windows[segment].append(close)
+
     async def kline_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, kline):
         self.last_volume = kline[commons_enums.PriceIndexes.IND_PRICE_VOL.value]
@@ -116,14 +135,14 @@ class InstantFluctuationsEvaluator(evaluators.RealTimeEvaluator):
         price_trigger = 0
 
         for segment in self.candle_segments:
-            if segment in self.average_volumes and segment in self.average_prices:
+            if self.volume_windows[segment] and self.price_windows[segment]:
                 # check volume fluctuation
-                if self.last_volume > self.VOLUME_HAPPENING_THRESHOLD * self.average_volumes[segment]:
+                if self.last_volume > self.VOLUME_HAPPENING_THRESHOLD * self.volume_windows[segment].mean():
                     volume_trigger += 1
                     self.something_is_happening = True
 
                 # check price fluctuation
-                segment_average_price = self.average_prices[segment]
+                segment_average_price = self.price_windows[segment].mean()
                 if self.last_price > (1 + self.PRICE_HAPPENING_THRESHOLD) * segment_average_price:
                     price_trigger += 1
                     self.something_is_happening = True
@@ -185,8 +204,9 @@ class InstantMAEvaluator(evaluators.RealTimeEvaluator):
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
-        self.last_candle_data = {}
-        self.last_moving_average_values = {}
+        # rolling windows of the last period closes of each symbol
+        self.close_windows = {}
+        self.last_candle_times = {}
         self.period = 6
         self.time_frame = None
         self.price_threshold = 0.05
@@ -212,30 +232,38 @@ class InstantMAEvaluator(evaluators.RealTimeEvaluator):
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle):
         self.eval_note = 0
-        new_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
-            get_symbol_close_candles(20)
-        should_eval = symbol not in self.last_candle_data or \
-                      not self._compare_data(new_data, self.last_candle_data[symbol])
-        self.last_candle_data[symbol] = new_data
-        if should_eval:
-            if len(self.last_candle_data[symbol]) > self.period:
-                self.last_moving_average_values[symbol] = tulipy.sma(self.last_candle_data[symbol],
-                                                                     self.period)
-                await self._evaluate_current_price(self.last_candle_data[symbol][-1], cryptocurrency, symbol,
-                                                   evaluators_util.get_eval_time(full_candle=candle,
-                                                                                 time_frame=time_frame))
+        candle_time = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+        close_window = self.close_windows.get(symbol)
+        if close_window is not None and close_window.size == self.period \
+                and candle_time - self.last_candle_times[symbol] == _get_time_frame_seconds(time_frame):
+            # next candle: add it to the moving average window
+            close_window.append(candle[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
+        else:
+            # first candle or missed candles: reload moving average window from candles history
+            close_data = self.get_symbol_candles(exchange, exchange_id, symbol, time_frame). \
+                get_symbol_close_candles(self.period + 1)
+            if len(close_data) <= self.period:
+                # not enough candles
+                self.close_windows.pop(symbol, None)
+                return
+            close_window = self.close_windows[symbol] = EvaluatorUtil.RingBuffer(self.period)
+            close_window.extend(close_data[-self.period:])
+        self.last_candle_times[symbol] = candle_time
+        await self._evaluate_current_price(close_window.last(), cryptocurrency, symbol,
+                                           evaluators_util.get_eval_time(full_candle=candle,
+                                                                         time_frame=time_frame))
 
     async def kline_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, kline):
-        if symbol in self.last_moving_average_values and len(self.last_moving_average_values[symbol]) > 0:
+        if symbol in self.close_windows:
             self.eval_note = 0
             last_price = kline[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value]
-            if last_price != self.last_candle_data[symbol][-1]:
+            if last_price != self.close_windows[symbol].last():
                 await self._evaluate_current_price(last_price, cryptocurrency, symbol,
                                                    evaluators_util.get_eval_time(kline=kline))
 
     async def _evaluate_current_price(self, last_price, cryptocurrency, symbol, time):
-        last_ma_value = self.last_moving_average_values[symbol][-1]
+        last_ma_value = self.close_windows[symbol].mean()
         if last_ma_value == 0:
             self.eval_note = 0
         else:
@@ -283,13 +311,3 @@ class InstantMAEvaluator(evaluators.RealTimeEvaluator):
     def set_default_config(self):
         super().set_default_config()
         self.specific_config[commons_constants.CONFIG_TIME_FRAME] = "1m"
-
-    @staticmethod
-    def _compare_data(new_data, old_data):
-        try:
-            if new_data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value][-1] != \
-                    old_data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value][-1]:
-                return False
-            return True
-        except Exception:
-            return False
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import functools
 import re
 
 import octobot_commons.constants as commons_constants
@@ -22,6 +23,11 @@ import octobot_evaluators.evaluators as evaluators
 import tentacles.Services.Services_feeds as Services_feeds
 
 
+@functools.lru_cache(maxsize=None)
+def _get_compiled_pattern(pattern):
+    return re.compile(pattern)
+
+
 class TelegramSignalEvaluator(evaluators.SocialEvaluator):
     SERVICE_FEED_CLASS = Services_feeds.TelegramServiceFeed
 
@@ -200,7 +206,8 @@ class TelegramChannelSignalEvaluator(evaluators.SocialEvaluator):
 
     def _get_signal_message(self, expected_pattern, message):
         try:
-            match = re.search(expected_pattern, message)
+            # channels patterns are compiled once and reused for each message
+            match = _get_compiled_pattern(expected_pattern).search(message)
             return match.group(1)
         except AttributeError:
             self.logger.debug(f"Ignored message : not matching channel pattern ({message})")
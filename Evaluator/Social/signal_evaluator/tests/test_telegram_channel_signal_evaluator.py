@@ -19,6 +19,7 @@ import octobot_commons.constants as commons_constants
 import octobot_commons.logging as logging
 import octobot_services.constants as services_constants
 import tentacles.Evaluator.Social as Social
+import tentacles.Evaluator.Social.signal_evaluator.signal as signal
 import tests.test_utils.config as test_utils_config
 
 # All test coroutines will be treated as marked.
@@ -184,3 +185,11 @@ async def test_correct_signal_chan2():
         services_constants.CONFIG_MESSAGE_SENDER: "TEST-CHAN-2",
         services_constants.CONFIG_MESSAGE_CONTENT: "BTC/USDT : -1",
     }, note=-1)
+
+
+async def test_get_signal_message():
+    evaluator = _create_evaluator_with_supported_channel_signals()
+    assert evaluator._get_signal_message("Pair: (.*)", "Pair: BTC/USDT") == "BTC/USDT"
+    assert evaluator._get_signal_message("Side: (BUY)", "Pair: BTC/USDT") is None
+    # patterns are compiled once
+    assert signal._get_compiled_pattern("Pair: (.*)") is signal._get_compiled_pattern("Pair: (.*)")
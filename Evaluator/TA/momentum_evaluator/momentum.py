@@ -31,6 +31,7 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
+        self.exchange_id = None
         self.pertinence = 1
         self.period_length = 14
         self.short_threshold = 70
@@ -38,6 +39,7 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
         self.is_trend_change_identifier = True
         self.short_term_averages = [7, 5, 4, 3, 2, 1]
         self.long_term_averages = [40, 30, 20, 15, 10]
+        self.batch_evaluation = False
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -73,44 +75,64 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
                 }
             }
         )
+        self.batch_evaluation = self.UI.user_input(
+            "batch_evaluation", enums.UserInputTypes.BOOLEAN, self.batch_evaluation, inputs,
+            title="Batch evaluation: evaluate every traded symbol at once when their candles close. "
+                  "Faster when trading many symbols. Not used in backtesting.",
+        )
+
+    async def start(self, bot_id: str) -> bool:
+        # stopped exchanges can't be identified anymore when stopping evaluators
+        self.exchange_id = trading_api.get_exchange_id_from_matrix_id(self.exchange_name, self.matrix_id)
+        return await super().start(bot_id)
+
+    async def stop(self) -> None:
+        await super().stop()
+        # incremental indicators states of this exchange won't be updated anymore
+        EvaluatorUtil.IncrementalIndicators.instance().clear(exchange_id=self.exchange_id)
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        if self.batch_evaluation and not inc_in_construction_data:
+            exchange_manager = trading_api.get_exchange_manager_from_exchange_id(exchange_id)
+            # batches timeouts are in wall-clock time: in backtesting, they would publish evaluations out of order
+            if not trading_api.get_is_backtesting(exchange_manager):
+                await EvaluatorUtil.BatchEvaluation.instance().add_evaluation(
+                    (self.get_name(), exchange_id, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value]),
+                    EvaluatorUtil.PendingEvaluation(self, cryptocurrency, symbol, time_frame, candle, candle_data),
+                    trading_api.get_trading_pairs(exchange_manager),
+                    self._evaluate_batch
+                )
+                return
+        candle_times = trading_api.get_symbol_time_candles(symbol_candles,
+                                                           time_frame,
+                                                           include_in_construction=inc_in_construction_data)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            exchange_id=exchange_id, candle_times=candle_times,
+                            include_in_construction=inc_in_construction_data)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=None,
+                       candle_times=None, include_in_construction=False):
         updated_value = False
         if candle_data is not None and len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            rsi_v = tulipy.rsi(candle_data, period=self.period_length) if candle_times is None \
+                else EvaluatorUtil.IncrementalIndicators.instance().rsi(
+                    (exchange_id, symbol, time_frame, include_in_construction), candle_times, candle_data,
+                    self.period_length
+                )
             if len(rsi_v) and not math.isnan(rsi_v[-1]):
                 if self.is_trend_change_identifier:
-                    long_trend = EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.long_term_averages)
-                    short_trend = EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.short_term_averages)
-
-                    # check if trend change
-                    if short_trend > 0 > long_trend:
-                        # trend changed to up
-                        self.set_eval_note(-short_trend)
-
-                    elif long_trend > 0 > short_trend:
-                        # trend changed to down
-                        self.set_eval_note(short_trend)
-
-                    # use RSI current value
-                    last_rsi_value = rsi_v[-1]
-                    if last_rsi_value > 50:
-                        self.set_eval_note(rsi_v[-1] / 200)
-                    else:
-                        self.set_eval_note((rsi_v[-1] - 100) / 200)
+                    self._set_trend_change_eval_note(
+                        rsi_v[-1],
+                        EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.long_term_averages),
+                        EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.short_term_averages)
+                    )
                 else:
-                    self.eval_note = 0
-                    if rsi_v[-1] >= self.short_threshold:
-                        self.eval_note = 1
-                    elif rsi_v[-1] <= self.long_threshold:
-                        self.eval_note = -1
+                    self._set_threshold_eval_note(rsi_v[-1])
                 updated_value = True
         if not self.is_trend_change_identifier and not updated_value:
             self.eval_note = 0
@@ -118,6 +140,66 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
                                         eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                 time_frame=time_frame))
 
+    async def _evaluate_batch(self, evaluations):
+        batched_evaluations = []
+        for evaluation in evaluations:
+            if evaluation.candle_data is not None and len(evaluation.candle_data) > self.period_length:
+                batched_evaluations.append(evaluation)
+            else:
+                await evaluation.evaluator.evaluate(evaluation.cryptocurrency, evaluation.symbol,
+                                                    evaluation.time_frame, evaluation.candle_data, evaluation.candle)
+        # symbols with a different candles count are computed separately for their values not to change
+        for history_evaluations in EvaluatorUtil.BatchEvaluation.group_by_history_length(batched_evaluations):
+            await self._evaluate_same_history_batch(history_evaluations)
+
+    async def _evaluate_same_history_batch(self, batched_evaluations):
+        # compute RSI values and their trends for every symbol at once,
+        # each symbol evaluator then updates and publishes its own evaluation
+        rsi_matrix = EvaluatorUtil.BatchIndicators.rsi(
+            EvaluatorUtil.BatchEvaluation.stack_candle_data(batched_evaluations), self.period_length
+        )
+        if self.is_trend_change_identifier:
+            long_trends = EvaluatorUtil.TrendAnalysis.batch_get_trend(rsi_matrix, self.long_term_averages)
+            short_trends = EvaluatorUtil.TrendAnalysis.batch_get_trend(rsi_matrix, self.short_term_averages)
+        for index, evaluation in enumerate(batched_evaluations):
+            evaluator = evaluation.evaluator
+            last_rsi_value = rsi_matrix[index, -1]
+            if not math.isnan(last_rsi_value):
+                if self.is_trend_change_identifier:
+                    evaluator._set_trend_change_eval_note(last_rsi_value, long_trends[index], short_trends[index])
+                else:
+                    evaluator._set_threshold_eval_note(last_rsi_value)
+            elif not self.is_trend_change_identifier:
+                evaluator.eval_note = 0
+            await evaluator.evaluation_completed(
+                evaluation.cryptocurrency, evaluation.symbol, evaluation.time_frame,
+                eval_time=evaluators_util.get_eval_time(full_candle=evaluation.candle,
+                                                        time_frame=evaluation.time_frame)
+            )
+
+    def _set_trend_change_eval_note(self, last_rsi_value, long_trend, short_trend):
+        # check if trend change
+        if short_trend > 0 > long_trend:
+            # trend changed to up
+            self.set_eval_note(-short_trend)
+
+        elif long_trend > 0 > short_trend:
+            # trend changed to down
+            self.set_eval_note(short_trend)
+
+        # use RSI current value
+        if last_rsi_value > 50:
+            self.set_eval_note(last_rsi_value / 200)
+        else:
+            self.set_eval_note((last_rsi_value - 100) / 200)
+
+    def _set_threshold_eval_note(self, last_rsi_value):
+        self.eval_note = 0
+        if last_rsi_value >= self.short_threshold:
+            self.eval_note = 1
+        elif last_rsi_value <= self.long_threshold:
+            self.eval_note = -1
+
     @classmethod
     def get_is_symbol_wildcard(cls) -> bool:
         """
@@ -152,6 +234,7 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
+        self.exchange_id = None
         self.period_length = 14
         self.slow_eval_count = 16
         self.fast_eval_count = 4
@@ -227,12 +310,17 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
             fast_threshold[self.FAST_THRESHOLDS] = sorted(fast_threshold[self.FAST_THRESHOLDS],
                                                           key=lambda a: a[self.FAST_THRESHOLD])
 
-    def _get_rsi_averages(self, symbol_candles, time_frame, include_in_construction):
+    def _get_rsi_averages(self, exchange_id, symbol, symbol_candles, time_frame, include_in_construction):
         # compute the slow and fast RSI average
         candle_data = trading_api.get_symbol_close_candles(symbol_candles, time_frame,
                                                            include_in_construction=include_in_construction)
         if len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            candle_times = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                               include_in_construction=include_in_construction)
+            rsi_v = EvaluatorUtil.IncrementalIndicators.instance().rsi(
+                (exchange_id, symbol, time_frame, include_in_construction), candle_times, candle_data,
+                self.period_length
+            )
             rsi_v = data_util.drop_nan(rsi_v)
             if len(rsi_v):
                 slow_average = numpy.mean(rsi_v[-self.slow_eval_count:])
@@ -259,12 +347,22 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
             self.logger.error(f"Error when reading from config file: missing {e}")
         return None, None
 
+    async def start(self, bot_id: str) -> bool:
+        # stopped exchanges can't be identified anymore when stopping evaluators
+        self.exchange_id = trading_api.get_exchange_id_from_matrix_id(self.exchange_name, self.matrix_id)
+        return await super().start(bot_id)
+
+    async def stop(self) -> None:
+        await super().stop()
+        # incremental indicators states of this exchange won't be updated anymore
+        EvaluatorUtil.IncrementalIndicators.instance().clear(exchange_id=self.exchange_id)
+
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
         try:
             symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
             # compute the slow and fast RSI average
-            slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(symbol_candles, time_frame,
+            slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(exchange_id, symbol, symbol_candles, time_frame,
                                                                include_in_construction=inc_in_construction_data)
             current_candle_time = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
                                                                       include_in_construction=inc_in_construction_data)[
@@ -313,13 +411,16 @@ class BBMomentumEvaluator(evaluators.TAEvaluator):
                                                            time_frame,
                                                            self.period_length,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=exchange_id)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) >= self.period_length:
             # compute bollinger bands
-            lower_band, middle_band, upper_band = tulipy.bbands(candle_data, self.period_length, 2)
+            lower_band, middle_band, upper_band = EvaluatorUtil.IndicatorsCache.instance().get_indicator(
+                tulipy.bbands, "bbands", (candle_data, ), (self.period_length, 2),
+                exchange_id, symbol, time_frame, candle
+            )
 
             # if close to lower band => low value => bad,
             # therefore if close to middle, value is keeping up => good
@@ -393,13 +494,15 @@ class EMAMomentumEvaluator(evaluators.TAEvaluator):
                                                            time_frame,
                                                            self.period_length,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=exchange_id)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=None):
         self.eval_note = 0
         if len(candle_data) >= self.period_length:
             # compute ema
-            ema_values = tulipy.ema(candle_data, self.period_length)
+            ema_values = EvaluatorUtil.IndicatorsCache.instance().get_indicator(
+                tulipy.ema, "ema", (candle_data, ), (self.period_length, ), exchange_id, symbol, time_frame, candle
+            )
             if candle_data[-1] >= (ema_values[-1] * (1 + self.price_threshold_multiplier)):
                 self.eval_note = 1
             elif candle_data[-1] <= (ema_values[-1] * (1 - self.price_threshold_multiplier)):
@@ -414,6 +517,7 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
+        self.exchange_id = None
         self.period_length = 14
 
     def init_user_inputs(self, inputs: dict) -> None:
@@ -428,6 +532,16 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
     # implementation according to: https://www.investopedia.com/articles/technical/02/041002.asp => length = 14 and
     # exponential moving average = 20 in a uptrend market
     # idea: adx > 30 => strong trend, < 20 => trend change to come
+    async def start(self, bot_id: str) -> bool:
+        # stopped exchanges can't be identified anymore when stopping evaluators
+        self.exchange_id = trading_api.get_exchange_id_from_matrix_id(self.exchange_name, self.matrix_id)
+        return await super().start(bot_id)
+
+    async def stop(self) -> None:
+        await super().stop()
+        # incremental indicators states of this exchange won't be updated anymore
+        EvaluatorUtil.IncrementalIndicators.instance().clear(exchange_id=self.exchange_id)
+
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
         symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
@@ -438,22 +552,36 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
                                                                include_in_construction=inc_in_construction_data)
             low_candles = trading_api.get_symbol_low_candles(symbol_candles, time_frame,
                                                              include_in_construction=inc_in_construction_data)
-            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle)
+            candle_times = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                               include_in_construction=inc_in_construction_data)
+            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle,
+                                exchange_id=exchange_id, candle_times=candle_times,
+                                include_in_construction=inc_in_construction_data)
         else:
             self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                             eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                     time_frame=time_frame))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle,
+                       exchange_id=None, candle_times=None, include_in_construction=False):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(close_candles) >= self._get_minimal_data():
             min_adx = 7.5
             max_adx = 45
             neutral_adx = 25
-            adx = tulipy.adx(high_candles, low_candles, close_candles, self.period_length)
-            instant_ema = data_util.drop_nan(tulipy.ema(close_candles, 2))
-            slow_ema = data_util.drop_nan(tulipy.ema(close_candles, 20))
+            adx = EvaluatorUtil.IndicatorsCache.instance().get_indicator(
+                tulipy.adx, "adx", (high_candles, low_candles, close_candles), (self.period_length, ),
+                exchange_id, symbol, time_frame, candle
+            )
+            if candle_times is None:
+                instant_ema = data_util.drop_nan(tulipy.ema(close_candles, 2))
+                slow_ema = data_util.drop_nan(tulipy.ema(close_candles, 20))
+            else:
+                key = (exchange_id, symbol, time_frame, include_in_construction)
+                incremental_indicators = EvaluatorUtil.IncrementalIndicators.instance()
+                instant_ema = data_util.drop_nan(incremental_indicators.ema(key, candle_times, close_candles, 2))
+                slow_ema = data_util.drop_nan(incremental_indicators.ema(key, candle_times, close_candles, 20))
             adx = data_util.drop_nan(adx)
 
             if len(adx):
@@ -496,6 +624,7 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
 class MACDMomentumEvaluator(evaluators.TAEvaluator):
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
+        self.exchange_id = None
         self.previous_note = None
         self.long_period_length = 26
         self.short_period_length = 12
@@ -550,18 +679,41 @@ class MACDMomentumEvaluator(evaluators.TAEvaluator):
 
         self.eval_note = sign_multiplier * weight * average_pattern_period
 
+    async def start(self, bot_id: str) -> bool:
+        # stopped exchanges can't be identified anymore when stopping evaluators
+        self.exchange_id = trading_api.get_exchange_id_from_matrix_id(self.exchange_name, self.matrix_id)
+        return await super().start(bot_id)
+
+    async def stop(self) -> None:
+        await super().stop()
+        # incremental indicators states of this exchange won't be updated anymore
+        EvaluatorUtil.IncrementalIndicators.instance().clear(exchange_id=self.exchange_id)
+
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
+                                                           time_frame,
+                                                           include_in_construction=inc_in_construction_data)
+        candle_times = trading_api.get_symbol_time_candles(symbol_candles,
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            exchange_id=exchange_id, candle_times=candle_times,
+                            include_in_construction=inc_in_construction_data)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=None,
+                       candle_times=None, include_in_construction=False):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) > self.long_period_length:
-            macd, macd_signal, macd_hist = tulipy.macd(candle_data, self.short_period_length,
-                                                       self.long_period_length, self.signal_period_length)
+            if candle_times is None:
+                macd, macd_signal, macd_hist = tulipy.macd(candle_data, self.short_period_length,
+                                                           self.long_period_length, self.signal_period_length)
+            else:
+                macd, macd_signal, macd_hist = EvaluatorUtil.IncrementalIndicators.instance().macd(
+                    (exchange_id, symbol, time_frame, include_in_construction), candle_times, candle_data,
+                    self.short_period_length, self.long_period_length, self.signal_period_length
+                )
 
             # on macd hist => M pattern: bearish movement, W pattern: bullish movement
             #                 max on hist: optimal sell or buy
@@ -626,7 +778,7 @@ class KlingerOscillatorMomentumEvaluator(evaluators.TAEvaluator):
             volume_candles = trading_api.get_symbol_volume_candles(symbol_candles, time_frame,
                                                                    include_in_construction=inc_in_construction_data)
             await self.evaluate(cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                                close_candles, volume_candles, candle)
+                                close_candles, volume_candles, candle, exchange_id=exchange_id)
         else:
             self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
@@ -634,18 +786,15 @@ class KlingerOscillatorMomentumEvaluator(evaluators.TAEvaluator):
                                                                                     time_frame=time_frame))
 
     async def evaluate(self, cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                       close_candles, volume_candles, candle):
+                       close_candles, volume_candles, candle, exchange_id=None):
         eval_proposition = commons_constants.START_PENDING_EVAL_NOTE
-        kvo = tulipy.kvo(high_candles,
-                         low_candles,
-                         close_candles,
-                         volume_candles,
-                         self.short_period,
-                         self.long_period)
-        kvo = data_util.drop_nan(kvo)
-        if len(kvo) >= self.ema_signal_period:
-            kvo_ema = tulipy.ema(kvo, self.ema_signal_period)
-
+        kvo, kvo_ema = EvaluatorUtil.IndicatorsCache.instance().get_indicator(
+            _get_klinger_oscillator, "klinger_oscillator",
+            (high_candles, low_candles, close_candles, volume_candles),
+            (self.short_period, self.long_period, self.ema_signal_period),
+            exchange_id, symbol, time_frame, candle
+        )
+        if kvo_ema is not None:
             ema_difference = kvo - kvo_ema
 
             if len(ema_difference) > 1:
@@ -714,7 +863,7 @@ class KlingerOscillatorReversalConfirmationMomentumEvaluator(evaluators.TAEvalua
             volume_candles = trading_api.get_symbol_volume_candles(symbol_candles, time_frame,
                                                                    include_in_construction=inc_in_construction_data)
             await self.evaluate(cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                                close_candles, volume_candles, candle)
+                                close_candles, volume_candles, candle, exchange_id=exchange_id)
         else:
             self.eval_note = False
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
@@ -722,18 +871,15 @@ class KlingerOscillatorReversalConfirmationMomentumEvaluator(evaluators.TAEvalua
                                                                                     time_frame=time_frame))
 
     async def evaluate(self, cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                       close_candles, volume_candles, candle):
+                       close_candles, volume_candles, candle, exchange_id=None):
         if len(high_candles) >= self.short_period:
-            kvo = tulipy.kvo(high_candles,
-                             low_candles,
-                             close_candles,
-                             volume_candles,
-                             self.short_period,
-                             self.long_period)
-            kvo = data_util.drop_nan(kvo)
-            if len(kvo) >= self.ema_signal_period:
-
-                kvo_ema = tulipy.ema(kvo, self.ema_signal_period)
+            kvo, kvo_ema = EvaluatorUtil.IndicatorsCache.instance().get_indicator(
+                _get_klinger_oscillator, "klinger_oscillator",
+                (high_candles, low_candles, close_candles, volume_candles),
+                (self.short_period, self.long_period, self.ema_signal_period),
+                exchange_id, symbol, time_frame, candle
+            )
+            if kvo_ema is not None:
                 ema_difference = kvo - kvo_ema
 
                 if len(ema_difference) > 1:
@@ -746,3 +892,12 @@ class KlingerOscillatorReversalConfirmationMomentumEvaluator(evaluators.TAEvalua
         await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                         eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                 time_frame=time_frame))
+
+
+def _get_klinger_oscillator(high_candles, low_candles, close_candles, volume_candles,
+                            short_period, long_period, ema_signal_period):
+    # returns the klinger oscillator and its signal ema (None when there is not enough data to compute it)
+    kvo = data_util.drop_nan(tulipy.kvo(high_candles, low_candles, close_candles, volume_candles,
+                                        short_period, long_period))
+    kvo_ema = tulipy.ema(kvo, ema_signal_period) if len(kvo) >= ema_signal_period else None
+    return kvo, kvo_ema
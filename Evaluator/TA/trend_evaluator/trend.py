@@ -195,6 +195,7 @@ class DoubleMovingAverageTrendEvaluator(evaluators.TAEvaluator):
         super().__init__(tentacles_setup_config)
         self.slow_period_length = 10
         self.fast_period_length = 5
+        self.batch_evaluation = False
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -206,12 +207,28 @@ class DoubleMovingAverageTrendEvaluator(evaluators.TAEvaluator):
         self.fast_period_length = self.UI.user_input("short_period_length", enums.UserInputTypes.INT,
                                                      self.fast_period_length,
                                                      inputs, min_val=1, title="Fast SMA length")
+        self.batch_evaluation = self.UI.user_input(
+            "batch_evaluation", enums.UserInputTypes.BOOLEAN, self.batch_evaluation, inputs,
+            title="Batch evaluation: evaluate every traded symbol at once when their candles close. "
+                  "Faster when trading many symbols. Not used in backtesting.",
+        )
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
         candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
+        if self.batch_evaluation and not inc_in_construction_data:
+            exchange_manager = trading_api.get_exchange_manager_from_exchange_id(exchange_id)
+            # batches timeouts are in wall-clock time: in backtesting, they would publish evaluations out of order
+            if not trading_api.get_is_backtesting(exchange_manager):
+                await EvaluatorUtil.BatchEvaluation.instance().add_evaluation(
+                    (self.get_name(), exchange_id, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value]),
+                    EvaluatorUtil.PendingEvaluation(self, cryptocurrency, symbol, time_frame, candle, candle_data),
+                    trading_api.get_trading_pairs(exchange_manager),
+                    self._evaluate_batch
+                )
+                return
         await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
 
     async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
@@ -220,35 +237,90 @@ class DoubleMovingAverageTrendEvaluator(evaluators.TAEvaluator):
             current_moving_average = tulipy.sma(candle_data, 2)
             results = [self.get_moving_average_analysis(candle_data, current_moving_average, time_unit)
                        for time_unit in (self.fast_period_length, self.slow_period_length)]
-            if len(results):
-                self.eval_note = numpy.mean(results)
-            else:
-                self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
-
-            if self.eval_note == 0:
-                self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
+            self._set_moving_averages_eval_note(results)
         await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                         eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                 time_frame=time_frame))
 
+    async def _evaluate_batch(self, evaluations):
+        min_candles = max(self.slow_period_length, self.fast_period_length)
+        batched_evaluations = []
+        for evaluation in evaluations:
+            # batched moving averages also require at least 2 candles
+            if len(evaluation.candle_data) >= max(min_candles, 2):
+                batched_evaluations.append(evaluation)
+            else:
+                await self.evaluate(evaluation.cryptocurrency, evaluation.symbol, evaluation.time_frame,
+                                    evaluation.candle_data, evaluation.candle)
+        # symbols with a different candles count are computed separately for their values not to change
+        for history_evaluations in EvaluatorUtil.BatchEvaluation.group_by_history_length(batched_evaluations):
+            await self._evaluate_same_history_batch(history_evaluations)
+
+    async def _evaluate_same_history_batch(self, batched_evaluations):
+        # compute moving averages differences for every symbol at once
+        data_matrix = EvaluatorUtil.BatchEvaluation.stack_candle_data(batched_evaluations)
+        current_moving_averages = EvaluatorUtil.BatchIndicators.sma(data_matrix, 2)
+        symbols_results = [[] for _ in batched_evaluations]
+        for time_unit in (self.fast_period_length, self.slow_period_length):
+            values_differences = self._get_values_difference(
+                current_moving_averages, EvaluatorUtil.BatchIndicators.sma(data_matrix, time_unit)
+            )
+            if numpy.isnan(values_differences).any():
+                results = [self.get_moving_average_difference_analysis(data_util.drop_nan(values_difference))
+                           for values_difference in values_differences]
+            else:
+                results = [
+                    self.get_moving_average_difference_analysis(values_difference, crossing_indexes)
+                    for values_difference, crossing_indexes in zip(
+                        values_differences,
+                        EvaluatorUtil.TrendAnalysis.batch_get_threshold_change_indexes(values_differences, 0)
+                    )
+                ]
+            for symbol_results, result in zip(symbols_results, results):
+                symbol_results.append(result)
+        for evaluation, results in zip(batched_evaluations, symbols_results):
+            self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
+            self._set_moving_averages_eval_note(results)
+            await self.evaluation_completed(
+                evaluation.cryptocurrency, evaluation.symbol, evaluation.time_frame,
+                eval_time=evaluators_util.get_eval_time(full_candle=evaluation.candle,
+                                                        time_frame=evaluation.time_frame)
+            )
+
+    def _set_moving_averages_eval_note(self, results):
+        if len(results):
+            self.eval_note = numpy.mean(results)
+        else:
+            self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
+
+        if self.eval_note == 0:
+            self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
+
     # < 0 --> Current average bellow other one (computed using time_period)
     # > 0 --> Current average above other one (computed using time_period)
     @staticmethod
     def get_moving_average_analysis(data, current_moving_average, time_period):
+        values_difference = DoubleMovingAverageTrendEvaluator._get_values_difference(
+            current_moving_average, tulipy.sma(data, time_period)
+        )
+        return DoubleMovingAverageTrendEvaluator.get_moving_average_difference_analysis(
+            data_util.drop_nan(values_difference)
+        )
 
-        time_period_unit_moving_average = tulipy.sma(data, time_period)
-
-        # equalize array size
-        min_len_arrays = min(len(time_period_unit_moving_average), len(current_moving_average))
+    @staticmethod
+    def _get_values_difference(current_moving_average, time_period_unit_moving_average):
+        # equalize array size (works on a single moving average or on a batch of moving averages)
+        min_len_arrays = min(time_period_unit_moving_average.shape[-1], current_moving_average.shape[-1])
 
         # compute difference between 1 unit values and others ( >0 means currently up the other one)
-        values_difference = \
-            (current_moving_average[-min_len_arrays:] - time_period_unit_moving_average[-min_len_arrays:])
-        values_difference = data_util.drop_nan(values_difference)
+        return current_moving_average[..., -min_len_arrays:] - time_period_unit_moving_average[..., -min_len_arrays:]
 
+    @staticmethod
+    def get_moving_average_difference_analysis(values_difference, crossing_indexes=None):
         if len(values_difference):
             # indexes where current_unit_moving_average crosses time_period_unit_moving_average
-            crossing_indexes = EvaluatorUtil.TrendAnalysis.get_threshold_change_indexes(values_difference, 0)
+            if crossing_indexes is None:
+                crossing_indexes = EvaluatorUtil.TrendAnalysis.get_threshold_change_indexes(values_difference, 0)
 
             multiplier = 1 if values_difference[-1] > 0 else -1
 
@@ -21,6 +21,7 @@ import octobot_commons.data_util as data_util
 import octobot_evaluators.evaluators as evaluators
 import octobot_evaluators.util as evaluators_util
 import octobot_trading.api as trading_api
+import tentacles.Evaluator.Util as EvaluatorUtil
 
 
 class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
@@ -53,12 +54,14 @@ class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
         candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=exchange_id)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, exchange_id=None):
         try:
             if len(candle_data) >= self.period * 2:
-                stochrsi_value = tulipy.stochrsi(data_util.drop_nan(candle_data), self.period)[-1]
+                stochrsi_value = EvaluatorUtil.IndicatorsCache.instance().get_indicator(
+                    _get_stochrsi, "stochrsi", (candle_data, ), (self.period, ), exchange_id, symbol, time_frame, candle
+                )[-1]
 
                 if stochrsi_value * self.TULIPY_INDICATOR_MULTIPLICATOR >= self.high_level:
                     self.eval_note = 1
@@ -76,3 +79,7 @@ class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
         await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                         eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                 time_frame=time_frame))
+
+
+def _get_stochrsi(candle_data, period):
+    return tulipy.stochrsi(data_util.drop_nan(candle_data), period)
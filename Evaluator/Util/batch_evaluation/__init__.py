@@ -0,0 +1 @@
+from .batch_evaluation import BatchEvaluation, BatchIndicators, PendingEvaluation
@@ -0,0 +1,154 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import dataclasses
+import typing
+
+import numpy as np
+
+import octobot_commons.logging as logging
+import octobot_commons.singleton as singleton
+
+
+@dataclasses.dataclass
+class PendingEvaluation:
+    evaluator: object
+    cryptocurrency: str
+    symbol: str
+    time_frame: str
+    candle: list
+    candle_data: typing.Any
+
+
+class BatchEvaluation(singleton.Singleton):
+    """
+    Groups the evaluations of every symbol sharing a time frame candle close to evaluate them at once.
+    A batch is evaluated as soon as every expected symbol is added to it or when its timeout is reached.
+    """
+    DEFAULT_TIMEOUT = 10
+
+    def __init__(self):
+        self.logger = logging.get_logger(self.__class__.__name__)
+        self.pending_batches = {}
+
+    async def add_evaluation(self, batch_key, evaluation: PendingEvaluation, expected_symbols, evaluate_batch,
+                             timeout=DEFAULT_TIMEOUT):
+        """
+        :param batch_key: identifies the batch: evaluator, exchange, time frame and candle time
+        :param evaluation: the evaluation to add to the batch
+        :param expected_symbols: symbols to wait for before evaluating the batch
+        :param evaluate_batch: coroutine function called with the list of pending evaluations of the batch
+        :param timeout: seconds to wait for expected symbols before evaluating an incomplete batch
+        """
+        try:
+            batch = self.pending_batches[batch_key]
+        except KeyError:
+            batch = self.pending_batches[batch_key] = _Batch(
+                set(expected_symbols),
+                evaluate_batch,
+                asyncio.get_event_loop().call_later(timeout, self._create_evaluate_task, batch_key)
+            )
+        batch.evaluations[evaluation.symbol] = evaluation
+        if batch.expected_symbols.issubset(batch.evaluations):
+            await self.evaluate(batch_key)
+
+    async def evaluate(self, batch_key):
+        try:
+            batch = self.pending_batches.pop(batch_key)
+        except KeyError:
+            # already evaluated
+            return
+        batch.timeout_handle.cancel()
+        if missing_symbols := batch.expected_symbols.difference(batch.evaluations):
+            self.logger.warning(f"Evaluating {batch_key} without {len(missing_symbols)} missing symbols: "
+                                f"{', '.join(sorted(missing_symbols))}")
+        try:
+            await batch.evaluate_batch(list(batch.evaluations.values()))
+        except Exception as e:
+            self.logger.exception(e, True, f"Error when evaluating {batch_key} batch: {e}")
+
+    def _create_evaluate_task(self, batch_key):
+        asyncio.create_task(self.evaluate(batch_key))
+
+    def clear(self):
+        for batch in self.pending_batches.values():
+            batch.timeout_handle.cancel()
+        self.pending_batches = {}
+
+    @staticmethod
+    def group_by_history_length(evaluations):
+        """
+        :return: lists of the given evaluations sharing the same candles count, to stack without cutting any history
+        """
+        evaluations_by_history_length = {}
+        for evaluation in evaluations:
+            evaluations_by_history_length.setdefault(len(evaluation.candle_data), []).append(evaluation)
+        return list(evaluations_by_history_length.values())
+
+    @staticmethod
+    def stack_candle_data(evaluations):
+        """
+        :param evaluations: evaluations sharing the same candles count, see group_by_history_length
+        :return: a (symbols, candles) matrix of the candles of each evaluation
+        """
+        if len({len(evaluation.candle_data) for evaluation in evaluations}) > 1:
+            raise ValueError("Evaluations with different candles counts can't be stacked, "
+                             "group them using group_by_history_length")
+        return np.vstack([evaluation.candle_data for evaluation in evaluations])
+
+
+@dataclasses.dataclass
+class _Batch:
+    expected_symbols: set
+    evaluate_batch: typing.Callable
+    timeout_handle: asyncio.TimerHandle
+    evaluations: dict = dataclasses.field(default_factory=dict)
+
+
+class BatchIndicators:
+    """
+    Indicators computed on each row of a (symbols, candles) matrix. Arithmetic follows tulipy's: each row
+    gets the same values as tulipy's on this row.
+    """
+
+    @staticmethod
+    def rsi(data_matrix, period):
+        per = 1.0 / period
+        changes = np.diff(data_matrix, axis=1)
+        upwards = np.where(changes > 0, changes, 0.0)
+        downwards = np.where(changes < 0, -changes, 0.0)
+        # cumsum sums values sequentially, as tulipy
+        smooth_up = np.cumsum(upwards[:, :period], axis=1)[:, -1] / period
+        smooth_down = np.cumsum(downwards[:, :period], axis=1)[:, -1] / period
+        rsi = np.empty((len(data_matrix), data_matrix.shape[1] - period))
+        rsi[:, 0] = 100.0 * (smooth_up / (smooth_up + smooth_down))
+        for index in range(period, changes.shape[1]):
+            smooth_up = (upwards[:, index] - smooth_up) * per + smooth_up
+            smooth_down = (downwards[:, index] - smooth_down) * per + smooth_down
+            rsi[:, index - period + 1] = 100.0 * (smooth_up / (smooth_up + smooth_down))
+        return rsi
+
+    @staticmethod
+    def sma(data_matrix, period):
+        scale = 1.0 / period
+        total = np.cumsum(data_matrix[:, :period], axis=1)[:, -1]
+        sma = np.empty((len(data_matrix), data_matrix.shape[1] - period + 1))
+        sma[:, 0] = total * scale
+        for index in range(period, data_matrix.shape[1]):
+            total = total + data_matrix[:, index]
+            total = total - data_matrix[:, index - period]
+            sma[:, index - period + 1] = total * scale
+        return sma
@@ -0,0 +1,119 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import mock
+import numpy as np
+import pytest
+import tulipy
+
+from tentacles.Evaluator.Util import BatchEvaluation, BatchIndicators, PendingEvaluation
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+BATCH_KEY = ("RSIMomentumEvaluator", "binance_id", "1h", 0)
+
+
+def _random_closes(count, length):
+    closes = np.cumsum(np.random.default_rng(42).normal(0, 10, (count, length)), axis=1) + 20000
+    # add flat moves
+    closes[0, 50:70] = closes[0, 50]
+    return closes
+
+
+def _evaluation(symbol, candle_data=None):
+    return PendingEvaluation(None, symbol.split("/")[0], symbol, "1h", [0, 1, 1, 1, 1, 1],
+                             np.arange(10) if candle_data is None else candle_data)
+
+
+async def test_rsi():
+    closes = _random_closes(20, 200)
+    for period in (2, 14, 50):
+        rsi_matrix = BatchIndicators.rsi(closes, period)
+        for closes_row, rsi_row in zip(closes, rsi_matrix):
+            np.testing.assert_array_equal(rsi_row, tulipy.rsi(closes_row, period))
+
+
+async def test_sma():
+    closes = _random_closes(20, 200)
+    for period in (1, 2, 10, 200):
+        sma_matrix = BatchIndicators.sma(closes, period)
+        for closes_row, sma_row in zip(closes, sma_matrix):
+            np.testing.assert_array_equal(sma_row, tulipy.sma(closes_row, period))
+
+
+async def test_evaluate_when_all_symbols_are_added():
+    batch_evaluation = BatchEvaluation()
+    evaluate_batch = mock.AsyncMock()
+    for symbol in SYMBOLS:
+        evaluate_batch.assert_not_called()
+        await batch_evaluation.add_evaluation(BATCH_KEY, _evaluation(symbol), SYMBOLS, evaluate_batch)
+    evaluate_batch.assert_awaited_once()
+    assert [evaluation.symbol for evaluation in evaluate_batch.await_args[0][0]] == SYMBOLS
+    assert batch_evaluation.pending_batches == {}
+
+
+async def test_evaluate_on_timeout():
+    batch_evaluation = BatchEvaluation()
+    evaluate_batch = mock.AsyncMock()
+    await batch_evaluation.add_evaluation(BATCH_KEY, _evaluation(SYMBOLS[0]), SYMBOLS, evaluate_batch, timeout=0.01)
+    # other candle time
+    await batch_evaluation.add_evaluation(BATCH_KEY[:3] + (3600, ), _evaluation(SYMBOLS[1]), SYMBOLS,
+                                          evaluate_batch, timeout=10)
+    evaluate_batch.assert_not_called()
+    await asyncio.sleep(0.05)
+    evaluate_batch.assert_awaited_once()
+    assert [evaluation.symbol for evaluation in evaluate_batch.await_args[0][0]] == SYMBOLS[:1]
+    assert list(batch_evaluation.pending_batches) == [BATCH_KEY[:3] + (3600, )]
+    batch_evaluation.clear()
+    assert batch_evaluation.pending_batches == {}
+
+
+async def test_stack_candle_data():
+    stacked = BatchEvaluation.stack_candle_data([
+        _evaluation(SYMBOLS[0], np.arange(10)), _evaluation(SYMBOLS[1], np.arange(10, 20))
+    ])
+    np.testing.assert_array_equal(stacked, [np.arange(10), np.arange(10, 20)])
+    assert BatchEvaluation.stack_candle_data([
+        _evaluation(SYMBOLS[0], np.arange(0)), _evaluation(SYMBOLS[1], np.arange(0))
+    ]).shape == (2, 0)
+    with pytest.raises(ValueError):
+        # histories are never cut
+        BatchEvaluation.stack_candle_data([
+            _evaluation(SYMBOLS[0], np.arange(10)), _evaluation(SYMBOLS[1], np.arange(5))
+        ])
+
+
+async def test_mixed_history_lengths():
+    closes = _random_closes(4, 200)
+    evaluations = [
+        _evaluation(SYMBOLS[0], closes[0]),
+        # new pair with a short history
+        _evaluation(SYMBOLS[1], closes[1, -20:]),
+        _evaluation(SYMBOLS[2], closes[2]),
+        _evaluation("ADA/USDT", closes[3, -20:]),
+    ]
+    groups = BatchEvaluation.group_by_history_length(evaluations)
+    assert [[evaluation.symbol for evaluation in group] for group in groups] == \
+           [[SYMBOLS[0], SYMBOLS[2]], [SYMBOLS[1], "ADA/USDT"]]
+    for group in groups:
+        rsi_matrix = BatchIndicators.rsi(BatchEvaluation.stack_candle_data(group), 14)
+        sma_matrix = BatchIndicators.sma(BatchEvaluation.stack_candle_data(group), 10)
+        for evaluation, rsi_row, sma_row in zip(group, rsi_matrix, sma_matrix):
+            # same values as each symbol's own evaluation
+            np.testing.assert_array_equal(rsi_row, tulipy.rsi(evaluation.candle_data, 14))
+            np.testing.assert_array_equal(sma_row, tulipy.sma(evaluation.candle_data, 10))
@@ -0,0 +1 @@
+from .incremental_indicators import IncrementalIndicators
\ No newline at end of file
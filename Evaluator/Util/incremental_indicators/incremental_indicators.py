@@ -0,0 +1,283 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+
+import numpy
+
+import octobot_commons.singleton as singleton
+
+
+class IncrementalIndicators(singleton.Singleton):
+    """
+    Keeps running indicators states per (exchange, symbol, time frame, include in construction candle) key
+    to update indicators in O(1) on each new candle instead of recomputing them on the whole candles history.
+    States are kept until their exchange is cleared: evaluators clear their exchange's states when stopped.
+    Arithmetic follows tulipy's: values are identical to tulipy's computed on every candle since the state
+    was built. States are rebuilt from the given candles whenever a gap or a history reload is detected.
+    When the candles window slides, states keep their previous candles instead of starting over from the
+    window's first candle: values then differ from tulipy's on the window by their initial seed difference,
+    which fades out exponentially (by a (1 - 1 / period) factor per candle for RSI).
+    Use the shared instance to share states between evaluators: returned values are views that are
+    only valid until the next update of the same indicator and should never be modified in place.
+    """
+    RSI = "rsi"
+    EMA = "ema"
+    MACD = "macd"
+
+    def __init__(self):
+        self.states = {}
+
+    def rsi(self, key, candle_times, candle_data, period):
+        """
+        :return: tulipy.rsi values computed since the state was built, as many as tulipy.rsi(candle_data, period)
+        """
+        return self._get_indicator(key, candle_times, candle_data, (self.RSI, period), _RSI, period)[0]
+
+    def ema(self, key, candle_times, candle_data, period):
+        """
+        :return: tulipy.ema values computed since the state was built, as many as tulipy.ema(candle_data, period)
+        """
+        return self._get_indicator(key, candle_times, candle_data, (self.EMA, period), _EMA, period)[0]
+
+    def macd(self, key, candle_times, candle_data, short_period, long_period, signal_period):
+        """
+        :return: tulipy.macd macd, macd_signal, macd_histogram values computed since the state was built,
+        as many as tulipy.macd(candle_data, short_period, long_period, signal_period)
+        """
+        return self._get_indicator(key, candle_times, candle_data,
+                                   (self.MACD, short_period, long_period, signal_period),
+                                   _MACD, short_period, long_period, signal_period)
+
+    def clear(self, exchange_id=None):
+        """
+        :param exchange_id: when given, only clear the states of this exchange (first element of keys)
+        """
+        if exchange_id is None:
+            self.states = {}
+        else:
+            self.states = {
+                state_key: indicator
+                for state_key, indicator in self.states.items()
+                if state_key[0][0] != exchange_id
+            }
+
+    def _get_indicator(self, key, candle_times, candle_data, indicator_key, indicator_class, *params):
+        state_key = (key, indicator_key)
+        try:
+            indicator = self.states[state_key]
+        except KeyError:
+            indicator = self.states[state_key] = indicator_class(*params)
+        return indicator.update(candle_times, candle_data)
+
+
+class _IncrementalIndicator:
+    """
+    Committed state is always up to date with every candle but the last one, which is considered
+    as in construction: its outputs are computed from the committed state without being stored.
+    """
+    OUTPUTS_COUNT = 1
+
+    def __init__(self):
+        self.state = None
+        self.committed_time = None
+        self.committed_value = None
+        self.outputs = _OutputsBuffer(self.OUTPUTS_COUNT)
+
+    def get_start_index(self):
+        """
+        :return: the index of the first candle to produce an output
+        """
+        raise NotImplementedError("get_start_index is not implemented")
+
+    def get_initial_state(self, value):
+        raise NotImplementedError("get_initial_state is not implemented")
+
+    def step(self, state, value):
+        """
+        :return: the new state and the outputs tuple (or None when no output is produced yet)
+        """
+        raise NotImplementedError("step is not implemented")
+
+    def update(self, candle_times, candle_data):
+        candles_count = len(candle_data)
+        if candles_count <= self.get_start_index():
+            raise ValueError(f"Not enough candles to compute {self.__class__.__name__}: {candles_count} candles")
+        series_length = candles_count - self.get_start_index()
+        self.outputs.reserve(series_length)
+        if self._is_up_to_date_until(candle_times, candle_data, -2):
+            # last candle got updated
+            pass
+        elif self._is_up_to_date_until(candle_times, candle_data, -3):
+            # new candle
+            self._commit(candle_times[-2], float(candle_data[-2]))
+        else:
+            # gap or history reload
+            self._reset(candle_times, candle_data)
+        if candles_count == 1:
+            outputs = self.get_initial_state(float(candle_data[-1]))[1]
+        else:
+            outputs = self.step(self.state, float(candle_data[-1]))[1]
+        return self.outputs.get_series(series_length, outputs)
+
+    def _is_up_to_date_until(self, candle_times, candle_data, index):
+        return self.committed_time is not None and len(candle_data) >= -index \
+            and candle_times[index] == self.committed_time and candle_data[index] == self.committed_value
+
+    def _commit(self, candle_time, value):
+        self.state, outputs = self.step(self.state, value)
+        if outputs is not None:
+            self.outputs.append(outputs)
+        self.committed_time = candle_time
+        self.committed_value = value
+
+    def _reset(self, candle_times, candle_data):
+        self.outputs.clear()
+        self.committed_time = self.committed_value = None
+        if len(candle_data) > 1:
+            values = candle_data[:-1].tolist()
+            self.state, outputs = self.get_initial_state(values[0])
+            if outputs is not None:
+                self.outputs.append(outputs)
+            for value in values[1:]:
+                self.state, outputs = self.step(self.state, value)
+                if outputs is not None:
+                    self.outputs.append(outputs)
+            self.committed_time = candle_times[-2]
+            self.committed_value = candle_data[-2]
+
+
+class _RSI(_IncrementalIndicator):
+    def __init__(self, period):
+        super().__init__()
+        self.period = period
+        self.per = 1.0 / period
+
+    def get_start_index(self):
+        return self.period
+
+    def get_initial_state(self, value):
+        # state: index, smooth_up, smooth_down, previous_value
+        return (0, 0.0, 0.0, value), None
+
+    def step(self, state, value):
+        index, smooth_up, smooth_down, previous_value = state
+        index += 1
+        upward = value - previous_value if value > previous_value else 0.0
+        downward = previous_value - value if value < previous_value else 0.0
+        if index < self.period:
+            return (index, smooth_up + upward, smooth_down + downward, value), None
+        if index == self.period:
+            smooth_up = (smooth_up + upward) / self.period
+            smooth_down = (smooth_down + downward) / self.period
+        else:
+            smooth_up = (upward - smooth_up) * self.per + smooth_up
+            smooth_down = (downward - smooth_down) * self.per + smooth_down
+        total = smooth_up + smooth_down
+        # flat candles: nan as tulipy's 0 / 0
+        return (index, smooth_up, smooth_down, value), (100.0 * (smooth_up / total) if total else numpy.nan, )
+
+
+class _EMA(_IncrementalIndicator):
+    def __init__(self, period):
+        super().__init__()
+        self.per = 2 / (period + 1)
+
+    def get_start_index(self):
+        return 0
+
+    def get_initial_state(self, value):
+        return value, (value, )
+
+    def step(self, state, value):
+        state = (value - state) * self.per + state
+        return state, (state, )
+
+
+class _MACD(_IncrementalIndicator):
+    OUTPUTS_COUNT = 3
+
+    def __init__(self, short_period, long_period, signal_period):
+        super().__init__()
+        self.long_period = long_period
+        self.short_per = 2 / (short_period + 1)
+        self.long_per = 2 / (long_period + 1)
+        if short_period == 12 and long_period == 26:
+            # same as tulipy (and TA-Lib) for the default MACD settings
+            self.short_per = 0.15
+            self.long_per = 0.075
+        self.signal_per = 2 / (signal_period + 1)
+
+    def get_start_index(self):
+        return self.long_period - 1
+
+    def get_initial_state(self, value):
+        # state: index, short_ema, long_ema, signal_ema
+        return (0, value, value, 0.0), None
+
+    def step(self, state, value):
+        index, short_ema, long_ema, signal_ema = state
+        index += 1
+        short_ema = (value - short_ema) * self.short_per + short_ema
+        long_ema = (value - long_ema) * self.long_per + long_ema
+        macd = short_ema - long_ema
+        if index == self.long_period - 1:
+            signal_ema = macd
+        if index >= self.long_period - 1:
+            signal_ema = (macd - signal_ema) * self.signal_per + signal_ema
+            return (index, short_ema, long_ema, signal_ema), (macd, signal_ema, macd - signal_ema)
+        return (index, short_ema, long_ema, signal_ema), None
+
+
+class _OutputsBuffer:
+    """
+    Pre-allocated outputs storage: returned series are views on this buffer, they are
+    only valid until the next update.
+    """
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, columns_count):
+        self.values = numpy.empty((columns_count, self.INITIAL_CAPACITY), dtype=numpy.float64)
+        self.size = 0
+        self.max_series_length = 0
+
+    def append(self, outputs):
+        if self.size + 1 >= self.values.shape[1]:
+            self._make_room()
+        self.values[:, self.size] = outputs
+        self.size += 1
+
+    def clear(self):
+        self.size = 0
+
+    def reserve(self, series_length):
+        self.max_series_length = max(self.max_series_length, series_length)
+
+    def get_series(self, length, last_outputs):
+        if self.size + 1 >= self.values.shape[1]:
+            self._make_room()
+        self.values[:, self.size] = last_outputs
+        start_index = max(0, self.size + 1 - length)
+        return tuple(column[start_index:self.size + 1] for column in self.values)
+
+    def _make_room(self):
+        # only keep the values that can be requested, grow when they are filling more than half of the buffer
+        kept_count = min(self.size, self.max_series_length)
+        capacity = self.values.shape[1]
+        if kept_count * 2 > capacity:
+            capacity *= 2
+        values = numpy.empty((self.values.shape[0], capacity), dtype=numpy.float64)
+        values[:, :kept_count] = self.values[:, self.size - kept_count:self.size]
+        self.values = values
+        self.size = kept_count
@@ -0,0 +1,195 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import numpy as np
+import pytest
+import tulipy
+
+from tentacles.Evaluator.Util import IncrementalIndicators
+
+KEY = ("binance", "BTC/USDT", "1h", False)
+TIME_FRAME_SECONDS = 3600
+
+
+@pytest.fixture
+def candles():
+    random_generator = np.random.default_rng(42)
+    closes = np.cumsum(random_generator.normal(0, 10, 1500)) + 20000
+    times = np.arange(len(closes), dtype=np.float64) * TIME_FRAME_SECONDS
+    return times, closes
+
+
+def test_rsi_on_growing_history(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    for end in range(15, 300):
+        np.testing.assert_array_equal(indicators.rsi(KEY, times[:end], closes[:end], 14),
+                                      tulipy.rsi(closes[:end], 14))
+
+
+def test_ema_on_growing_history(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    for end in range(1, 300):
+        np.testing.assert_array_equal(indicators.ema(KEY, times[:end], closes[:end], 21),
+                                      tulipy.ema(closes[:end], 21))
+
+
+def test_macd_on_growing_history(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    for short_period, long_period, signal_period in ((12, 26, 9), (5, 10, 3)):
+        for end in range(long_period, 1300):
+            for incremental, expected in zip(
+                indicators.macd(KEY, times[:end], closes[:end], short_period, long_period, signal_period),
+                tulipy.macd(closes[:end], short_period, long_period, signal_period)
+            ):
+                np.testing.assert_array_equal(incremental, expected)
+
+
+def test_rsi_with_in_construction_candle(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    for end in range(100, 120):
+        updated_closes = closes[:end].copy()
+        for last_close in (closes[end - 1] - 15, closes[end - 1] + 20, closes[end - 1]):
+            updated_closes[-1] = last_close
+            np.testing.assert_array_equal(indicators.rsi(KEY, times[:end], updated_closes, 14),
+                                          tulipy.rsi(updated_closes, 14))
+
+
+def test_rsi_after_gap_and_history_reload(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    np.testing.assert_array_equal(indicators.rsi(KEY, times[:100], closes[:100], 14), tulipy.rsi(closes[:100], 14))
+    # gap: candles are missing
+    np.testing.assert_array_equal(indicators.rsi(KEY, times[:110], closes[:110], 14), tulipy.rsi(closes[:110], 14))
+    # history reload: different values for the same times
+    reloaded_closes = closes[:111] * 1.01
+    np.testing.assert_array_equal(indicators.rsi(KEY, times[:111], reloaded_closes, 14),
+                                  tulipy.rsi(reloaded_closes, 14))
+    # sliding window: start over from the window's first candle
+    np.testing.assert_array_equal(indicators.rsi(KEY, times[50:200], closes[50:200], 14),
+                                  tulipy.rsi(closes[50:200], 14))
+
+
+def test_sliding_window(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    window = 500
+    period = 14
+    for end in range(window, len(closes)):
+        rsi = indicators.rsi(KEY, times[end - window:end], closes[end - window:end], period)
+        window_rsi = tulipy.rsi(closes[end - window:end], period)
+        assert len(rsi) == len(window_rsi)
+        # states keep their previous candles: same values as tulipy on every candle since the state was built
+        np.testing.assert_array_equal(rsi, tulipy.rsi(closes[:end], period)[-len(rsi):])
+        # instead of starting over from the window's first candle: the difference fades out exponentially
+        seed_difference_bound = 2 * 100 * (1 - 1 / period) ** np.arange(1, len(rsi) + 1)
+        assert np.all(np.abs(rsi - window_rsi) <= seed_difference_bound)
+        np.testing.assert_allclose(rsi[-100:], window_rsi[-100:], rtol=1e-9)
+
+
+def test_rsi_on_flat_candles(candles):
+    times, _ = candles
+    closes = np.full(60, 1.0)
+    closes[40:] = np.arange(2, 22)
+    indicators = IncrementalIndicators()
+    for end in range(15, 60):
+        # nan as tulipy when candles are flat
+        np.testing.assert_array_equal(indicators.rsi(KEY, times[:end], closes[:end], 14),
+                                      tulipy.rsi(closes[:end], 14))
+    assert np.isnan(indicators.rsi(KEY, times[:30], closes[:30], 14)[-1])
+
+
+def test_keys_are_independent(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    other_key = ("binance", "ETH/USDT", "1h", False)
+    for end in range(30, 60):
+        np.testing.assert_array_equal(indicators.rsi(KEY, times[:end], closes[:end], 14),
+                                      tulipy.rsi(closes[:end], 14))
+        np.testing.assert_array_equal(indicators.rsi(other_key, times[:end], closes[:end] / 10, 14),
+                                      tulipy.rsi(closes[:end] / 10, 14))
+    indicators.clear()
+    assert indicators.states == {}
+
+
+def test_closed_and_in_construction_candles_keys(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    in_construction_key = KEY[:3] + (True, )
+    indicators.rsi(KEY, times[:99], closes[:99], 14)
+    indicators.rsi(in_construction_key, times[:100], closes[:100], 14)
+    closed_state, in_construction_state = indicators.states.values()
+    with mock.patch.object(closed_state, "_reset", mock.Mock()) as closed_reset_mock, \
+         mock.patch.object(in_construction_state, "_reset", mock.Mock()) as in_construction_reset_mock:
+        for end in range(100, 120):
+            # closed candles then the current candle in construction
+            np.testing.assert_array_equal(indicators.rsi(KEY, times[:end], closes[:end], 14),
+                                          tulipy.rsi(closes[:end], 14))
+            np.testing.assert_array_equal(indicators.rsi(in_construction_key, times[:end + 1], closes[:end + 1], 14),
+                                          tulipy.rsi(closes[:end + 1], 14))
+        # each state is only updated
+        closed_reset_mock.assert_not_called()
+        in_construction_reset_mock.assert_not_called()
+
+
+def test_clear_exchange(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    other_exchange_key = ("kucoin", ) + KEY[1:]
+    for key in (KEY, KEY[:3] + (True, ), other_exchange_key):
+        indicators.rsi(key, times[:50], closes[:50], 14)
+        indicators.ema(key, times[:50], closes[:50], 21)
+    indicators.clear(exchange_id="kucoin")
+    assert len(indicators.states) == 4
+    assert all(state_key[0][0] == "binance" for state_key in indicators.states)
+    # cleared states are rebuilt
+    np.testing.assert_array_equal(indicators.rsi(other_exchange_key, times[:51], closes[:51], 14),
+                                  tulipy.rsi(closes[:51], 14))
+    indicators.clear(exchange_id="binance")
+    assert [state_key[0] for state_key in indicators.states] == [other_exchange_key]
+
+
+def test_many_keys_are_not_rebuilt(candles):
+    times, closes = candles
+    indicators = IncrementalIndicators()
+    # ex: 300 pairs on 5 time frames on closed and in construction candles
+    keys = [("binance", f"PAIR{i}/USDT", time_frame, include_in_construction)
+            for i in range(300)
+            for time_frame in ("1m", "5m", "15m", "1h", "4h")
+            for include_in_construction in (False, True)]
+    for key in keys:
+        indicators.rsi(key, times[:50], closes[:50], 14)
+        indicators.ema(key, times[:50], closes[:50], 20)
+    assert len(indicators.states) == 2 * len(keys)
+    rsi_class, ema_class = (type(indicator) for indicator in list(indicators.states.values())[:2])
+    with mock.patch.object(rsi_class, "_reset", mock.Mock()) as rsi_reset_mock, \
+         mock.patch.object(ema_class, "_reset", mock.Mock()) as ema_reset_mock:
+        for end in (51, 52):
+            for key in keys:
+                indicators.rsi(key, times[:end], closes[:end], 14)
+                indicators.ema(key, times[:end], closes[:end], 20)
+        rsi_reset_mock.assert_not_called()
+        ema_reset_mock.assert_not_called()
+    np.testing.assert_array_equal(indicators.rsi(keys[0], times[:53], closes[:53], 14), tulipy.rsi(closes[:53], 14))
+
+
+def test_not_enough_candles(candles):
+    times, closes = candles
+    with pytest.raises(ValueError):
+        IncrementalIndicators().rsi(KEY, times[:14], closes[:14], 14)
@@ -0,0 +1,77 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import collections
+
+import octobot_commons.enums as commons_enums
+import octobot_commons.singleton as singleton
+
+
+class IndicatorsCache(singleton.Singleton):
+    """
+    Shared memoization of indicators computed on candles: evaluators computing the same indicator
+    with the same parameters on the same candles only compute it once per candle.
+    Cached values are shared between evaluators and should never be modified in place.
+    """
+    DEFAULT_MAX_SIZE = 1024
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.indicators = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_indicator(self, compute_indicator, indicator_name, inputs, params,
+                      exchange, symbol, time_frame, candle):
+        """
+        :param compute_indicator: function to call as compute_indicator(*inputs, *params) when the value is not cached
+        :param indicator_name: identifier of the indicator and of its input data, ex: "rsi" for RSI on close prices
+        :param inputs: tuple of the indicator input arrays
+        :param params: tuple of the indicator parameters
+        :param candle: the candle triggering the evaluation
+        :return: the cached or computed indicator value
+        """
+        if exchange is None:
+            # evaluation not triggered by an exchange: inputs can't be identified
+            return compute_indicator(*inputs, *params)
+        key = (
+            indicator_name, params, exchange, symbol, time_frame,
+            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
+            len(inputs[0]), tuple(data[-1] for data in inputs if len(data))
+        )
+        try:
+            value = self.indicators[key]
+            self.indicators.move_to_end(key)
+            self.hits += 1
+            return value
+        except KeyError:
+            self.misses += 1
+        value = compute_indicator(*inputs, *params)
+        self.indicators[key] = value
+        if len(self.indicators) > self.max_size:
+            self.indicators.popitem(last=False)
+        return value
+
+    def get_stats(self):
+        return {
+            "size": len(self.indicators),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        self.indicators.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,88 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import numpy as np
+import pytest
+import tulipy
+
+from tentacles.Evaluator.Util import IndicatorsCache
+
+EXCHANGE_ID = "binance_id"
+SYMBOL = "BTC/USDT"
+TIME_FRAME = "1h"
+
+
+@pytest.fixture
+def closes():
+    return np.cumsum(np.random.default_rng(42).normal(0, 10, 200)) + 20000
+
+
+def _candle(candle_time):
+    return [candle_time, 1, 1, 1, 1, 1]
+
+
+def test_get_indicator_once_per_candle(closes):
+    cache = IndicatorsCache()
+    compute_rsi = mock.Mock(side_effect=tulipy.rsi)
+    first = cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, SYMBOL, TIME_FRAME, _candle(0))
+    second = cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, SYMBOL, TIME_FRAME, _candle(0))
+    compute_rsi.assert_called_once_with(closes, 14)
+    assert first is second
+    np.testing.assert_array_equal(first, tulipy.rsi(closes, 14))
+    assert cache.get_stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_get_indicator_different_keys(closes):
+    cache = IndicatorsCache()
+    compute_rsi = mock.Mock(side_effect=tulipy.rsi)
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, SYMBOL, TIME_FRAME, _candle(0))
+    # other params
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (10, ), EXCHANGE_ID, SYMBOL, TIME_FRAME, _candle(0))
+    # other symbol, exchange and time frame
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, "ETH/USDT", TIME_FRAME, _candle(0))
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), "kucoin_id", SYMBOL, TIME_FRAME, _candle(0))
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, SYMBOL, "4h", _candle(0))
+    # new candle
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, SYMBOL, TIME_FRAME, _candle(3600))
+    # updated in construction candle
+    updated_closes = closes.copy()
+    updated_closes[-1] += 1
+    cache.get_indicator(compute_rsi, "rsi", (updated_closes, ), (14, ), EXCHANGE_ID, SYMBOL, TIME_FRAME,
+                        _candle(3600))
+    assert compute_rsi.call_count == 7
+    assert cache.get_stats() == {"size": 7, "hits": 0, "misses": 7}
+
+
+def test_get_indicator_without_exchange(closes):
+    cache = IndicatorsCache()
+    compute_rsi = mock.Mock(side_effect=tulipy.rsi)
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), None, SYMBOL, TIME_FRAME, _candle(0))
+    cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), None, SYMBOL, TIME_FRAME, _candle(0))
+    assert compute_rsi.call_count == 2
+    assert cache.get_stats() == {"size": 0, "hits": 0, "misses": 0}
+
+
+def test_lru_eviction(closes):
+    cache = IndicatorsCache(max_size=2)
+    compute_rsi = mock.Mock(side_effect=tulipy.rsi)
+    for candle_time in (0, 1, 0, 2):
+        cache.get_indicator(compute_rsi, "rsi", (closes, ), (14, ), EXCHANGE_ID, SYMBOL, TIME_FRAME,
+                            _candle(candle_time))
+    # 1 is the least recently used value
+    assert [key[5] for key in cache.indicators] == [0, 2]
+    assert cache.get_stats() == {"size": 2, "hits": 1, "misses": 3}
+    cache.clear()
+    assert cache.get_stats() == {"size": 0, "hits": 0, "misses": 0}
@@ -36,11 +36,10 @@ class PatternAnalyser:
             shape = PatternAnalyser.get_pattern(last_move_data)
 
             if shape == "N" or shape == "V":
-                # check presence of W or M with insignificant move in the other direction
-                backwards_index = 2
-                while backwards_index < len(zero_crossing_indexes) and \
-                        zero_crossing_indexes[-1*backwards_index] - zero_crossing_indexes[-1*backwards_index-1] < 4:
-                    backwards_index += 1
+                # check presence of W or M with insignificant move in the other direction:
+                # go backwards while moves are shorter than 4
+                short_moves = np.diff(zero_crossing_indexes)[-2::-1] < 4
+                backwards_index = 2 + (int(np.argmin(short_moves)) if not short_moves.all() else len(short_moves))
                 extended_last_move_data = data[zero_crossing_indexes[-1 * backwards_index]:]
                 extended_shape = PatternAnalyser.get_pattern(extended_last_move_data)
 
@@ -73,16 +72,43 @@ class PatternAnalyser:
             if mean_value < 0 \
             else np.where(data < mean_value)[0]
 
-        nb_gaps = 0
-        for i in range(len(indexes_under_mean_value)-1):
-            if indexes_under_mean_value[i+1]-indexes_under_mean_value[i] > 3:
-                nb_gaps += 1
+        nb_gaps = np.count_nonzero(np.diff(indexes_under_mean_value) > 3)
 
         if nb_gaps > 1:
             return "W" if mean_value < 0 else "M"
         else:
             return "V" if mean_value < 0 else "N"
 
+    # same as get_pattern on each row of data_matrix
+    @staticmethod
+    def batch_get_pattern(data_matrix):
+        patterns = np.full(len(data_matrix), PatternAnalyser.UNKNOWN_PATTERN)
+        if not data_matrix.shape[1]:
+            return patterns
+        mean_values = np.mean(data_matrix, axis=1) * 0.7
+        negative_means = mean_values < 0
+        under_mean_values = np.where(negative_means[:, np.newaxis],
+                                     data_matrix > mean_values[:, np.newaxis],
+                                     data_matrix < mean_values[:, np.newaxis])
+
+        # a gap is an under mean value index more than 3 indexes after the previous under mean value index
+        indexes = np.arange(data_matrix.shape[1])
+        last_under_mean_indexes = np.maximum.accumulate(np.where(under_mean_values, indexes, -1), axis=1)
+        previous_under_mean_indexes = np.hstack((np.full((len(data_matrix), 1), -1),
+                                                 last_under_mean_indexes[:, :-1]))
+        nb_gaps = np.count_nonzero(
+            under_mean_values & (previous_under_mean_indexes != -1) & (indexes - previous_under_mean_indexes > 3),
+            axis=1
+        )
+
+        double_patterns = nb_gaps > 1
+        patterns[double_patterns & negative_means] = "W"
+        patterns[double_patterns & ~negative_means] = "M"
+        patterns[~double_patterns & negative_means] = "V"
+        patterns[~double_patterns & ~negative_means] = "N"
+        patterns[np.isnan(mean_values)] = PatternAnalyser.UNKNOWN_PATTERN
+        return patterns
+
     # returns a value 0 < value < 1: the higher the stronger is the pattern
     @staticmethod
     def get_pattern_strength(pattern):
@@ -0,0 +1,97 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import math
+import numpy as np
+
+from tentacles.Evaluator.Util import PatternAnalyser, TrendAnalysis
+
+
+def loop_get_pattern(data):
+    # previous python loop based implementation
+    if len(data) > 0:
+        mean_value = np.mean(data) * 0.7
+    else:
+        mean_value = math.nan
+    if math.isnan(mean_value):
+        return PatternAnalyser.UNKNOWN_PATTERN
+    indexes_under_mean_value = np.where(data > mean_value)[0] \
+        if mean_value < 0 \
+        else np.where(data < mean_value)[0]
+    nb_gaps = 0
+    for i in range(len(indexes_under_mean_value)-1):
+        if indexes_under_mean_value[i+1]-indexes_under_mean_value[i] > 3:
+            nb_gaps += 1
+    if nb_gaps > 1:
+        return "W" if mean_value < 0 else "M"
+    else:
+        return "V" if mean_value < 0 else "N"
+
+
+def loop_find_pattern(data, zero_crossing_indexes, data_frame_max_index):
+    # previous python loop based implementation
+    if len(zero_crossing_indexes) > 1:
+        last_move_data = data[zero_crossing_indexes[-1]:]
+        shape = loop_get_pattern(last_move_data)
+        if shape == "N" or shape == "V":
+            backwards_index = 2
+            while backwards_index < len(zero_crossing_indexes) and \
+                    zero_crossing_indexes[-1*backwards_index] - zero_crossing_indexes[-1*backwards_index-1] < 4:
+                backwards_index += 1
+            extended_last_move_data = data[zero_crossing_indexes[-1 * backwards_index]:]
+            extended_shape = loop_get_pattern(extended_last_move_data)
+            if extended_shape == "W" or extended_shape == "M":
+                first_part = data[zero_crossing_indexes[-1 * backwards_index]:
+                                  zero_crossing_indexes[-1*backwards_index+1]]
+                second_part = data[zero_crossing_indexes[-1]:]
+                if np.mean(first_part)*np.mean(second_part) > 0:
+                    return extended_shape, zero_crossing_indexes[-1*backwards_index], zero_crossing_indexes[-1]
+        return shape, zero_crossing_indexes[-1], data_frame_max_index
+    else:
+        start_pattern_index = 0 if not zero_crossing_indexes else zero_crossing_indexes[0]
+        shape = loop_get_pattern(data[start_pattern_index:])
+        return shape, start_pattern_index, data_frame_max_index
+
+
+def random_oscillations(count, length, seed=42):
+    random_generator = np.random.default_rng(seed)
+    steps = np.linspace(0, random_generator.uniform(5, 30, (count, 1)), length, axis=1)[:, :, 0]
+    return np.sin(steps) + random_generator.normal(0, 0.3, (count, length))
+
+
+def test_get_pattern():
+    for data in random_oscillations(300, 40):
+        for end in (0, 1, 5, 20, 40):
+            assert PatternAnalyser.get_pattern(data[:end]) == loop_get_pattern(data[:end])
+    assert PatternAnalyser.get_pattern(np.array([1, np.nan])) == PatternAnalyser.UNKNOWN_PATTERN
+
+
+def test_batch_get_pattern():
+    data_matrix = random_oscillations(300, 40)
+    patterns = PatternAnalyser.batch_get_pattern(data_matrix)
+    assert patterns.tolist() == [loop_get_pattern(data) for data in data_matrix]
+    assert set(patterns.tolist()) == {"W", "M", "N", "V"}
+    data_matrix[0, 3] = np.nan
+    assert PatternAnalyser.batch_get_pattern(data_matrix)[0] == PatternAnalyser.UNKNOWN_PATTERN
+    assert PatternAnalyser.batch_get_pattern(np.ones((2, 0))).tolist() == [PatternAnalyser.UNKNOWN_PATTERN] * 2
+
+
+def test_find_pattern():
+    for data in random_oscillations(300, 100):
+        zero_crossing_indexes = TrendAnalysis.get_threshold_change_indexes(data, 0)
+        for indexes in (zero_crossing_indexes, zero_crossing_indexes[:1], zero_crossing_indexes[:2],
+                        zero_crossing_indexes[:3], []):
+            assert PatternAnalyser.find_pattern(data, indexes, len(data) - 1) == \
+                   loop_find_pattern(data, indexes, len(data) - 1)
@@ -0,0 +1 @@
+from .ring_buffer import RingBuffer
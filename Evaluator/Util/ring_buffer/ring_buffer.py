@@ -0,0 +1,97 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import math
+
+
+class RingBuffer:
+    """
+    Fixed size window of the last appended values.
+    Sum and sum of squares of the window are updated on each append to get its mean and variance in O(1).
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError(f"Invalid ring buffer size: {size}")
+        self.size = size
+        self._values = [0.0] * size
+        # index of the next value to write
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._squares_sum = 0.0
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.size
+
+    def append(self, value):
+        if self._count == self.size:
+            removed_value = self._values[self._index]
+            self._sum -= removed_value
+            self._squares_sum -= removed_value * removed_value
+        else:
+            self._count += 1
+        self._values[self._index] = value
+        self._sum += value
+        self._squares_sum += value * value
+        self._index += 1
+        if self._index == self.size:
+            self._index = 0
+            # recompute sums once per rotation to avoid accumulating rounding errors (amortized O(1))
+            self._sum = math.fsum(self._values)
+            self._squares_sum = math.fsum(value * value for value in self._values)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        self._values = [0.0] * self.size
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._squares_sum = 0.0
+
+    def last(self):
+        if not self._count:
+            raise IndexError("Empty ring buffer")
+        return self._values[self._index - 1]
+
+    def sum(self):
+        return self._sum
+
+    def mean(self):
+        return self._sum / self._count if self._count else math.nan
+
+    def variance(self):
+        """
+        :return: the population variance of the window values (as numpy.var)
+        """
+        if not self._count:
+            return math.nan
+        mean = self._sum / self._count
+        # rounding errors can make it slightly negative
+        return max(self._squares_sum / self._count - mean * mean, 0.0)
+
+    def values(self):
+        """
+        :return: the window values, from the oldest to the most recent
+        """
+        if self._count < self.size:
+            return self._values[:self._count]
+        return self._values[self._index:] + self._values[:self._index]
@@ -0,0 +1,112 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Compares InstantFluctuationsEvaluator previous candles windows averages computations to ring buffers
+on a stream of candles and klines of many symbols.
+Run with: python -m tentacles.Evaluator.Util.ring_buffer.tests.benchmark_ring_buffer
+"""
+import time
+
+import numpy as np
+
+from tentacles.Evaluator.Util import RingBuffer
+from tentacles.Evaluator.Util.ring_buffer.tests import test_ring_buffer
+
+SYMBOLS_COUNT = 300
+CANDLES_COUNT = 100
+KLINES_PER_CANDLE = 4
+CANDLE_SEGMENTS = [10, 8, 6, 5, 4, 3, 2, 1]
+HISTORY_SIZE = 500
+
+
+def _evaluate(last_volume, last_price, average_volumes, average_prices):
+    # InstantFluctuationsEvaluator.evaluate_volume_fluctuations triggers computation
+    triggers = 0
+    for segment in CANDLE_SEGMENTS:
+        if last_volume > 5 * average_volumes[segment]:
+            triggers += 1
+        if last_price > 1.01 * average_prices[segment] or last_price < 0.99 * average_prices[segment]:
+            triggers += 1
+    return triggers
+
+
+def run_previous_implementation(volumes, closes):
+    # previous implementation: averages are recomputed from candles history on each candle
+    callbacks = 0
+    for symbol_volumes, symbol_closes in zip(volumes, closes):
+        average_volumes = {}
+        average_prices = {}
+        for candle_index in range(HISTORY_SIZE, HISTORY_SIZE + CANDLES_COUNT):
+            volume_data = symbol_volumes[candle_index - CANDLE_SEGMENTS[0]:candle_index]
+            close_data = symbol_closes[candle_index - CANDLE_SEGMENTS[0]:candle_index]
+            for segment in CANDLE_SEGMENTS:
+                volume_data = [d for d in volume_data[-segment:] if d is not None]
+                price_data = [d for d in close_data[-segment:] if d is not None]
+                average_volumes[segment] = np.mean(volume_data)
+                average_prices[segment] = np.mean(price_data)
+            _evaluate(volume_data[-1], close_data[-1], average_volumes, average_prices)
+            callbacks += 1
+            for _ in range(KLINES_PER_CANDLE):
+                _evaluate(volume_data[-1], close_data[-1], average_volumes, average_prices)
+                callbacks += 1
+    return callbacks
+
+
+def run_ring_buffers(volumes, closes):
+    callbacks = 0
+    for symbol_volumes, symbol_closes in zip(volumes, closes):
+        volume_windows = {segment: RingBuffer(segment) for segment in CANDLE_SEGMENTS}
+        price_windows = {segment: RingBuffer(segment) for segment in CANDLE_SEGMENTS}
+        for candle_index in range(HISTORY_SIZE, HISTORY_SIZE + CANDLES_COUNT):
+            volume = symbol_volumes[candle_index - 1]
+            close = symbol_closes[candle_index - 1]
+            for segment in CANDLE_SEGMENTS:
+                volume_windows[segment].append(volume)
+                price_windows[segment].append(close)
+            average_volumes = {segment: window.mean() for segment, window in volume_windows.items()}
+            average_prices = {segment: window.mean() for segment, window in price_windows.items()}
+            _evaluate(volume, close, average_volumes, average_prices)
+            callbacks += 1
+            for _ in range(KLINES_PER_CANDLE):
+                average_volumes = {segment: window.mean() for segment, window in volume_windows.items()}
+                average_prices = {segment: window.mean() for segment, window in price_windows.items()}
+                _evaluate(volume, close, average_volumes, average_prices)
+                callbacks += 1
+    return callbacks
+
+
+def _print_callbacks_per_second(name, function, volumes, closes):
+    start = time.perf_counter()
+    callbacks = function(volumes, closes)
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {callbacks} callbacks in {elapsed * 1000:.2f}ms: {callbacks / elapsed:.0f} callbacks/s")
+    return elapsed
+
+
+def main():
+    volumes = [test_ring_buffer.random_values(HISTORY_SIZE + CANDLES_COUNT, seed=seed)
+               for seed in range(SYMBOLS_COUNT)]
+    closes = [test_ring_buffer.random_values(HISTORY_SIZE + CANDLES_COUNT, seed=seed + SYMBOLS_COUNT)
+              for seed in range(SYMBOLS_COUNT)]
+    print(f"{SYMBOLS_COUNT} symbols, {CANDLES_COUNT} candles with {KLINES_PER_CANDLE} klines per candle")
+    previous_time = _print_callbacks_per_second("previous implementation", run_previous_implementation,
+                                                volumes, closes)
+    ring_buffers_time = _print_callbacks_per_second("ring buffers", run_ring_buffers, volumes, closes)
+    print(f"x{previous_time / ring_buffers_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import math
+import numpy as np
+import pytest
+
+from tentacles.Evaluator.Util import RingBuffer
+
+
+def random_values(length, seed=42):
+    return (np.random.default_rng(seed).lognormal(10, 2, length)).tolist()
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_empty():
+    ring_buffer = RingBuffer(3)
+    assert len(ring_buffer) == 0
+    assert not ring_buffer
+    assert not ring_buffer.is_full()
+    assert ring_buffer.values() == []
+    assert math.isnan(ring_buffer.mean())
+    assert math.isnan(ring_buffer.variance())
+    with pytest.raises(IndexError):
+        ring_buffer.last()
+
+
+@pytest.mark.parametrize("size", [1, 2, 10, 100])
+def test_rolling_stats(size):
+    ring_buffer = RingBuffer(size)
+    values = random_values(1000)
+    for index, value in enumerate(values):
+        ring_buffer.append(value)
+        window = values[max(0, index + 1 - size):index + 1]
+        assert ring_buffer.values() == window
+        assert len(ring_buffer) == len(window)
+        assert ring_buffer.is_full() is (len(window) == size)
+        assert ring_buffer.last() == value
+        assert ring_buffer.sum() == pytest.approx(sum(window), rel=1e-9)
+        assert ring_buffer.mean() == pytest.approx(np.mean(window), rel=1e-9)
+        assert ring_buffer.variance() == pytest.approx(np.var(window), rel=1e-6, abs=1e-6)
+
+
+def test_flat_values_variance():
+    ring_buffer = RingBuffer(5)
+    ring_buffer.extend([0.1] * 12)
+    assert ring_buffer.mean() == pytest.approx(0.1)
+    assert ring_buffer.variance() >= 0
+    assert ring_buffer.variance() == pytest.approx(0)
+
+
+def test_clear():
+    ring_buffer = RingBuffer(5)
+    ring_buffer.extend(range(7))
+    assert ring_buffer.values() == [2, 3, 4, 5, 6]
+    ring_buffer.clear()
+    assert len(ring_buffer) == 0
+    ring_buffer.extend([1, 2])
+    assert ring_buffer.values() == [1, 2]
+    assert ring_buffer.mean() == 1.5
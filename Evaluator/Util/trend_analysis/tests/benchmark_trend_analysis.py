@@ -0,0 +1,64 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Compares previous loop based trend and pattern analysis to their vectorized and batched versions.
+Run with: python -m tentacles.Evaluator.Util.trend_analysis.tests.benchmark_trend_analysis
+"""
+import timeit
+
+from tentacles.Evaluator.Util import TrendAnalysis, PatternAnalyser
+from tentacles.Evaluator.Util.trend_analysis.tests import test_trend_analysis
+from tentacles.Evaluator.Util.pattern_analysis.tests import test_pattern_analysis
+
+SYMBOLS_COUNT = 300
+CANDLES_COUNT = 500
+REPEATS = 5
+
+
+def _print_timings(name, loop_function, vectorized_function, batched_function):
+    loop_time = min(timeit.repeat(loop_function, number=1, repeat=REPEATS))
+    vectorized_time = min(timeit.repeat(vectorized_function, number=1, repeat=REPEATS))
+    batched_time = min(timeit.repeat(batched_function, number=1, repeat=REPEATS))
+    print(f"{name} on {SYMBOLS_COUNT} symbols: loop: {loop_time * 1000:.2f}ms, "
+          f"vectorized: {vectorized_time * 1000:.2f}ms (x{loop_time / vectorized_time:.1f}), "
+          f"batched: {batched_time * 1000:.2f}ms (x{loop_time / batched_time:.1f})")
+
+
+def main():
+    series = test_trend_analysis.random_series(SYMBOLS_COUNT, CANDLES_COUNT)
+    oscillations = test_pattern_analysis.random_oscillations(SYMBOLS_COUNT, CANDLES_COUNT)
+    _print_timings(
+        "get_trend",
+        lambda: [test_trend_analysis.loop_get_trend(data, test_trend_analysis.LONG_TERM_AVERAGES) for data in series],
+        lambda: [TrendAnalysis.get_trend(data, test_trend_analysis.LONG_TERM_AVERAGES) for data in series],
+        lambda: TrendAnalysis.batch_get_trend(series, test_trend_analysis.LONG_TERM_AVERAGES),
+    )
+    _print_timings(
+        "get_threshold_change_indexes",
+        lambda: [test_trend_analysis.loop_get_threshold_change_indexes(data, 0) for data in oscillations],
+        lambda: [TrendAnalysis.get_threshold_change_indexes(data, 0) for data in oscillations],
+        lambda: TrendAnalysis.batch_get_threshold_change_indexes(oscillations, 0),
+    )
+    _print_timings(
+        "get_pattern",
+        lambda: [test_pattern_analysis.loop_get_pattern(data) for data in oscillations],
+        lambda: [PatternAnalyser.get_pattern(data) for data in oscillations],
+        lambda: PatternAnalyser.batch_get_pattern(oscillations),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+import pytest
+
+from tentacles.Evaluator.Util import TrendAnalysis
+
+SHORT_TERM_AVERAGES = [7, 5, 4, 3, 2, 1]
+LONG_TERM_AVERAGES = [40, 30, 20, 15, 10]
+
+
+def loop_get_trend(data, averages_to_use):
+    # previous python loop based implementation
+    trend = 0
+    inc = round(1 / len(averages_to_use), 2)
+    averages = []
+    for average_to_use in averages_to_use:
+        data_to_mean = data[-average_to_use:]
+        if len(data_to_mean):
+            averages.append(np.mean(data_to_mean))
+        else:
+            averages.append(0)
+    for a in range(0, len(averages) - 1):
+        if averages[a] - averages[a + 1] > 0:
+            trend -= inc
+        else:
+            trend += inc
+    return trend
+
+
+def loop_get_threshold_change_indexes(data, threshold):
+    # previous python loop based implementation
+    sub_threshold_indexes = np.where(data <= threshold)[0]
+    threshold_crossing_indexes = []
+    current_move_size = 1
+    for i, index in enumerate(sub_threshold_indexes):
+        if not len(threshold_crossing_indexes):
+            threshold_crossing_indexes.append(index)
+        else:
+            if threshold_crossing_indexes[-1] == index - current_move_size:
+                current_move_size += 1
+            else:
+                if sub_threshold_indexes[i-1] not in threshold_crossing_indexes:
+                    threshold_crossing_indexes.append(sub_threshold_indexes[i-1])
+                if index not in threshold_crossing_indexes:
+                    threshold_crossing_indexes.append(index)
+                current_move_size = 1
+    if len(sub_threshold_indexes) > 0 \
+            and sub_threshold_indexes[-1] < len(data) \
+            and data[-1] > threshold \
+            and sub_threshold_indexes[-1]+1 not in threshold_crossing_indexes:
+        threshold_crossing_indexes.append(sub_threshold_indexes[-1]+1)
+    return threshold_crossing_indexes
+
+
+def random_series(count, length, seed=42):
+    random_generator = np.random.default_rng(seed)
+    series = np.cumsum(random_generator.normal(0, 1, (count, length)), axis=1)
+    # add flat and repeated values
+    series[:count // 4] = np.round(series[:count // 4])
+    return series
+
+
+@pytest.mark.parametrize("averages_to_use", [SHORT_TERM_AVERAGES, LONG_TERM_AVERAGES, [3], [50, 10]])
+def test_get_trend(averages_to_use):
+    for data in random_series(200, 60):
+        for end in (0, 1, 5, 30, 60):
+            assert TrendAnalysis.get_trend(data[:end], averages_to_use) == \
+                   loop_get_trend(data[:end], averages_to_use)
+    assert TrendAnalysis.get_trend(np.full(50, 0.1), averages_to_use) == \
+           loop_get_trend(np.full(50, 0.1), averages_to_use)
+    assert TrendAnalysis.get_trend(np.array([1, np.nan, 3]), averages_to_use) == \
+           loop_get_trend(np.array([1, np.nan, 3]), averages_to_use)
+
+
+def test_batch_get_trend():
+    data_matrix = random_series(100, 60)
+    np.testing.assert_array_equal(
+        TrendAnalysis.batch_get_trend(data_matrix, LONG_TERM_AVERAGES),
+        [loop_get_trend(data, LONG_TERM_AVERAGES) for data in data_matrix]
+    )
+
+
+def test_get_threshold_change_indexes():
+    for data in random_series(200, 80):
+        for threshold in (0, 1, -1.5):
+            assert TrendAnalysis.get_threshold_change_indexes(data, threshold) == \
+                   loop_get_threshold_change_indexes(data, threshold)
+    for data in ([], [1], [-1], [1, 1], [-1, -1], [-1, 1], [1, -1], [1, -1, 1], [-1, 1, -1, -1, 1],
+                 [np.nan, -1, np.nan, 1, -1]):
+        assert TrendAnalysis.get_threshold_change_indexes(np.array(data), 0) == \
+               loop_get_threshold_change_indexes(np.array(data), 0)
+
+
+def test_batch_get_threshold_change_indexes():
+    data_matrix = random_series(100, 80)
+    assert TrendAnalysis.batch_get_threshold_change_indexes(data_matrix, 0) == \
+           [loop_get_threshold_change_indexes(data, 0) for data in data_matrix]
+    assert TrendAnalysis.batch_get_threshold_change_indexes(np.ones((3, 0)), 0) == [[], [], []]
+
+
+def test_batch_have_just_crossed_over():
+    data_matrix_1 = random_series(100, 10, seed=1)
+    data_matrix_2 = random_series(100, 10, seed=2)
+    np.testing.assert_array_equal(
+        TrendAnalysis.batch_have_just_crossed_over(data_matrix_1, data_matrix_2),
+        [TrendAnalysis.have_just_crossed_over(data_1, data_2)
+         for data_1, data_2 in zip(data_matrix_1, data_matrix_2)]
+    )
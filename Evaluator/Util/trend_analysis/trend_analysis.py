@@ -43,6 +43,21 @@ class TrendAnalysis:
 
         return trend
 
+    # same as get_trend on each row of data_matrix, get_trend is faster on a single data serie
+    @staticmethod
+    def batch_get_trend(data_matrix, averages_to_use):
+        inc = round(1 / len(averages_to_use), 2)
+        if len(averages_to_use) < 2:
+            return np.zeros(len(data_matrix))
+
+        averages = np.column_stack([
+            np.mean(data_matrix[:, -average_to_use:], axis=1)
+            if data_matrix.shape[1] else np.zeros(len(data_matrix))
+            for average_to_use in averages_to_use
+        ])
+        # cumsum adds values in the same order as get_trend: keep the same float rounding
+        return np.cumsum(np.where(averages[:, :-1] - averages[:, 1:] > 0, -inc, inc), axis=1)[:, -1]
+
     @staticmethod
     def peak_has_been_reached_already(data, neutral_val=0):
         if len(data) > 1:
@@ -110,33 +125,37 @@ class TrendAnalysis:
 
     @staticmethod
     def get_threshold_change_indexes(data, threshold):
+        return TrendAnalysis.batch_get_threshold_change_indexes(np.asarray(data)[np.newaxis, :], threshold)[0]
 
+    # same as get_threshold_change_indexes on each row of data_matrix
+    @staticmethod
+    def batch_get_threshold_change_indexes(data_matrix, threshold):
+        if not data_matrix.shape[1]:
+            return [[] for _ in range(len(data_matrix))]
         # sub threshold values
-        sub_threshold_indexes = np.where(data <= threshold)[0]
-
-        # remove consecutive sub-threshold values because they are not crosses
-        threshold_crossing_indexes = []
-        current_move_size = 1
-        for i, index in enumerate(sub_threshold_indexes):
-            if not len(threshold_crossing_indexes):
-                threshold_crossing_indexes.append(index)
-            else:
-                if threshold_crossing_indexes[-1] == index - current_move_size:
-                    current_move_size += 1
-                else:
-                    if sub_threshold_indexes[i-1] not in threshold_crossing_indexes:
-                        threshold_crossing_indexes.append(sub_threshold_indexes[i-1])
-                    if index not in threshold_crossing_indexes:
-                        threshold_crossing_indexes.append(index)
-                    current_move_size = 1
-        # add last index if data_frame ends above threshold and last threshold_crossing_indexes inferior
-        # to data_frame size
-        if len(sub_threshold_indexes) > 0 \
-                and sub_threshold_indexes[-1] < len(data) \
-                and data[-1] > threshold \
-                and sub_threshold_indexes[-1]+1 not in threshold_crossing_indexes:
-            threshold_crossing_indexes.append(sub_threshold_indexes[-1]+1)
-
+        sub_threshold = data_matrix <= threshold
+        no_sub_threshold = np.zeros((len(data_matrix), 1), dtype=bool)
+
+        # only keep the first and last index of consecutive sub-threshold values because others are not crosses
+        move_starts = sub_threshold & ~np.hstack((no_sub_threshold, sub_threshold[:, :-1]))
+        move_ends = sub_threshold & ~np.hstack((sub_threshold[:, 1:], no_sub_threshold))
+        crossings = move_starts | move_ends
+
+        # the end of the last move is not a cross (unless it's also its start)
+        has_sub_threshold = sub_threshold.any(axis=1)
+        rows = np.flatnonzero(has_sub_threshold)
+        last_move_ends = data_matrix.shape[1] - 1 - np.argmax(move_ends[:, ::-1], axis=1)
+        crossings[rows, last_move_ends[rows]] = move_starts[rows, last_move_ends[rows]]
+
+        crossing_rows, crossing_indexes = np.nonzero(crossings)
+        threshold_crossing_indexes = [
+            indexes.tolist()
+            for indexes in np.split(crossing_indexes, np.cumsum(np.bincount(crossing_rows,
+                                                                            minlength=len(data_matrix)))[:-1])
+        ]
+        # add last index if data_frame ends above threshold
+        for row in np.flatnonzero(has_sub_threshold & (data_matrix[:, -1] > threshold)):
+            threshold_crossing_indexes[row].append(int(last_move_ends[row] + 1))
         return threshold_crossing_indexes
 
     @staticmethod
@@ -147,3 +166,8 @@ class TrendAnalysis:
             return list_1[-1] > list_2[-1] and list_1[-2] < list_2[-2]
         except KeyError:
             return False
+
+    # same as have_just_crossed_over on each row of matrix_1 and matrix_2
+    @staticmethod
+    def batch_have_just_crossed_over(matrix_1, matrix_2):
+        return (matrix_1[:, -1] > matrix_2[:, -1]) & (matrix_1[:, -2] < matrix_2[:, -2])
@@ -14,7 +14,9 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import json
-import sortedcontainers
+import weakref
+
+import numpy as np
 
 import octobot_trading.enums as trading_enums
 import octobot_trading.constants as trading_constants
@@ -23,6 +25,8 @@ import octobot_trading.personal_data as trading_personal_data
 import octobot_trading.personal_data.portfolios.portfolio_util as portfolio_util
 import octobot_trading.api as trading_api
 import octobot_backtesting.api as backtesting_api
+import octobot_backtesting.enums as backtesting_enums
+import octobot_backtesting.importers as backtesting_importers
 import octobot_commons.symbols.symbol_util as symbol_util
 import octobot_commons.constants
 import octobot_commons.databases as databases
@@ -75,6 +79,180 @@ async def get_starting_portfolio(meta_database) -> dict:
     return json.loads(portfolio.replace("'", '"'))
 
 
+async def _get_edge_candle(candles_sources, exchange, symbol, time_frame, metadata, first):
+    timestamps, operations = backtesting_importers.get_operations_from_timestamps(
+        metadata[commons_enums.DBRows.END_TIME.value], metadata[commons_enums.DBRows.START_TIME.value]
+    )
+    try:
+        async with databases.new_sqlite_database(candles_sources[0][commons_enums.DBRows.VALUE.value]) as database:
+            candles = await database.select_from_timestamp(
+                backtesting_enums.ExchangeDataTables.OHLCV,
+                timestamps,
+                operations,
+                size=1,
+                sort=commons_enums.DataBaseOrderBy.ASC.value if first else commons_enums.DataBaseOrderBy.DESC.value,
+                exchange_name=exchange, symbol=symbol, time_frame=commons_enums.TimeFrames(time_frame).value
+            )
+    except commons_errors.DatabaseNotFoundError:
+        return None
+    return backtesting_importers.import_ohlcvs(candles)[0][-1] if candles else None
+
+
+def _to_millis_candle(candle):
+    candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = \
+        candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] * 1000
+    return candle
+
+
+class RunHistoricalValues:
+    """
+    Historical values of a backtesting run, loaded on demand and cached.
+    Candles, trades and first or last candles of each pair are only read when requested:
+    use get_run_historical_values to share them between analysis functions.
+    Candles timestamps are in millis.
+    """
+
+    def __init__(self, meta_database, exchange):
+        # cached values are released with their run database: don't keep it alive
+        self._meta_database = weakref.ref(meta_database)
+        self.exchange = exchange
+        self.metadata = {}
+        self.run_global_metadata = {}
+        self.starting_portfolio = {}
+        self.ref_market = None
+        self.trading_type = "spot"
+        self.contracts = {}
+        self.time_frame = None
+        self._candles_sources_by_pair = {}
+        self._candles_by_pair_and_time_frame = {}
+        self._edge_candles_by_pair_and_time_frame = {}
+        self._trades_by_pair = {}
+
+    @property
+    def meta_database(self):
+        return self._meta_database()
+
+    async def initialize(self):
+        """
+        Loads run metadata, raises IndexError when the run has no metadata
+        """
+        self.metadata = await get_metadata(self.meta_database)
+        self.starting_portfolio = json.loads(
+            self.metadata[commons_enums.BacktestingMetadata.START_PORTFOLIO.value].replace("'", '"')
+        )
+        self.run_global_metadata = await self.meta_database.get_backtesting_metadata_from_run()
+        self.exchange = self.exchange or self.meta_database.run_dbs_identifier.context.exchange_name \
+            or self.metadata[commons_enums.DBRows.EXCHANGES.value][0]  # TODO handle multi exchanges
+        self.ref_market = self.metadata[commons_enums.DBRows.REFERENCE_MARKET.value]
+        self.trading_type = self.metadata[commons_enums.DBRows.TRADING_TYPE.value]
+        self.contracts = self.metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value][self.exchange] \
+            if self.trading_type == "future" else {}
+
+    def get_pairs(self) -> list:
+        return self.run_global_metadata[commons_enums.DBRows.SYMBOLS.value]
+
+    def is_valued_pair(self, pair) -> bool:
+        """
+        :return: True when the pair has candles to value its base currency
+        """
+        is_inverse_contract = self.trading_type == "future" and trading_api.is_inverse_future_contract(
+            trading_enums.FutureContractType(self.contracts[pair]["contract_type"])
+        )
+        return symbol_util.parse_symbol(pair).base != self.ref_market or is_inverse_contract
+
+    def get_starting_portfolio_total(self, currency):
+        try:
+            return self.starting_portfolio[currency][octobot_commons.constants.PORTFOLIO_TOTAL]
+        except KeyError:
+            return 0
+
+    async def get_candles_sources(self, pair) -> list:
+        try:
+            return self._candles_sources_by_pair[pair]
+        except KeyError:
+            candles_sources = self._candles_sources_by_pair[pair] = \
+                await self.meta_database.get_symbol_db(self.exchange, pair).all(
+                    commons_enums.DBTables.CANDLES_SOURCE.value
+                )
+            return candles_sources
+
+    async def get_time_frame(self, pair, time_frame=None):
+        """
+        :return: the given time frame or, by default, the smallest time frame of the first pair having candles
+        """
+        if time_frame is not None:
+            return time_frame
+        if self.time_frame is None:
+            time_frames = [
+                source[commons_enums.DBRows.TIME_FRAME.value]
+                for source in await self.get_candles_sources(pair)
+            ]
+            self.time_frame = time_frame_manager.find_min_time_frame(time_frames) if time_frames else None
+        return self.time_frame
+
+    async def get_candles(self, pair, time_frame=None) -> list:
+        time_frame = await self.get_time_frame(pair, time_frame)
+        key = (pair, time_frame)
+        try:
+            return self._candles_by_pair_and_time_frame[key]
+        except KeyError:
+            candles = self._candles_by_pair_and_time_frame[key] = [
+                _to_millis_candle(candle)
+                for candle in await get_candles(
+                    await self.get_candles_sources(pair), self.exchange, pair, time_frame, self.metadata
+                )
+            ]
+            return candles
+
+    async def get_first_candle(self, pair, time_frame=None):
+        return await self._get_edge_candle(pair, time_frame, True)
+
+    async def get_last_candle(self, pair, time_frame=None):
+        return await self._get_edge_candle(pair, time_frame, False)
+
+    async def _get_edge_candle(self, pair, time_frame, first):
+        time_frame = await self.get_time_frame(pair, time_frame)
+        if (pair, time_frame) in self._candles_by_pair_and_time_frame:
+            # candles are already loaded
+            candles = self._candles_by_pair_and_time_frame[(pair, time_frame)]
+            return (candles[0] if first else candles[-1]) if candles else None
+        key = (pair, time_frame, first)
+        try:
+            return self._edge_candles_by_pair_and_time_frame[key]
+        except KeyError:
+            candle = await _get_edge_candle(
+                await self.get_candles_sources(pair), self.exchange, pair, time_frame, self.metadata, first
+            )
+            candle = self._edge_candles_by_pair_and_time_frame[key] = \
+                None if candle is None else _to_millis_candle(candle)
+            return candle
+
+    async def get_trades(self, pair) -> list:
+        try:
+            return self._trades_by_pair[pair]
+        except KeyError:
+            trades = self._trades_by_pair[pair] = await get_trades(self.meta_database, self.metadata, pair)
+            return trades
+
+
+# run historical values by exchange by run database, released with their run database
+_RUN_HISTORICAL_VALUES = weakref.WeakKeyDictionary()
+
+
+async def get_run_historical_values(meta_database, exchange=None) -> RunHistoricalValues:
+    """
+    :return: the cached historical values of the run, raises IndexError when the run has no metadata
+    """
+    historical_values_by_exchange = _RUN_HISTORICAL_VALUES.setdefault(meta_database, {})
+    try:
+        return historical_values_by_exchange[exchange]
+    except KeyError:
+        historical_values = RunHistoricalValues(meta_database, exchange)
+        await historical_values.initialize()
+        historical_values_by_exchange[exchange] = historical_values
+        return historical_values
+
+
 async def load_historical_values(meta_database, exchange, with_candles=True,
                                  with_trades=True, with_portfolio=True, time_frame=None):
     price_data = {}
@@ -84,48 +262,21 @@ async def load_historical_values(meta_database, exchange, with_candles=True,
     metadata = {}
     run_global_metadata = {}
     try:
-        starting_portfolio = await get_starting_portfolio(meta_database)
-        metadata = await get_metadata(meta_database)
-        run_global_metadata = await meta_database.get_backtesting_metadata_from_run()
-
-        exchange = exchange or meta_database.run_dbs_identifier.context.exchange_name \
-            or metadata[commons_enums.DBRows.EXCHANGES.value][0]  # TODO handle multi exchanges
-        ref_market = metadata[commons_enums.DBRows.REFERENCE_MARKET.value]
-        trading_type = metadata[commons_enums.DBRows.TRADING_TYPE.value]
-        contracts = metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value][exchange] if trading_type == "future" else {}
-        # init data
-        for pair in run_global_metadata[commons_enums.DBRows.SYMBOLS.value]:
+        run_historical_values = await get_run_historical_values(meta_database, exchange)
+        metadata = run_historical_values.metadata
+        run_global_metadata = run_historical_values.run_global_metadata
+        trading_type = run_historical_values.trading_type
+        ref_market = run_historical_values.ref_market
+        for pair in run_historical_values.get_pairs():
             symbol = symbol_util.parse_symbol(pair).base
-            is_inverse_contract = trading_type == "future" and trading_api.is_inverse_future_contract(
-                trading_enums.FutureContractType(contracts[pair]["contract_type"])
-            )
-            if symbol != ref_market or is_inverse_contract:
-                candles_sources = await meta_database.get_symbol_db(exchange, pair).all(
-                    commons_enums.DBTables.CANDLES_SOURCE.value
-                )
-                if time_frame is None:
-                    time_frames = [source[commons_enums.DBRows.TIME_FRAME.value] for source in candles_sources]
-                    time_frame = time_frame_manager.find_min_time_frame(time_frames) if time_frames else time_frame
+            if run_historical_values.is_valued_pair(pair):
                 if with_candles and pair not in price_data:
-                    # convert candles timestamp in millis
-                    raw_candles = await get_candles(candles_sources, exchange, pair, time_frame, metadata)
-                    for candle in raw_candles:
-                        candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = \
-                            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] * 1000
-                    price_data[pair] = raw_candles
+                    price_data[pair] = await run_historical_values.get_candles(pair, time_frame)
                 if with_trades and pair not in trades_data:
-                    trades_data[pair] = await get_trades(meta_database, metadata, pair)
+                    trades_data[pair] = await run_historical_values.get_trades(pair)
             if with_portfolio:
-                try:
-                    moving_portfolio_data[symbol] = starting_portfolio[symbol][
-                        octobot_commons.constants.PORTFOLIO_TOTAL]
-                except KeyError:
-                    moving_portfolio_data[symbol] = 0
-                try:
-                    moving_portfolio_data[ref_market] = starting_portfolio[ref_market][
-                        octobot_commons.constants.PORTFOLIO_TOTAL]
-                except KeyError:
-                    moving_portfolio_data[ref_market] = 0
+                moving_portfolio_data[symbol] = run_historical_values.get_starting_portfolio_total(symbol)
+                moving_portfolio_data[ref_market] = run_historical_values.get_starting_portfolio_total(ref_market)
     except IndexError:
         pass
     return price_data, trades_data, moving_portfolio_data, trading_type, metadata, run_global_metadata
@@ -221,8 +372,18 @@ def _evaluate_portfolio(portfolio, price_data, use_start_value):
 
 
 async def get_portfolio_values(meta_database, exchange=None, historical_values=None):
-    price_data, trades_data, moving_portfolio_data, trading_type, metadata, _ = \
-        historical_values or await load_historical_values(meta_database, exchange, with_portfolio=False, with_trades=False)
+    if historical_values:
+        price_data, _, _, _, metadata, _ = historical_values
+    else:
+        # only first and last candles are required
+        run_historical_values = await get_run_historical_values(meta_database, exchange)
+        metadata = run_historical_values.metadata
+        price_data = {}
+        for pair in run_historical_values.get_pairs():
+            if run_historical_values.is_valued_pair(pair):
+                first_candle = await run_historical_values.get_first_candle(pair)
+                if first_candle is not None:
+                    price_data[pair] = [first_candle, await run_historical_values.get_last_candle(pair)]
     starting_portfolio = json.loads(metadata[commons_enums.BacktestingMetadata.START_PORTFOLIO.value].replace("'", '"'))
     ending_portfolio = json.loads(metadata[commons_enums.BacktestingMetadata.END_PORTFOLIO.value].replace("'", '"'))
     return _evaluate_portfolio(
@@ -236,119 +397,127 @@ async def get_portfolio_values(meta_database, exchange=None, historical_values=N
     )
 
 
+def _get_pair_candles_at_times(candles, times):
+    """
+    :return: the (presence mask, open prices) of the given pair candles at each of the given times
+    """
+    pair_times = np.asarray([candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] for candle in candles])
+    open_prices = np.asarray(
+        [candle[commons_enums.PriceIndexes.IND_PRICE_OPEN.value] for candle in candles], dtype=np.float64
+    )
+    if not len(pair_times):
+        return np.zeros(len(times), dtype=bool), np.zeros(len(times), dtype=np.float64)
+    indexes = np.minimum(np.searchsorted(pair_times, times), len(pair_times) - 1)
+    return pair_times[indexes] == times, open_prices[indexes]
+
+
+def _get_historical_portfolio_values(price_data, trades_data, funding_fees_history_by_pair, portfolio):
+    """
+    Computes the portfolio value at each candle time of the first traded pair.
+    At each time, only pairs with a candle at this time are valued, using their open price.
+    Trades are applied on the first candle of their pair from their time
+    and funding fees on the candle of their pair at their time.
+    :return: the times and portfolio values arrays
+    """
+    pairs = list(trades_data)
+    if not pairs:
+        return np.array([]), np.array([])
+    times = np.asarray([candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+                        for candle in price_data[pairs[0]]])
+    # balance updates, applied in order at each time: by pair, trades then funding fees
+    updates_time_index = []
+    updates_currency = []
+    updates_quantity = []
+    candles_by_pair = {}
+    for pair in pairs:
+        is_present, open_prices = candles_by_pair[pair] = _get_pair_candles_at_times(price_data[pair], times)
+        pair_time_indexes = np.flatnonzero(is_present)
+        pair_times = times[pair_time_indexes]
+        symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
+        trades = sorted(trades_data[pair], key=lambda tr: tr[commons_enums.PlotAttributes.X.value])
+        trades_candle_indexes = np.searchsorted(
+            pair_times, [trade[commons_enums.PlotAttributes.X.value] for trade in trades]
+        ).tolist()
+        for trade, candle_index in zip(trades, trades_candle_indexes):
+            if candle_index == len(pair_times):
+                # no candle after this trade
+                continue
+            time_index = pair_time_indexes[candle_index]
+            volume = trade[commons_enums.PlotAttributes.VOLUME.value]
+            ref_market_volume = volume * trade[commons_enums.PlotAttributes.Y.value]
+            if trade[commons_enums.PlotAttributes.SIDE.value] == trading_enums.TradeOrderSide.SELL.value:
+                volume, ref_market_volume = -volume, -ref_market_volume
+            updates_time_index += (time_index, time_index, time_index)
+            updates_currency += (symbol, ref_market, trade[commons_enums.DBRows.FEES_CURRENCY.value])
+            updates_quantity += (volume, -ref_market_volume, -trade[commons_enums.DBRows.FEES_AMOUNT.value])
+        funding_fees = funding_fees_history_by_pair.get(pair, [])
+        funding_fees_candle_indexes = np.searchsorted(
+            pair_times, [funding_fee[commons_enums.PlotAttributes.X.value] for funding_fee in funding_fees]
+        ).tolist()
+        for funding_fee, candle_index in zip(funding_fees, funding_fees_candle_indexes):
+            if candle_index < len(pair_times) \
+                    and pair_times[candle_index] == funding_fee[commons_enums.PlotAttributes.X.value]:
+                updates_time_index.append(pair_time_indexes[candle_index])
+                updates_currency.append(funding_fee[trading_enums.FeePropertyColumns.CURRENCY.value])
+                updates_quantity.append(-funding_fee["quantity"])
+    # stable sort: keep pairs and updates order for each time
+    updates_order = np.argsort(np.asarray(updates_time_index, dtype=np.int64), kind="stable")
+    updates_time_index = np.asarray(updates_time_index, dtype=np.int64)[updates_order]
+    updates_currency = np.asarray(updates_currency, dtype=object)[updates_order]
+    updates_quantity = np.asarray(updates_quantity, dtype=np.float64)[updates_order]
+    time_indexes = np.arange(len(times))
+    balances = {}
+
+    def _get_balances(currency):
+        try:
+            return balances[currency]
+        except KeyError:
+            currency_updates = updates_currency == currency
+            # cumulated balance after each update, starting from the initial balance
+            cumulated_balances = np.cumsum(
+                np.concatenate(([portfolio.get(currency, 0)], updates_quantity[currency_updates]))
+            )
+            currency_balances = balances[currency] = cumulated_balances[
+                np.searchsorted(updates_time_index[currency_updates], time_indexes, side="right")
+            ]
+            return currency_balances
+
+    values = np.zeros(len(times), dtype=np.float64)
+    # each currency is valued once per time, with the first pair having a candle at this time
+    valued_currencies = {}
+    for pair in pairs:
+        is_present, open_prices = candles_by_pair[pair]
+        symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
+        for currency, price in ((symbol, open_prices), (ref_market, None)):
+            is_valued = valued_currencies.get(currency)
+            to_value = is_present if is_valued is None else is_present & ~is_valued
+            currency_balances = _get_balances(currency)
+            values[to_value] = values[to_value] + \
+                (currency_balances[to_value] if price is None else currency_balances[to_value] * price[to_value])
+            valued_currencies[currency] = is_present if is_valued is None else is_present | is_valued
+    return times, values
+
+
 async def plot_historical_portfolio_value(
     meta_database, plotted_element, exchange=None, own_yaxis=False, historical_values=None
 ):
     price_data, trades_data, moving_portfolio_data, trading_type, metadata, _ = \
         historical_values or await load_historical_values(meta_database, exchange)
-    price_data_by_time = {}
-    for symbol, candles in price_data.items():
-        price_data_by_time[symbol] = {
-            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]: candle
-            for candle in candles
-        }
     if trading_type == "future":
         # TODO: historical unrealized pnl
         pass
-    for pair in trades_data:
-        trades_data[pair] = sorted(trades_data[pair], key=lambda tr: tr[commons_enums.PlotAttributes.X.value])
     funding_fees_history_by_pair = await _get_grouped_funding_fees(meta_database,
                                                                    commons_enums.DBRows.SYMBOL.value)
-    value_data = sortedcontainers.SortedDict()
-    pairs = list(trades_data)
-    if pairs:
-        pair = pairs[0]
-        candles = price_data_by_time[pair]
-        value_data = sortedcontainers.SortedDict({
-            t: 0
-            for t in candles
-        })
-        trade_index_by_pair = {p: 0 for p in pairs}
-        funding_fees_index_by_pair = {p: 0 for p in pairs}
-        # TODO multi exchanges
-        exchange_name = metadata[commons_enums.DBRows.EXCHANGES.value][0]
-        # TODO hedge mode with multi position by pair
-        # if metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value] and \
-        #         exchange_name in metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value]:
-        #     positions_by_pair = {
-        #         pair: _position_factory(pair,
-        #                                 metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value][exchange_name][pair])
-        #         for pair in pairs
-        #     }
-        # else:
-        #     positions_by_pair = {}
-        # TODO update position instead of portfolio when filled orders and apply position unrealized pnl to portfolio
-        for candle_time, ref_candle in candles.items():
-            current_candles = {}
-            for pair in pairs:
-                if candle_time not in price_data_by_time[pair]:
-                    # no price data for this time in this pair
-                    continue
-                other_candle = price_data_by_time[pair][candle_time]
-                current_candles[pair] = other_candle
-                symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
-                moving_portfolio_data[ref_market] = moving_portfolio_data.get(ref_market, 0)
-                moving_portfolio_data[symbol] = moving_portfolio_data.get(symbol, 0)
-                # part 1: compute portfolio total value after trade update when any
-                # 1.1: trades
-                # start iteration where it last stopped to reduce complexity
-                for trade_index, trade in enumerate(trades_data[pair][trade_index_by_pair[pair]:]):
-                    # handle trades that are both older and at the current candle starting from the last trade index
-                    # (older trades to handle the ones that might be from candles we dont have data on)
-                    if trade[commons_enums.PlotAttributes.X.value] <= candle_time:
-                        if trade[commons_enums.PlotAttributes.SIDE.value] == trading_enums.TradeOrderSide.SELL.value:
-                            moving_portfolio_data[symbol] -= trade[commons_enums.PlotAttributes.VOLUME.value]
-                            moving_portfolio_data[ref_market] += trade[commons_enums.PlotAttributes.VOLUME.value] * \
-                                                                 trade[commons_enums.PlotAttributes.Y.value]
-                        else:
-                            moving_portfolio_data[symbol] += trade[commons_enums.PlotAttributes.VOLUME.value]
-                            moving_portfolio_data[ref_market] -= trade[commons_enums.PlotAttributes.VOLUME.value] * \
-                                                                 trade[commons_enums.PlotAttributes.Y.value]
-                        moving_portfolio_data[trade[commons_enums.DBRows.FEES_CURRENCY.value]] -= \
-                            trade[commons_enums.DBRows.FEES_AMOUNT.value]
-
-                        # last trade case: as there is not trade afterwards, the next condition would never be filled,
-                        # force trade_index_by_pair[pair] increment
-                        if all(it_trade[commons_enums.PlotAttributes.X.value] ==
-                               trade[commons_enums.PlotAttributes.X.value]
-                               for it_trade in trades_data[pair][trade_index_by_pair[pair]:]):
-                            trade_index_by_pair[pair] += 1
-                            break
-
-                    if trade[commons_enums.PlotAttributes.X.value] > \
-                            ref_candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]:
-                        # no need to continue iterating, save current index for new candle
-                        trade_index_by_pair[pair] += trade_index
-                        break
-                # 1.2: funding fees
-                # start iteration where it last stopped to reduce complexity
-                for funding_fee_index, funding_fee \
-                        in enumerate(funding_fees_history_by_pair.get(pair, [])[funding_fees_index_by_pair[pair]:]):
-                    if funding_fee[commons_enums.PlotAttributes.X.value] == candle_time:
-                        moving_portfolio_data[funding_fee[trading_enums.FeePropertyColumns.CURRENCY.value]] -= \
-                            funding_fee["quantity"]
-                    if funding_fee[commons_enums.PlotAttributes.X.value] > candle_time:
-                        # no need to continue iterating, save current index for new candle
-                        funding_fees_index_by_pair[pair] = funding_fee_index  # TODO
-                        break
-            # part 2: now that portfolio is up-to-date, compute portfolio total value
-            handled_currencies = []
-            for pair, other_candle in current_candles.items():
-                symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
-                if symbol not in handled_currencies:
-                    value_data[candle_time] = \
-                        value_data[candle_time] + \
-                        moving_portfolio_data[symbol] * other_candle[
-                            commons_enums.PriceIndexes.IND_PRICE_OPEN.value
-                        ]
-                    handled_currencies.append(symbol)
-                if ref_market not in handled_currencies:
-                    value_data[candle_time] = value_data[candle_time] + moving_portfolio_data[ref_market]
-                    handled_currencies.append(ref_market)
+    # TODO multi exchanges
+    # TODO hedge mode with multi position by pair
+    # TODO update position instead of portfolio when filled orders and apply position unrealized pnl to portfolio
+    times, values = _get_historical_portfolio_values(
+        price_data, trades_data, funding_fees_history_by_pair, moving_portfolio_data
+    )
     plotted_element.plot(
         mode="scatter",
-        x=list(value_data.keys()),
-        y=list(value_data.values()),
+        x=times.tolist(),
+        y=values.tolist(),
         title="Portfolio value",
         own_yaxis=own_yaxis
     )
@@ -13,6 +13,9 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import gc
+import weakref
+
 import pytest
 import mock
 
@@ -41,6 +44,42 @@ async def test_plot_historical_portfolio_value(default_price_data, default_trade
                                             default_spot_metadata)
 
 
+async def test_get_historical_portfolio_values():
+    def _trade(time, side, volume, price, fees_amount, fees_currency):
+        return {commons_enums.PlotAttributes.X.value: time, commons_enums.PlotAttributes.SIDE.value: side,
+                commons_enums.PlotAttributes.VOLUME.value: volume, commons_enums.PlotAttributes.Y.value: price,
+                commons_enums.DBRows.FEES_AMOUNT.value: fees_amount,
+                commons_enums.DBRows.FEES_CURRENCY.value: fees_currency}
+    price_data = {
+        "BTC/USDT": [[0, 10], [1000, 20], [2000, 30], [3000, 40]],
+        # no 1000 candle
+        "ETH/USDT": [[0, 1], [2000, 2], [3000, 3]],
+    }
+    trades_data = {
+        # applied on 1000 candle
+        "BTC/USDT": [_trade(500, trading_enums.TradeOrderSide.BUY.value, 1, 15, 0.1, "USDT")],
+        # applied on 2000 candle: no ETH/USDT 1000 candle
+        "ETH/USDT": [_trade(1000, trading_enums.TradeOrderSide.BUY.value, 10, 1.5, 1, "ETH")],
+    }
+    funding_fees = {
+        "BTC/USDT": [{commons_enums.PlotAttributes.X.value: 3000,
+                      trading_enums.FeePropertyColumns.CURRENCY.value: "USDT", "quantity": 0.9}]
+    }
+    times, values = run_data_analysis._get_historical_portfolio_values(
+        price_data, trades_data, funding_fees, {"BTC": 1, "USDT": 100}
+    )
+    assert times.tolist() == [0, 1000, 2000, 3000]
+    assert values.tolist() == pytest.approx([
+        1 * 10 + 100,
+        # ETH/USDT is not valued: no candle
+        2 * 20 + 84.9,
+        2 * 30 + 69.9 + 9 * 2,
+        2 * 40 + 69 + 9 * 3,
+    ])
+    times, values = run_data_analysis._get_historical_portfolio_values(price_data, {}, {}, {"BTC": 1})
+    assert times.tolist() == values.tolist() == []
+
+
 async def test_get_historical_pnl(default_price_data, default_trades_data, default_pnl_historical_value,
                                   default_realized_pnl_history, default_spot_metadata):
     # expected_time_data start at the 1st time data with a default_pnl_historical_value at 0
@@ -69,6 +108,54 @@ async def test_get_historical_pnl(default_price_data, default_trades_data, defau
                                                   "spot", default_spot_metadata)
 
 
+async def test_get_portfolio_values_from_first_and_last_candles():
+    meta_database = mock.Mock()
+    run_historical_values = run_data_analysis.RunHistoricalValues(meta_database, "binance")
+    run_historical_values.metadata = {
+        commons_enums.BacktestingMetadata.START_PORTFOLIO.value: "{'BTC': {'total': 1}, 'USDT': {'total': 100}}",
+        commons_enums.BacktestingMetadata.END_PORTFOLIO.value: "{'BTC': {'total': 2}, 'USDT': {'total': 50}}",
+    }
+    run_historical_values.run_global_metadata = {commons_enums.DBRows.SYMBOLS.value: ["BTC/USDT"]}
+    run_historical_values.ref_market = "USDT"
+    run_historical_values.time_frame = commons_enums.TimeFrames.ONE_HOUR.value
+    candles = [[1, 10], [2, 20], [3, 30]]
+    with mock.patch.object(run_data_analysis, "get_run_historical_values",
+                           mock.AsyncMock(return_value=run_historical_values)), \
+         mock.patch.object(run_data_analysis, "_get_edge_candle",
+                           mock.AsyncMock(side_effect=lambda *args: list(candles[0 if args[-1] else -1]))) \
+            as _get_edge_candle_mock, \
+         mock.patch.object(run_data_analysis, "get_candles", mock.AsyncMock(return_value=candles)) \
+            as get_candles_mock, \
+         mock.patch.object(run_historical_values, "get_candles_sources", mock.AsyncMock(return_value=[])):
+        assert await run_data_analysis.get_portfolio_values("meta_database") == (1 * 10 + 100, 2 * 30 + 50)
+        assert _get_edge_candle_mock.call_count == 2
+        # cached
+        assert await run_data_analysis.get_portfolio_values("meta_database") == (1 * 10 + 100, 2 * 30 + 50)
+        assert _get_edge_candle_mock.call_count == 2
+        get_candles_mock.assert_not_called()
+        # millis timestamps
+        assert await run_historical_values.get_first_candle("BTC/USDT") == [1000, 10]
+        assert await run_historical_values.get_candles("BTC/USDT") == [[1000, 10], [2000, 20], [3000, 30]]
+        get_candles_mock.assert_called_once()
+
+
+async def test_run_historical_values_are_released_with_their_run_database():
+    meta_database = mock.Mock()
+    with mock.patch.object(run_data_analysis.RunHistoricalValues, "initialize", mock.AsyncMock()):
+        run_historical_values = await run_data_analysis.get_run_historical_values(meta_database, "binance")
+        assert run_historical_values.meta_database is meta_database
+        # cached
+        assert await run_data_analysis.get_run_historical_values(meta_database, "binance") is run_historical_values
+    assert meta_database in run_data_analysis._RUN_HISTORICAL_VALUES
+    cached_run_databases_count = len(run_data_analysis._RUN_HISTORICAL_VALUES)
+    meta_database_ref = weakref.ref(meta_database)
+    del meta_database
+    gc.collect()
+    assert meta_database_ref() is None
+    assert run_historical_values.meta_database is None
+    assert len(run_data_analysis._RUN_HISTORICAL_VALUES) == cached_run_databases_count - 1
+
+
 async def test_total_paid_fees(default_trades_data):
     usdt_fees = sum(trade[commons_enums.DBRows.FEES_AMOUNT.value]
                     for trade in default_trades_data["BTC/USDT"]
@@ -105,13 +105,18 @@ def register(blueprint):
         quote = flask.request.args.get("quote")
         since = flask.request.args.get("since")
         scale = flask.request.args.get("scale", "")
+        cursor = flask.request.args.get("cursor")
+        limit = flask.request.args.get("limit", type=int)
+        # paginated when limit is given: also returns the next page cursor
         return flask.jsonify(
-            models.get_pnl_history(
+            (models.get_pnl_history if limit is None else models.get_pnl_history_page)(
                 exchange=exchange,
                 quote=quote,
                 symbol=symbol,
                 since=since,
                 scale=scale,
+                cursor=cursor,
+                limit=limit,
             )
         )
 
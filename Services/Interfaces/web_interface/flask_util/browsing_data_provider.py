@@ -16,6 +16,7 @@
 import os
 import json
 import secrets
+import threading
 import time
 
 import octobot_commons.singleton as singleton
@@ -37,13 +38,19 @@ class BrowsingDataProvider(singleton.Singleton):
     AUTOMATIONS = "automations"
     PROFILE_SELECTOR = "profile_selector"
     CACHE_EXPIRATION = constants.DAYS_TO_SECONDS * 14   # use 14 days cache maximum
+    EXCHANGE_MARKETS_CACHE_EXPIRATION = constants.DAYS_TO_SECONDS   # refresh each exchange markets every day
     TIMESTAMP = "timestamp"
     VALUE = "value"
 
     def __init__(self):
         self.browsing_data = {}
+        # saved in a separate file: exchange markets are large and refreshed way more often than browsing data
+        self.exchange_markets = {}
         self.logger = logging.get_logger(self.__class__.__name__)
+        # data is updated from the bot main loop as well as from web interface threads
+        self._lock = threading.RLock()
         self._load_saved_data()
+        self._load_exchange_markets()
 
     def get_or_create_session_secret_key(self):
         try:
@@ -65,18 +72,20 @@ class BrowsingDataProvider(singleton.Singleton):
         return value
 
     def set_is_first_display(self, element, is_first_display):
-        try:
-            if self.browsing_data[self.FIRST_DISPLAY][element] != is_first_display:
+        with self._lock:
+            try:
+                if self.browsing_data[self.FIRST_DISPLAY][element] != is_first_display:
+                    self.browsing_data[self.FIRST_DISPLAY][element] = is_first_display
+                    self.dump_saved_data()
+            except KeyError:
                 self.browsing_data[self.FIRST_DISPLAY][element] = is_first_display
                 self.dump_saved_data()
-        except KeyError:
-            self.browsing_data[self.FIRST_DISPLAY][element] = is_first_display
-            self.dump_saved_data()
 
     def set_first_displays(self, is_first_display):
-        for key in self.browsing_data[self.FIRST_DISPLAY]:
-            self.browsing_data[self.FIRST_DISPLAY][key] = is_first_display
-        self.dump_saved_data()
+        with self._lock:
+            for key in self.browsing_data[self.FIRST_DISPLAY]:
+                self.browsing_data[self.FIRST_DISPLAY][key] = is_first_display
+            self.dump_saved_data()
 
     def get_currency_logo_url(self, currency_id):
         try:
@@ -88,16 +97,41 @@ class BrowsingDataProvider(singleton.Singleton):
         if url is None:
             # do not save None as an url
             return
-        self.browsing_data[self.CURRENCY_LOGO][currency_id] = url
-        if dump:
-            self.dump_saved_data()
+        with self._lock:
+            self.browsing_data[self.CURRENCY_LOGO][currency_id] = url
+            if dump:
+                self.dump_saved_data()
 
     def get_all_currencies(self):
-        return self._get_expiring_cached_value(self.ALL_CURRENCIES)
+        # expired currencies are still returned, use is_all_currencies_expired to know when to refresh them
+        return self.browsing_data[self.ALL_CURRENCIES][self.VALUE]
+
+    def is_all_currencies_expired(self):
+        return self._is_expired(self.browsing_data[self.ALL_CURRENCIES], self.CACHE_EXPIRATION)
 
     def set_all_currencies(self, all_currencies):
-        self._set_expiring_cached_value(self.ALL_CURRENCIES, all_currencies)
-        self.dump_saved_data()
+        with self._lock:
+            self._set_expiring_cached_value(self.ALL_CURRENCIES, all_currencies)
+            self.dump_saved_data()
+
+    def get_exchange_markets(self, exchange):
+        # expired markets are still returned, use is_exchange_markets_expired to know when to refresh them
+        try:
+            return self.exchange_markets[exchange][self.VALUE]
+        except KeyError:
+            return None
+
+    def is_exchange_markets_expired(self, exchange):
+        try:
+            return self._is_expired(self.exchange_markets[exchange], self.EXCHANGE_MARKETS_CACHE_EXPIRATION)
+        except KeyError:
+            return True
+
+    def set_exchange_markets(self, exchange, markets, dump=True):
+        with self._lock:
+            self.exchange_markets[exchange] = self._create_expiring_cached_value(markets)
+            if dump:
+                self.dump_exchange_markets()
 
     def _get_session_secret_key(self):
         authenticator = commons_authentication.Authenticator.instance()
@@ -116,8 +150,9 @@ class BrowsingDataProvider(singleton.Singleton):
         return commons_configuration.encrypt(secrets.token_hex()).decode()
 
     def _generate_session_secret_key(self):
-        self.browsing_data[self.SESSION_SEC_KEY] = self._create_session_secret_key()
-        self.dump_saved_data()
+        with self._lock:
+            self.browsing_data[self.SESSION_SEC_KEY] = self._create_session_secret_key()
+            self.dump_saved_data()
 
     def _get_default_data(self):
         return {
@@ -147,19 +182,37 @@ class BrowsingDataProvider(singleton.Singleton):
             # save fixed data
             self.dump_saved_data()
 
+    def _load_exchange_markets(self):
+        try:
+            self.exchange_markets = json_util.read_file(self._get_exchange_markets_file())
+        except FileNotFoundError:
+            pass
+        except Exception as err:
+            self.logger.exception(err, True, f"Unexpected error when reading saved exchange markets: {err}")
+
     def dump_saved_data(self):
+        self._dump(self._get_file(), self.browsing_data)
+
+    def dump_exchange_markets(self):
+        self._dump(self._get_exchange_markets_file(), self.exchange_markets)
+
+    def _dump(self, file_path, data):
         try:
-            with open(self._get_file(), "w") as sessions_file:
-                return json.dump(self.browsing_data, sessions_file)
+            with self._lock:
+                # replace the file only once fully written: the session secret key can't be lost
+                # and readers never get a partially written file
+                temp_file_path = f"{file_path}.tmp"
+                with open(temp_file_path, "w") as saved_file:
+                    json.dump(data, saved_file)
+                os.replace(temp_file_path, file_path)
         except Exception as err:
-            self.logger.exception(err, True, f"Unexpected error when reading saved data: {err}")
+            self.logger.exception(err, True, f"Unexpected error when saving data into {file_path}: {err}")
 
     def _get_file(self):
         return os.path.join(constants.USER_FOLDER, f"{self.__class__.__name__}_data.json")
 
-    def _get_expiring_cached_value(self, key):
-        self._ensure_cache_expiration(key)
-        return self.browsing_data[key][self.VALUE]
+    def _get_exchange_markets_file(self):
+        return os.path.join(constants.USER_FOLDER, f"{self.__class__.__name__}_exchange_markets.json")
 
     def _set_expiring_cached_value(self, key, value):
         self.browsing_data[key] = self._create_expiring_cached_value(value)
@@ -170,6 +223,5 @@ class BrowsingDataProvider(singleton.Singleton):
             self.VALUE: value,
         }
 
-    def _ensure_cache_expiration(self, key):
-        if time.time() - self.browsing_data[key][self.TIMESTAMP] > self.CACHE_EXPIRATION:
-            self.browsing_data[key] = self._get_default_data()[key]
+    def _is_expired(self, cached_value, expiration):
+        return time.time() - cached_value[self.TIMESTAMP] > expiration
@@ -258,6 +258,7 @@ from tentacles.Services.Interfaces.web_interface.models.trading import (
     get_portfolio_historical_values,
     get_pnl_history_symbols,
     get_pnl_history,
+    get_pnl_history_page,
     get_all_orders_data,
     get_all_trades_data,
     get_all_positions_data,
@@ -462,6 +463,7 @@ __all__ = [
     "get_portfolio_historical_values",
     "get_pnl_history_symbols",
     "get_pnl_history",
+    "get_pnl_history_page",
     "get_all_orders_data",
     "get_all_trades_data",
     "get_all_positions_data",
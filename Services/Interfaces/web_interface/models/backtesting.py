@@ -335,8 +335,12 @@ def get_latest_backtesting_run_id(trading_mode):
 
 
 def get_delete_data_file(file_name):
+    import tentacles.Backtesting.importers.exchanges as importers_exchanges
     deleted, error = backtesting_api.delete_data_file(file_name)
     if deleted:
+        importers_exchanges.ColumnarCandlesStorage(
+            os.path.join(backtesting_constants.BACKTESTING_FILE_PATH, file_name)
+        ).delete()
         return deleted, f"{file_name} deleted"
     else:
         return deleted, f"Can't delete {file_name} ({error})"
@@ -24,6 +24,7 @@ import urllib3.util.retry
 
 import aiohttp
 import gc
+import threading
 
 import octobot_evaluators.constants as evaluators_constants
 import octobot_evaluators.evaluators as evaluators
@@ -134,6 +135,11 @@ def _get_currency_dict(name, symbol, identifier):
 
 # buffers to faster config page loading
 markets_by_exchanges = {}
+# exchanges and currencies being refreshed in background while serving their cached values
+refreshing_markets_exchanges = set()
+refreshing_all_currencies = threading.Event()
+# refreshes are requested from web interface threads and ended from the bot main loop or a refresh thread
+refreshing_lock = threading.Lock()
 all_symbols_dict = {}
 exchange_logos = {}
 # can't fetch symbols from coinmarketcap.com (which is in ccxt but is not an exchange and has a paid api)
@@ -921,7 +927,7 @@ def _get_filtered_exchange_symbols(symbols):
     return [res for res in symbols if octobot_commons.MARKET_SEPARATOR in res]
 
 
-async def _load_market(exchange, results):
+async def _load_market(exchange, results, data_provider):
     try:
         if exchange in auto_filled_exchanges():
             async with trading_api.get_new_ccxt_client(
@@ -936,6 +942,7 @@ async def _load_market(exchange, results):
                 symbols = client.symbols
         # filter symbols with a "." or no "/" because bot can't handle them for now
         markets_by_exchanges[exchange] = _get_filtered_exchange_symbols(symbols)
+        data_provider.set_exchange_markets(exchange, markets_by_exchanges[exchange], dump=False)
         results.append(markets_by_exchanges[exchange])
     except Exception as e:
         _get_logger().exception(e, True, f"error when loading symbol list for {exchange}: {e}")
@@ -950,10 +957,34 @@ def _add_merged_exchanges(exchanges):
     return extended
 
 
+async def _refresh_markets(exchanges, data_provider):
+    try:
+        await asyncio.gather(*(_load_market(exchange, [], data_provider) for exchange in exchanges))
+        data_provider.dump_exchange_markets()
+    finally:
+        with refreshing_lock:
+            refreshing_markets_exchanges.difference_update(exchanges)
+
+
+def _refresh_markets_in_background(exchanges, data_provider):
+    with refreshing_lock:
+        to_refresh_exchanges = [
+            exchange
+            for exchange in exchanges
+            if exchange not in refreshing_markets_exchanges
+        ]
+        refreshing_markets_exchanges.update(to_refresh_exchanges)
+    if to_refresh_exchanges:
+        interfaces_util.run_in_bot_main_loop(_refresh_markets(to_refresh_exchanges, data_provider), blocking=False)
+
+
 async def _load_markets(exchanges):
+    import tentacles.Services.Interfaces.web_interface.flask_util as flask_util
+    data_provider = flask_util.BrowsingDataProvider.instance()
     result = []
     results = []
     fetch_coros = []
+    expired_exchanges = []
     exchange_managers = trading_api.get_exchange_managers_from_exchange_ids(
         trading_api.get_exchange_ids()
     )
@@ -968,12 +999,23 @@ async def _load_markets(exchanges):
                 markets_by_exchanges[exchange] = _get_filtered_exchange_symbols(
                     trading_api.get_all_exchange_symbols(exchange_manager_by_exchange_name[exchange])
                 )
+            elif exchange not in exchange_manager_by_exchange_name:
+                # use saved markets from previous fetches, refresh them in background when expired
+                if exchange not in markets_by_exchanges:
+                    cached_markets = data_provider.get_exchange_markets(exchange)
+                    if cached_markets is not None:
+                        markets_by_exchanges[exchange] = cached_markets
+                if exchange in markets_by_exchanges and data_provider.is_exchange_markets_expired(exchange):
+                    expired_exchanges.append(exchange)
             if exchange in markets_by_exchanges:
                 result += markets_by_exchanges[exchange]
             else:
-                fetch_coros.append(_load_market(exchange, results))
+                fetch_coros.append(_load_market(exchange, results, data_provider))
+    if expired_exchanges:
+        _refresh_markets_in_background(expired_exchanges, data_provider)
     if fetch_coros:
         await asyncio.gather(*fetch_coros)
+        data_provider.dump_exchange_markets()
         for res in results:
             result += res
     return result
@@ -1031,40 +1073,62 @@ def get_all_symbols_list():
     data_provider = flask_util.BrowsingDataProvider.instance()
     all_currencies = copy.copy(data_provider.get_all_currencies())
     if not all_currencies:
-        added_is = set()
-        request_response = None
-        base_error = "Failed to get currencies list from coingecko.com (this is a display only issue): "
-        try:
-            # inspired from https://github.com/man-c/pycoingecko
-            session = requests.Session()
-            retries = urllib3.util.retry.Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
-            session.mount('http://', requests.adapters.HTTPAdapter(max_retries=retries))
-            # first fetch top 250 currencies then add all currencies and their ids
-            for url in (f"{constants.CURRENCIES_LIST_URL}1", constants.ALL_SYMBOLS_URL):
-                request_response = session.get(url)
-                if request_response.status_code == 429:
-                    # rate limit issue
-                    _get_logger().warning(f"{base_error}Too many requests, retry in a few seconds")
-                    break
-                for currency_data in request_response.json():
-                    if _is_legit_currency(currency_data[NAME_KEY]):
-                        currency_id = currency_data["id"]
-                        if currency_id not in added_is:
-                            added_is.add(currency_id)
-                            all_currencies.append(_get_currency_dict(
-                                currency_data[NAME_KEY],
-                                currency_data["symbol"],
-                                currency_id
-                            ))
-            # fetched_all: save it
-            data_provider.set_all_currencies(all_currencies)
-        except Exception as e:
-            str_error = html_util.get_html_summary_if_relevant(e)
-            details = f"code: {request_response.status_code}, error: {str_error}" \
-                if request_response else {request_response}
-            _get_logger().exception(e, True, f"{base_error}{str_error}")
-            _get_logger().debug(f"coingecko.com response {details}")
-            return {}
+        return _fetch_all_currencies(data_provider)
+    with refreshing_lock:
+        should_refresh = data_provider.is_all_currencies_expired() and not refreshing_all_currencies.is_set()
+        if should_refresh:
+            refreshing_all_currencies.set()
+    if should_refresh:
+        # serve saved currencies while refreshing them
+        threading.Thread(
+            target=_refresh_all_currencies, args=(data_provider, ), name="refresh_all_currencies", daemon=True
+        ).start()
+    return all_currencies
+
+
+def _refresh_all_currencies(data_provider):
+    try:
+        _fetch_all_currencies(data_provider)
+    finally:
+        refreshing_all_currencies.clear()
+
+
+def _fetch_all_currencies(data_provider):
+    all_currencies = []
+    added_is = set()
+    request_response = None
+    base_error = "Failed to get currencies list from coingecko.com (this is a display only issue): "
+    try:
+        # inspired from https://github.com/man-c/pycoingecko
+        session = requests.Session()
+        retries = urllib3.util.retry.Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        session.mount('http://', requests.adapters.HTTPAdapter(max_retries=retries))
+        # first fetch top 250 currencies then add all currencies and their ids
+        for url in (f"{constants.CURRENCIES_LIST_URL}1", constants.ALL_SYMBOLS_URL):
+            request_response = session.get(url)
+            if request_response.status_code == 429:
+                # rate limit issue
+                _get_logger().warning(f"{base_error}Too many requests, retry in a few seconds")
+                break
+            for currency_data in request_response.json():
+                if _is_legit_currency(currency_data[NAME_KEY]):
+                    currency_id = currency_data["id"]
+                    if currency_id not in added_is:
+                        added_is.add(currency_id)
+                        all_currencies.append(_get_currency_dict(
+                            currency_data[NAME_KEY],
+                            currency_data["symbol"],
+                            currency_id
+                        ))
+        # fetched_all: save it
+        data_provider.set_all_currencies(all_currencies)
+    except Exception as e:
+        str_error = html_util.get_html_summary_if_relevant(e)
+        details = f"code: {request_response.status_code}, error: {str_error}" \
+            if request_response else {request_response}
+        _get_logger().exception(e, True, f"{base_error}{str_error}")
+        _get_logger().debug(f"coingecko.com response {details}")
+        return {}
     return all_currencies
 
 
@@ -15,6 +15,7 @@
 #  License along with this library.
 import numpy as np
 import math
+import time
 
 import octobot_backtesting.api as backtesting_api
 import octobot_services.interfaces.util as interfaces_util
@@ -25,6 +26,7 @@ import tentacles.Services.Interfaces.web_interface.models.interface_settings as
 import tentacles.Services.Interfaces.web_interface.enums as enums
 import octobot_commons.timestamp_util as timestamp_util
 import octobot_commons.enums as commons_enums
+import octobot_commons.constants as commons_constants
 import octobot_commons.symbols as commons_symbols
 
 GET_SYMBOL_SEPARATOR = "|"
@@ -185,14 +187,36 @@ def get_first_symbol_data():
         return {}
 
 
+def _get_candles_columns(historical_candles, kline, list_arrays, since_time):
+    time_index = commons_enums.PriceIndexes.IND_PRICE_TIME.value
+    start_index = 0 if since_time is None \
+        else int(np.searchsorted(historical_candles[time_index], since_time, side="left"))
+    columns = {
+        price_index.value: historical_candles[price_index.value][start_index:]
+        for price_index in commons_enums.PriceIndexes
+    }
+    # add kline as the last (current) candle that is not yet in history
+    if math.nan not in kline and (since_time is None or kline[time_index] >= since_time) and (
+        len(columns[time_index]) == 0 or columns[time_index][-1] != kline[time_index]
+    ):
+        if list_arrays:
+            columns = {index: values.tolist() + [kline[index]] for index, values in columns.items()}
+        else:
+            columns = {index: np.append(values, kline[index]) for index, values in columns.items()}
+    elif list_arrays:
+        columns = {index: values.tolist() for index, values in columns.items()}
+    return columns
+
+
 def _create_candles_data(exchange_manager, symbol, time_frame, historical_candles, kline,
-                         bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders):
+                         bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders, since_time=None):
     candles_key = "candles"
     trades_key = "trades"
     orders_key = "orders"
     symbol_key = "symbol"
     simulated_key = "simulated"
     exchange_id_key = "exchange_id"
+    last_candle_time_key = "last_candle_time"
     result_dict = {
         candles_key: {},
         trades_key: {},
@@ -200,31 +224,10 @@ def _create_candles_data(exchange_manager, symbol, time_frame, historical_candle
         simulated_key: trading_api.is_trader_simulated(exchange_manager),
         symbol_key: symbol,
         exchange_id_key: trading_api.get_exchange_manager_id(exchange_manager),
+        last_candle_time_key: since_time,
     }
     try:
-        data = historical_candles
-
-        # add kline as the last (current) candle that is not yet in history
-        if math.nan not in kline and data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][-1] != kline[
-            commons_enums.PriceIndexes.IND_PRICE_TIME.value]:
-            data[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_LOW.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_LOW.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_LOW.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_OPEN.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_HIGH.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_VOL.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_VOL.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_VOL.value])
+        data = _get_candles_columns(historical_candles, kline, list_arrays, since_time)
         data_x = timestamp_util.convert_timestamps_to_datetime(data[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
                                                                time_format="%y-%m-%d %H:%M:%S",
                                                                force_timezone=False)
@@ -250,12 +253,11 @@ def _create_candles_data(exchange_manager, symbol, time_frame, historical_candle
         if list_arrays:
             result_dict[candles_key] = {
                 enums.PriceStrings.STR_PRICE_TIME.value: data_x,
-                enums.PriceStrings.STR_PRICE_CLOSE.value: data[
-                    commons_enums.PriceIndexes.IND_PRICE_CLOSE.value].tolist(),
-                enums.PriceStrings.STR_PRICE_LOW.value: data[commons_enums.PriceIndexes.IND_PRICE_LOW.value].tolist(),
-                enums.PriceStrings.STR_PRICE_OPEN.value: data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value].tolist(),
-                enums.PriceStrings.STR_PRICE_HIGH.value: data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value].tolist(),
-                enums.PriceStrings.STR_PRICE_VOL.value: data[commons_enums.PriceIndexes.IND_PRICE_VOL.value].tolist()
+                enums.PriceStrings.STR_PRICE_CLOSE.value: data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value],
+                enums.PriceStrings.STR_PRICE_LOW.value: data[commons_enums.PriceIndexes.IND_PRICE_LOW.value],
+                enums.PriceStrings.STR_PRICE_OPEN.value: data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
+                enums.PriceStrings.STR_PRICE_HIGH.value: data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value],
+                enums.PriceStrings.STR_PRICE_VOL.value: data[commons_enums.PriceIndexes.IND_PRICE_VOL.value]
             }
         else:
             result_dict[candles_key] = {
@@ -265,6 +267,8 @@ def _create_candles_data(exchange_manager, symbol, time_frame, historical_candle
                 enums.PriceStrings.STR_PRICE_OPEN.value: data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
                 enums.PriceStrings.STR_PRICE_HIGH.value: data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value]
             }
+        # numeric time of the last sent candle: next updates can be requested from this candle
+        result_dict[last_candle_time_key] = float(data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][-1])
     except IndexError:
         pass
     return result_dict
@@ -280,7 +284,12 @@ def _ensure_time_frame(time_frame: str):
 
 
 def get_currency_price_graph_update(exchange_id, symbol, time_frame, list_arrays=True, backtesting=False,
-                                    minimal_candles=False, ignore_trades=False, ignore_orders=False):
+                                    minimal_candles=False, ignore_trades=False, ignore_orders=False,
+                                    since_time=None):
+    """
+    :param since_time: when set, only candles from this candle time are returned: the previously last candle,
+    which might have changed, and new candles
+    """
     bot_api = interfaces_util.get_bot_api()
     parsed_symbol = commons_symbols.parse_symbol(parse_get_symbol(symbol))
     in_backtesting = backtesting_api.is_backtesting_enabled(interfaces_util.get_global_config()) or backtesting
@@ -291,13 +300,19 @@ def get_currency_price_graph_update(exchange_id, symbol, time_frame, list_arrays
             time_frame = _ensure_time_frame(time_frame)
             symbol_data = trading_api.get_symbol_data(exchange_manager, symbol_id, allow_creation=False)
             limit = 1 if minimal_candles else -1
+            if since_time is not None:
+                # candles since since_time and the previous one in case the kline is not available
+                time_frame_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)] * \
+                    commons_constants.MINUTE_TO_SECONDS
+                limit = max(limit, int((time.time() - since_time) // time_frame_seconds) + 2)
             historical_candles = trading_api.get_symbol_historical_candles(symbol_data, time_frame, limit=limit)
             kline = [math.nan]
             if trading_api.has_symbol_klines(symbol_data, time_frame):
                 kline = trading_api.get_symbol_klines(symbol_data, time_frame)
             if historical_candles is not None:
                 return _create_candles_data(exchange_manager, symbol_id, time_frame, historical_candles,
-                                            kline, bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders)
+                                            kline, bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders,
+                                            since_time=since_time)
         except KeyError:
             traded_pairs = trading_api.get_trading_pairs(exchange_manager)
             if not traded_pairs or symbol_id in traded_pairs:
@@ -14,6 +14,7 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import time
+import threading
 import sortedcontainers
 
 import octobot_services.interfaces.util as interfaces_util
@@ -182,134 +183,328 @@ def get_portfolio_historical_values(currency, time_frame=None, from_timestamp=No
     )
 
 
-def _get_pnl_history(exchange, quote, symbol, since):
-    if exchange:
-        return {
-            exchange: trading_api.get_completed_pnl_history(
-                dashboard.get_first_exchange_data(exchange, trading_exchange_only=True)[0],
-                quote=quote,
-                symbol=symbol,
-                since=since
-            )
+# PnL history keys, PNL_ prefixed when the name is also used by orders, trades and positions keys
+PNL_ENTRY_PRICE = "en_p"
+EXIT_PRICE = "ex_p"
+ENTRY_TIME = "en_t"
+ENTRY_DATE = "en_d"
+EXIT_TIME = "ex_t"
+EXIT_DATE = "ex_d"
+ENTRY_SIDE = "en_s"
+EXIT_SIDE = "ex_s"
+ENTRY_AMOUNT = "en_a"
+EXIT_AMOUNT = "ex_a"
+DETAILS = "d"
+PNL = "pnl"
+PNL_AMOUNT = "pnl_a"
+PNL_EXCHANGE = "ex"
+FEES = "f"
+SPECIAL_FEES = "s_f"
+BASE = "b"
+QUOTE = "q"
+CURRENCY = "c"
+PNL_SYMBOL = "s"
+TRADES_COUNT = "tc"
+PNLS = "pnls"
+NEXT_CURSOR = "next_cursor"
+
+
+class _PnlBucket:
+    def __init__(self, scaled_time):
+        self.exit_date = _convert_timestamp(scaled_time)
+        self.pnl = 0
+        self.pnl_amount = 0
+        self.trades_count = 0
+        self.elements = []
+
+    def add(self, element):
+        self.pnl += element.pnl
+        self.pnl_amount += element.pnl_amount
+        self.trades_count += element.trades_count
+        self.elements.append(element)
+
+    def remove(self, element):
+        self.pnl -= element.pnl
+        self.pnl_amount -= element.pnl_amount
+        self.trades_count -= element.trades_count
+        self.elements.remove(element)
+
+
+class _PnlElement:
+    def __init__(self, exchange_name, historical_pnl):
+        self.entry_id = historical_pnl.entries[0].origin_order_id
+        self.close_time = historical_pnl.get_close_time()
+        self.entry_time = historical_pnl.get_entry_time()
+        self.symbol = historical_pnl.entries[0].symbol
+        self.quote = historical_pnl.entries[0].market
+        self.pnl, _ = historical_pnl.get_profits()
+        self.pnl_amount = historical_pnl.get_closed_close_value()
+        self.trades_count = len(historical_pnl.entries) + len(historical_pnl.closes)
+        self.details = {
+            ENTRY_TIME: self.entry_time,
+            ENTRY_DATE: _convert_timestamp(self.entry_time),
+            PNL_ENTRY_PRICE: float(historical_pnl.get_entry_price()),
+            EXIT_PRICE: float(historical_pnl.get_close_price()),
+            ENTRY_SIDE: historical_pnl.entries[0].side.value,
+            EXIT_SIDE: historical_pnl.closes[0].side.value,
+            ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
+            EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
+            PNL_SYMBOL: self.symbol,
+            FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
+            SPECIAL_FEES: [
+                {
+                    CURRENCY: currency,
+                    FEES: float(value),
+                }
+                for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
+            ],
+            BASE: historical_pnl.entries[0].currency,
+            PNL_EXCHANGE: exchange_name,
         }
-    history = {}
-    for exchange_manager in configuration.get_live_trading_enabled_exchange_managers():
-        history[trading_api.get_exchange_name(exchange_manager)] = trading_api.get_completed_pnl_history(
-            exchange_manager,
-            quote=quote,
-            symbol=symbol,
-            since=since
+
+    def is_matching(self, quote, symbol, since):
+        return (symbol is None or self.symbol == symbol) \
+            and (quote is None or self.quote == quote) \
+            and (since is None or self.entry_time >= since)
+
+
+class _ExchangePnlHistory:
+    """
+    Completed trades PnL of an exchange, only created from new trades when updated.
+    PnL aggregates of each requested time scale are kept up to date.
+    """
+
+    def __init__(self, exchange_name):
+        self.exchange_name = exchange_name
+        self.element_by_entry_id = {}
+        self.exit_trades_by_entry_id = {}
+        self.processed_trade_ids = set()
+        self.invalid_pnls = 0
+        # {scale_seconds: {scaled_time: {symbol: _PnlBucket}}}
+        self.buckets_by_scale = {}
+
+    def has_processed_trades_in(self, trades):
+        return self.processed_trade_ids.issubset(trade.trade_id for trade in trades)
+
+    def update(self, exchange_manager, trades):
+        new_exit_trades = []
+        for trade in trades:
+            if trade.trade_id not in self.processed_trade_ids:
+                self.processed_trade_ids.add(trade.trade_id)
+                if trade.associated_entry_ids:
+                    new_exit_trades.append(trade)
+        to_update_entry_ids = []
+        for trade in new_exit_trades:
+            for entry_id in trade.associated_entry_ids:
+                self.exit_trades_by_entry_id.setdefault(entry_id, []).append(trade)
+                to_update_entry_ids.append(entry_id)
+        # also select previous exit trades of updated entries: PnLs are created from every exit of an entry.
+        # Exits can close several entries, whose PnLs are also created: select every exit of these entries as well
+        updated_entry_ids = set(to_update_entry_ids)
+        updated_exit_trades = {}
+        while to_update_entry_ids:
+            for exit_trade in self.exit_trades_by_entry_id.get(to_update_entry_ids.pop(), []):
+                if exit_trade.trade_id in updated_exit_trades:
+                    continue
+                updated_exit_trades[exit_trade.trade_id] = exit_trade
+                for entry_id in exit_trade.associated_entry_ids:
+                    if entry_id not in updated_entry_ids:
+                        updated_entry_ids.add(entry_id)
+                        to_update_entry_ids.append(entry_id)
+        if not updated_exit_trades:
+            return
+        for historical_pnl in exchange_manager.exchange_personal_data.trades_manager.get_completed_trades_pnl(
+            trades, list(updated_exit_trades.values())
+        ):
+            previous_element = self.element_by_entry_id.pop(historical_pnl.entries[0].origin_order_id, None)
+            if previous_element is not None:
+                self._update_buckets(previous_element, False)
+            try:
+                element = _PnlElement(self.exchange_name, historical_pnl)
+            except trading_errors.IncompletePNLError:
+                self.invalid_pnls += 1
+                continue
+            self.element_by_entry_id[element.entry_id] = element
+            self._update_buckets(element, True)
+
+    def get_symbols(self, quote, symbol, since):
+        return set(
+            element.symbol
+            for element in self.element_by_entry_id.values()
+            if element.is_matching(quote, symbol, since)
         )
-    return history
+
+    def get_buckets(self, scale_seconds, since):
+        """
+        :return: the {scaled_time: {symbol: _PnlBucket}} SortedDict of the given scale
+        """
+        if since is not None:
+            # buckets of PnLs from since only: not kept
+            return self._create_buckets(scale_seconds, since)
+        if scale_seconds not in self.buckets_by_scale:
+            self.buckets_by_scale[scale_seconds] = self._create_buckets(scale_seconds, None)
+        return self.buckets_by_scale[scale_seconds]
+
+    def _create_buckets(self, scale_seconds, since):
+        buckets = sortedcontainers.SortedDict()
+        for element in self.element_by_entry_id.values():
+            if since is None or element.is_matching(None, None, since):
+                self._add_to_buckets(buckets, scale_seconds, element)
+        return buckets
+
+    def _update_buckets(self, element, add):
+        for scale_seconds, buckets in self.buckets_by_scale.items():
+            if add:
+                self._add_to_buckets(buckets, scale_seconds, element)
+            else:
+                scaled_time = element.close_time - (element.close_time % scale_seconds)
+                buckets_by_symbol = buckets[scaled_time]
+                buckets_by_symbol[element.symbol].remove(element)
+                if not buckets_by_symbol[element.symbol].elements:
+                    buckets_by_symbol.pop(element.symbol)
+                    if not buckets_by_symbol:
+                        buckets.pop(scaled_time)
+
+    @staticmethod
+    def _add_to_buckets(buckets, scale_seconds, element):
+        scaled_time = element.close_time - (element.close_time % scale_seconds)
+        if scaled_time not in buckets:
+            buckets[scaled_time] = {}
+        if element.symbol not in buckets[scaled_time]:
+            buckets[scaled_time][element.symbol] = _PnlBucket(scaled_time)
+        buckets[scaled_time][element.symbol].add(element)
+
+
+# PnL histories are updated and read from web interface threads
+_PNL_HISTORY_LOCK = threading.Lock()
+_PNL_HISTORY_BY_EXCHANGE_ID = {}
+
+
+def _get_exchange_managers_by_name(exchange):
+    if exchange:
+        return {exchange: dashboard.get_first_exchange_data(exchange, trading_exchange_only=True)[0]}
+    return {
+        trading_api.get_exchange_name(exchange_manager): exchange_manager
+        for exchange_manager in configuration.get_live_trading_enabled_exchange_managers()
+    }
+
+
+def _get_updated_pnl_histories(exchange):
+    """
+    Should be called with _PNL_HISTORY_LOCK acquired
+    """
+    pnl_histories = []
+    for exchange_name, exchange_manager in _get_exchange_managers_by_name(exchange).items():
+        exchange_id = trading_api.get_exchange_manager_id(exchange_manager)
+        trades = trading_api.get_trade_history(exchange_manager)
+        if exchange_id not in _PNL_HISTORY_BY_EXCHANGE_ID \
+           or not _PNL_HISTORY_BY_EXCHANGE_ID[exchange_id].has_processed_trades_in(trades):
+            # new exchange or cleared trades history
+            _PNL_HISTORY_BY_EXCHANGE_ID[exchange_id] = _ExchangePnlHistory(exchange_name)
+        pnl_history = _PNL_HISTORY_BY_EXCHANGE_ID[exchange_id]
+        invalid_pnls = pnl_history.invalid_pnls
+        pnl_history.update(exchange_manager, trades)
+        if pnl_history.invalid_pnls > invalid_pnls:
+            logging.get_logger("TradingModel").warning(
+                f"{pnl_history.invalid_pnls - invalid_pnls} invalid TradePNLs in history"
+            )
+        pnl_histories.append(pnl_history)
+    if not exchange:
+        # forget stopped exchanges
+        for exchange_id in set(_PNL_HISTORY_BY_EXCHANGE_ID) - set(
+            trading_api.get_exchange_manager_id(exchange_manager)
+            for exchange_manager in configuration.get_live_trading_enabled_exchange_managers()
+        ):
+            _PNL_HISTORY_BY_EXCHANGE_ID.pop(exchange_id)
+    return pnl_histories
+
+
+def _parse_timestamp(timestamp):
+    return None if timestamp is None or timestamp == "" else float(timestamp)
 
 
 def get_pnl_history_symbols(exchange=None, quote=None, symbol=None, since=None):
-    return set(
-        historical_pnl.entries[0].symbol
-        for exchange_name, historical_pnl_elements in _get_pnl_history(exchange, quote, symbol, since).items()
-        for historical_pnl in historical_pnl_elements
-        if historical_pnl.entries
-    )
+    with _PNL_HISTORY_LOCK:
+        return set().union(*(
+            pnl_history.get_symbols(quote, symbol, _parse_timestamp(since))
+            for pnl_history in _get_updated_pnl_histories(exchange)
+        ))
 
 
 def _convert_timestamp(timestamp):
     return timestamp_util.convert_timestamp_to_datetime(timestamp, time_format='%Y-%m-%d %H:%M:%S')
 
 
-def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None):
-    ENTRY_PRICE = "en_p"
-    EXIT_PRICE = "ex_p"
-    ENTRY_TIME = "en_t"
-    ENTRY_DATE = "en_d"
-    EXIT_TIME = "ex_t"
-    EXIT_DATE = "ex_d"
-    ENTRY_SIDE = "en_s"
-    EXIT_SIDE = "ex_s"
-    ENTRY_AMOUNT = "en_a"
-    EXIT_AMOUNT = "ex_a"
-    DETAILS = "d"
-    PNL = "pnl"
-    PNL_AMOUNT = "pnl_a"
-    EXCHANGE = "ex"
-    FEES = "f"
-    SPECIAL_FEES = "s_f"
-    BASE = "b"
-    QUOTE = "q"
-    CURRENCY = "c"
-    SYMBOL = "s"
-    TRADES_COUNT = "tc"
-    pnl_history = {}
+def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None, cursor=None, limit=None):
+    """
+    :param cursor: when set, only return PnLs after this exit time
+    :param limit: maximum number of returned PnLs
+    :return: PnLs ordered by exit time
+    """
     use_detailed_history = not(scale)
     scale_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
         commons_constants.MINUTE_TO_SECONDS if scale else 1
     symbol = symbol or None
     # set quote filter to None when symbol is not provided
     quote = None if symbol else quote
-    history_by_exchange = _get_pnl_history(exchange, quote, symbol, since)
-    invalid_pnls = 0
-    for exchange_name, historical_pnl_elements in history_by_exchange.items():
-        for historical_pnl in historical_pnl_elements:
-            try:
-                close_time = historical_pnl.get_close_time()
-                scaled_time = close_time - (close_time % scale_seconds)
-                pnl, pnl_p = historical_pnl.get_profits()
-                pnl_a = historical_pnl.get_closed_close_value()
-                if scaled_time not in pnl_history:
-                    pnl_history[scaled_time] = {
-                        PNL: pnl,
-                        PNL_AMOUNT: pnl_a,
-                        QUOTE: historical_pnl.entries[0].market,
-                        TRADES_COUNT: len(historical_pnl.entries) + len(historical_pnl.closes),
-                        DETAILS: None
-                    }
-                else:
-                    pnl_val = pnl_history[scaled_time]
-                    pnl_val[PNL] += pnl
-                    pnl_val[PNL_AMOUNT] += pnl_a
-                    pnl_val[TRADES_COUNT] += len(historical_pnl.entries) + len(historical_pnl.closes)
-                if use_detailed_history:
-                    pnl_history[scaled_time][DETAILS] = {
-                        ENTRY_TIME: historical_pnl.get_entry_time(),
-                        ENTRY_DATE: _convert_timestamp(historical_pnl.get_entry_time()),
-                        ENTRY_PRICE: float(historical_pnl.get_entry_price()),
-                        EXIT_PRICE: float(historical_pnl.get_close_price()),
-                        ENTRY_SIDE: historical_pnl.entries[0].side.value,
-                        EXIT_SIDE: historical_pnl.closes[0].side.value,
-                        ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
-                        EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
-                        SYMBOL: historical_pnl.entries[0].symbol,
-                        FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
-                        SPECIAL_FEES: [
-                            {
-                                CURRENCY: currency,
-                                FEES: float(value),
-                            }
-                            for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
-                        ],
-                        BASE: historical_pnl.entries[0].currency,
-                        EXCHANGE: exchange_name,
-                    }
-            except trading_errors.IncompletePNLError:
-                invalid_pnls += 1
-    if invalid_pnls:
-        logging.get_logger("TradingModel").warning(f"{invalid_pnls} invalid TradePNLs in history")
-    return sorted(
-        [
-            {
-                EXIT_TIME: t,
-                EXIT_DATE: _convert_timestamp(t),
-                PNL: float(pnl[PNL]),
-                PNL_AMOUNT: float(pnl[PNL_AMOUNT]),
-                QUOTE: pnl[QUOTE],
-                TRADES_COUNT: pnl[TRADES_COUNT],
-                DETAILS: pnl[DETAILS],
-            }
-            for t, pnl in pnl_history.items()
-            # skip 0 value pnl in detailed history
-            if not use_detailed_history or (pnl[PNL] or pnl.get(DETAILS, {}).get(SPECIAL_FEES, 0))
-        ],
-        key=lambda x: x[EXIT_TIME]
-    )
+    since = _parse_timestamp(since)
+    cursor = _parse_timestamp(cursor)
+    pnl_history = sortedcontainers.SortedDict()
+    with _PNL_HISTORY_LOCK:
+        for exchange_pnl_history in _get_updated_pnl_histories(exchange):
+            buckets = exchange_pnl_history.get_buckets(scale_seconds, since)
+            for scaled_time in buckets.irange(minimum=cursor, inclusive=(False, True)):
+                for bucket_symbol, bucket in buckets[scaled_time].items():
+                    if (symbol is not None and bucket_symbol != symbol) or \
+                       (quote is not None and bucket.elements[0].quote != quote):
+                        continue
+                    if scaled_time not in pnl_history:
+                        pnl_history[scaled_time] = {
+                            EXIT_DATE: bucket.exit_date,
+                            PNL: bucket.pnl,
+                            PNL_AMOUNT: bucket.pnl_amount,
+                            QUOTE: bucket.elements[0].quote,
+                            TRADES_COUNT: bucket.trades_count,
+                            DETAILS: None
+                        }
+                    else:
+                        pnl_val = pnl_history[scaled_time]
+                        pnl_val[PNL] += bucket.pnl
+                        pnl_val[PNL_AMOUNT] += bucket.pnl_amount
+                        pnl_val[TRADES_COUNT] += bucket.trades_count
+                    if use_detailed_history:
+                        pnl_history[scaled_time][DETAILS] = bucket.elements[-1].details
+    formatted_history = []
+    for t, pnl in pnl_history.items():
+        # skip 0 value pnl in detailed history
+        if use_detailed_history and not (pnl[PNL] or pnl[DETAILS][SPECIAL_FEES]):
+            continue
+        if limit is not None and len(formatted_history) >= limit:
+            break
+        formatted_history.append({
+            EXIT_TIME: t,
+            EXIT_DATE: pnl[EXIT_DATE],
+            PNL: float(pnl[PNL]),
+            PNL_AMOUNT: float(pnl[PNL_AMOUNT]),
+            QUOTE: pnl[QUOTE],
+            TRADES_COUNT: pnl[TRADES_COUNT],
+            DETAILS: pnl[DETAILS],
+        })
+    return formatted_history
+
+
+def get_pnl_history_page(exchange=None, quote=None, symbol=None, since=None, scale=None, cursor=None, limit=None):
+    """
+    Pages are read using the next_cursor of the previous page as cursor.
+    PnLs of previous pages exit times are not returned again, even when new trades updated them since.
+    :return: {PNLS: PnLs ordered by exit time, NEXT_CURSOR: the cursor of the next page, None on the last page}
+    """
+    pnls = get_pnl_history(exchange=exchange, quote=quote, symbol=symbol, since=since, scale=scale,
+                           cursor=cursor, limit=limit)
+    return {
+        PNLS: pnls,
+        NEXT_CURSOR: pnls[-1][EXIT_TIME] if limit is not None and pnls and len(pnls) >= limit else None,
+    }
 
 
 def _get_dumped_data(real, simulated, dump_func):
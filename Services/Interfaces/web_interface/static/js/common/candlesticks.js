@@ -377,22 +377,16 @@ function create_or_update_candlestick_graph(element_id, symbol_price_data, symbo
 
             // candles
             if(isDefined(candles) && isDefined(candles.time) && candles.time.length){
-                const last_price_trace_index = price_trace.close.length - 1;
-                const last_candle_index = candles["close"].length - 1;
-                const last_candle_time = candles["time"][last_candle_index];
-
-                if (last_candle_index > 0){
-                    // Candle update with last candle being and in-construction candle
-                    if (price_trace.x[last_price_trace_index] !== last_candle_time) {
-                        update_last_candle(price_trace, volume_trace, candles, last_price_trace_index, last_candle_index - 1);
-                        push_new_candle(price_trace, volume_trace, candles, last_candle_index, last_candle_time);
-                    } else {
-                        update_last_candle(price_trace, volume_trace, candles, last_price_trace_index, last_candle_index);
+                // received candles are the last displayed candle (that might have changed) and new candles
+                candles.time.forEach((candle_time, candle_index) => {
+                    const last_price_trace_index = price_trace.close.length - 1;
+                    const last_price_trace_time = price_trace.x[last_price_trace_index];
+                    if (last_price_trace_time === candle_time) {
+                        update_last_candle(price_trace, volume_trace, candles, last_price_trace_index, candle_index);
+                    } else if (last_price_trace_time < candle_time) {
+                        push_new_candle(price_trace, volume_trace, candles, candle_index, candle_time);
                     }
-                } else if(price_trace.x[last_price_trace_index].indexOf(last_candle_time) === -1) {
-                    // Candle update with only one candle but this candle is not displayed (no in-construction candle)
-                    push_new_candle(price_trace, volume_trace, candles, last_candle_index, last_candle_time);
-                }
+                });
             }
         }
         if(!isDefined(layout)){
@@ -0,0 +1,135 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import os
+import threading
+import time
+
+import mock
+import pytest
+
+import tentacles.Services.Interfaces.web_interface.flask_util as flask_util
+import tentacles.Services.Interfaces.web_interface.models.configuration as configuration_model
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "kraken"
+MARKETS = ["BTC/USD", "ETH/USD"]
+
+
+@pytest.fixture
+def data_provider(tmp_path):
+    with mock.patch.object(flask_util.BrowsingDataProvider, "_get_file",
+                           mock.Mock(return_value=os.path.join(tmp_path, "data.json"))), \
+            mock.patch.object(flask_util.BrowsingDataProvider, "_get_exchange_markets_file",
+                              mock.Mock(return_value=os.path.join(tmp_path, "exchange_markets.json"))):
+        yield flask_util.BrowsingDataProvider()
+
+
+@pytest.fixture
+def web_configuration(data_provider):
+    configuration_model.markets_by_exchanges.clear()
+    configuration_model.refreshing_markets_exchanges.clear()
+    configuration_model.refreshing_all_currencies.clear()
+    with mock.patch.object(flask_util.BrowsingDataProvider, "instance", mock.Mock(return_value=data_provider)), \
+            mock.patch.object(configuration_model.trading_api, "get_exchange_ids", mock.Mock(return_value=[])), \
+            mock.patch.object(configuration_model.trading_api, "get_exchange_managers_from_exchange_ids",
+                              mock.Mock(return_value=[])):
+        yield data_provider
+    configuration_model.markets_by_exchanges.clear()
+
+
+def _expire(cached_value):
+    cached_value[flask_util.BrowsingDataProvider.TIMESTAMP] = 0
+
+
+async def test_exchange_markets_expiration(data_provider):
+    assert data_provider.get_exchange_markets(EXCHANGE) is None
+    assert data_provider.is_exchange_markets_expired(EXCHANGE)
+    data_provider.set_exchange_markets(EXCHANGE, MARKETS)
+    assert data_provider.get_exchange_markets(EXCHANGE) == MARKETS
+    assert not data_provider.is_exchange_markets_expired(EXCHANGE)
+    with mock.patch.object(time, "time", mock.Mock(
+        return_value=time.time() + flask_util.BrowsingDataProvider.EXCHANGE_MARKETS_CACHE_EXPIRATION + 1
+    )):
+        assert data_provider.is_exchange_markets_expired(EXCHANGE)
+        # expired markets are still served
+        assert data_provider.get_exchange_markets(EXCHANGE) == MARKETS
+
+
+async def test_exchange_markets_file(data_provider):
+    data_provider.set_exchange_markets(EXCHANGE, MARKETS)
+    markets_file = data_provider._get_exchange_markets_file()
+    with open(markets_file) as saved_file:
+        assert json.load(saved_file)[EXCHANGE][flask_util.BrowsingDataProvider.VALUE] == MARKETS
+    with open(data_provider._get_file()) as saved_file:
+        # session secret key is saved in its own file
+        assert flask_util.BrowsingDataProvider.SESSION_SEC_KEY in json.load(saved_file)
+    assert not os.path.exists(f"{markets_file}.tmp")
+    # saved markets are loaded on restart
+    assert flask_util.BrowsingDataProvider().get_exchange_markets(EXCHANGE) == MARKETS
+
+
+async def test_load_markets_serves_expired_markets(web_configuration):
+    data_provider = web_configuration
+    data_provider.set_exchange_markets(EXCHANGE, MARKETS)
+    _expire(data_provider.exchange_markets[EXCHANGE])
+    with mock.patch.object(configuration_model.interfaces_util, "run_in_bot_main_loop",
+                           mock.Mock()) as run_in_bot_main_loop_mock:
+        assert await configuration_model._load_markets([EXCHANGE]) == MARKETS
+        assert await configuration_model._load_markets([EXCHANGE]) == MARKETS
+        # refreshed in background only once
+        run_in_bot_main_loop_mock.assert_called_once()
+        assert configuration_model.refreshing_markets_exchanges == {EXCHANGE}
+        refresh_coro = run_in_bot_main_loop_mock.mock_calls[0].args[0]
+
+    async def _load_market(exchange, results, provider):
+        provider.set_exchange_markets(exchange, MARKETS + ["XRP/USD"], dump=False)
+
+    with mock.patch.object(configuration_model, "_load_market", mock.AsyncMock(side_effect=_load_market)):
+        await refresh_coro
+    assert configuration_model.refreshing_markets_exchanges == set()
+    assert not data_provider.is_exchange_markets_expired(EXCHANGE)
+    assert flask_util.BrowsingDataProvider().get_exchange_markets(EXCHANGE) == MARKETS + ["XRP/USD"]
+
+
+async def test_get_all_symbols_list_serves_expired_currencies(web_configuration):
+    data_provider = web_configuration
+    currencies = [{"n": "Bitcoin", "s": "BTC", "i": "bitcoin"}]
+    new_currencies = currencies + [{"n": "Ethereum", "s": "ETH", "i": "ethereum"}]
+    data_provider.set_all_currencies(currencies)
+    _expire(data_provider.browsing_data[flask_util.BrowsingDataProvider.ALL_CURRENCIES])
+    release_fetch = threading.Event()
+
+    def _fetch_all_currencies(provider):
+        release_fetch.wait(5)
+        provider.set_all_currencies(new_currencies)
+
+    with mock.patch.object(configuration_model, "_fetch_all_currencies",
+                           mock.Mock(side_effect=_fetch_all_currencies)) as _fetch_all_currencies_mock:
+        assert configuration_model.get_all_symbols_list() == currencies
+        assert configuration_model.get_all_symbols_list() == currencies
+        release_fetch.set()
+        for _ in range(100):
+            if not configuration_model.refreshing_all_currencies.is_set():
+                break
+            time.sleep(0.01)
+        # refreshed in background only once
+        _fetch_all_currencies_mock.assert_called_once_with(data_provider)
+    assert not configuration_model.refreshing_all_currencies.is_set()
+    assert not data_provider.is_all_currencies_expired()
+    assert configuration_model.get_all_symbols_list() == new_currencies
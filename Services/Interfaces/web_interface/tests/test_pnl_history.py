@@ -0,0 +1,267 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import types
+
+import mock
+import pytest
+
+import octobot_commons.constants as commons_constants
+import octobot_commons.enums as commons_enums
+import octobot_trading.api as trading_api
+import octobot_trading.enums as trading_enums
+import octobot_trading.errors as trading_errors
+import octobot_trading.personal_data as trading_personal_data
+import tentacles.Services.Interfaces.web_interface.models.trading as trading_model
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+START_TIME = 1700000000
+HOUR = 3600
+SCALES = ("", commons_enums.TimeFrames.ONE_HOUR.value, commons_enums.TimeFrames.ONE_DAY.value)
+FILTERS = (
+    {},
+    {"quote": "USDT"},
+    {"quote": "BTC"},
+    {"symbol": "ETH/USDT"},
+    {"quote": "USDT", "since": START_TIME + 2 * HOUR},
+)
+
+
+class _TradesManager:
+    get_completed_trades_pnl = trading_personal_data.TradesManager.get_completed_trades_pnl
+
+    def __init__(self):
+        self.trades = {}
+
+    def get_trades(self):
+        return list(self.trades.values())
+
+    def add_trades(self, *trades):
+        self.trades.update((trade.trade_id, trade) for trade in trades)
+
+
+def _trade(trade_id, symbol, side, executed_time, price, quantity, entry_trade_ids=None, fee=None):
+    base, quote = symbol.split("/")
+    return types.SimpleNamespace(
+        trade_id=trade_id,
+        origin_order_id=f"order_{trade_id}",
+        associated_entry_ids=[f"order_{entry_trade_id}" for entry_trade_id in entry_trade_ids]
+        if entry_trade_ids else None,
+        status=trading_enums.OrderStatus.FILLED,
+        executed_time=executed_time,
+        canceled_time=0,
+        symbol=symbol,
+        currency=base,
+        market=quote,
+        side=side,
+        executed_price=decimal.Decimal(str(price)),
+        executed_quantity=decimal.Decimal(str(quantity)),
+        fee=fee,
+    )
+
+
+def _buy(trade_id, symbol, executed_time, price, quantity, entry_trade_ids=None, fee=None):
+    return _trade(trade_id, symbol, trading_enums.TradeOrderSide.BUY, executed_time, price, quantity,
+                  entry_trade_ids, fee)
+
+
+def _sell(trade_id, symbol, executed_time, price, quantity, entry_trade_ids=None, fee=None):
+    return _trade(trade_id, symbol, trading_enums.TradeOrderSide.SELL, executed_time, price, quantity,
+                  entry_trade_ids, fee)
+
+
+def _get_completed_pnl_history(exchange_manager, quote=None, symbol=None, since=None):
+    if not trading_api.get_trade_history(exchange_manager, quote=quote, symbol=symbol, since=since):
+        # get_completed_trades_pnl uses every trade when given no trade
+        return []
+    return trading_api.get_completed_pnl_history(exchange_manager, quote=quote, symbol=symbol, since=since)
+
+
+def _get_reference_pnl_history(exchange_manager, quote=None, symbol=None, since=None, scale=None):
+    # PnL history created from every completed trade PnL on each call, as before incremental aggregation
+    pnl_history = {}
+    use_detailed_history = not scale
+    scale_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
+        commons_constants.MINUTE_TO_SECONDS if scale else 1
+    symbol = symbol or None
+    quote = None if symbol else quote
+    for historical_pnl in _get_completed_pnl_history(exchange_manager, quote=quote, symbol=symbol, since=since):
+        try:
+            close_time = historical_pnl.get_close_time()
+            scaled_time = close_time - (close_time % scale_seconds)
+            pnl, _ = historical_pnl.get_profits()
+            pnl_a = historical_pnl.get_closed_close_value()
+            trades_count = len(historical_pnl.entries) + len(historical_pnl.closes)
+            if scaled_time not in pnl_history:
+                pnl_history[scaled_time] = {
+                    trading_model.PNL: pnl,
+                    trading_model.PNL_AMOUNT: pnl_a,
+                    trading_model.QUOTE: historical_pnl.entries[0].market,
+                    trading_model.TRADES_COUNT: trades_count,
+                    trading_model.DETAILS: None
+                }
+            else:
+                pnl_val = pnl_history[scaled_time]
+                pnl_val[trading_model.PNL] += pnl
+                pnl_val[trading_model.PNL_AMOUNT] += pnl_a
+                pnl_val[trading_model.TRADES_COUNT] += trades_count
+            if use_detailed_history:
+                pnl_history[scaled_time][trading_model.DETAILS] = \
+                    trading_model._PnlElement(EXCHANGE, historical_pnl).details
+        except trading_errors.IncompletePNLError:
+            pass
+    return sorted(
+        [
+            {
+                trading_model.EXIT_TIME: t,
+                trading_model.EXIT_DATE: trading_model._convert_timestamp(t),
+                trading_model.PNL: float(pnl[trading_model.PNL]),
+                trading_model.PNL_AMOUNT: float(pnl[trading_model.PNL_AMOUNT]),
+                trading_model.QUOTE: pnl[trading_model.QUOTE],
+                trading_model.TRADES_COUNT: pnl[trading_model.TRADES_COUNT],
+                trading_model.DETAILS: pnl[trading_model.DETAILS],
+            }
+            for t, pnl in pnl_history.items()
+            if not use_detailed_history
+            or (pnl[trading_model.PNL] or pnl[trading_model.DETAILS][trading_model.SPECIAL_FEES])
+        ],
+        key=lambda x: x[trading_model.EXIT_TIME]
+    )
+
+
+def _assert_same_history(exchange_manager):
+    for scale in SCALES:
+        for filters in FILTERS:
+            assert trading_model.get_pnl_history(scale=scale, **filters) == \
+                _get_reference_pnl_history(exchange_manager, scale=scale, **filters), (scale, filters)
+    for filters in FILTERS:
+        assert trading_model.get_pnl_history_symbols(**filters) == set(
+            historical_pnl.entries[0].symbol
+            for historical_pnl in _get_completed_pnl_history(exchange_manager, **filters)
+        ), filters
+
+
+@pytest.fixture
+def exchange_manager():
+    trades_manager = _TradesManager()
+    trades_manager.add_trades(
+        # BTC/USDT: 2 exits on the same entry
+        _buy("1", "BTC/USDT", START_TIME, 30000, 1),
+        _sell("2", "BTC/USDT", START_TIME + 10, 31000, 0.5, ["1"]),
+        _sell("3", "BTC/USDT", START_TIME + 2 * HOUR, 32000, 0.5, ["1"]),
+        # ETH/USDT: closed in the same hour as BTC/USDT, with special fees
+        _buy("4", "ETH/USDT", START_TIME + HOUR, 2000, 2),
+        _sell("5", "ETH/USDT", START_TIME + 2 * HOUR + 20, 1900, 2, ["4"],
+              fee={trading_enums.FeePropertyColumns.CURRENCY.value: "BNB",
+                   trading_enums.FeePropertyColumns.COST.value: decimal.Decimal("0.01")}),
+        # ETH/USDT: 0 PnL
+        _buy("6", "ETH/USDT", START_TIME + 3 * HOUR, 2000, 1),
+        _sell("7", "ETH/USDT", START_TIME + 3 * HOUR + 30, 2000, 1, ["6"]),
+        # ETH/BTC: on other days
+        _buy("8", "ETH/BTC", START_TIME + 48 * HOUR, 0.04, 3),
+        _sell("9", "ETH/BTC", START_TIME + 49 * HOUR, 0.05, 3, ["8"]),
+        # open entry
+        _buy("10", "BTC/USDT", START_TIME + 4 * HOUR, 29000, 1),
+    )
+    exchange_manager = mock.Mock(id="exchange_id", exchange_personal_data=mock.Mock(trades_manager=trades_manager))
+    exchange_manager.get_exchange_name = mock.Mock(return_value=EXCHANGE)
+    trading_model._PNL_HISTORY_BY_EXCHANGE_ID.clear()
+    with mock.patch.object(trading_model.configuration, "get_live_trading_enabled_exchange_managers",
+                           mock.Mock(return_value=[exchange_manager])):
+        yield exchange_manager
+    trading_model._PNL_HISTORY_BY_EXCHANGE_ID.clear()
+
+
+async def test_pnl_history(exchange_manager):
+    trades_manager = exchange_manager.exchange_personal_data.trades_manager
+    _assert_same_history(exchange_manager)
+    assert len(trading_model.get_pnl_history()) == 3
+    # keys read by the web interface PnL history
+    assert sorted(trading_model.get_pnl_history()[0][trading_model.DETAILS]) == sorted([
+        "en_t", "en_d", "en_p", "ex_p", "en_s", "ex_s", "en_a", "ex_a", "s", "f", "s_f", "b", "ex"
+    ])
+    assert [pnl[trading_model.TRADES_COUNT] for pnl in trading_model.get_pnl_history(scale="1h")] == [
+        # 0 PnL is not skipped in scaled history
+        3 + 2, 2, 2
+    ]
+
+    # new exit on the existing BTC/USDT entry: its PnL is updated in already created buckets
+    trades_manager.add_trades(_sell("11", "BTC/USDT", START_TIME + 5 * HOUR, 33000, 0.2, ["1"]))
+    _assert_same_history(exchange_manager)
+    assert trading_model.get_pnl_history(symbol="BTC/USDT")[-1][trading_model.EXIT_TIME] == START_TIME + 5 * HOUR
+
+    # exit of the open entry
+    trades_manager.add_trades(_sell("12", "BTC/USDT", START_TIME + 6 * HOUR, 30000, 1, ["10"]))
+    _assert_same_history(exchange_manager)
+
+    # cleared trades history
+    trades_manager.trades.clear()
+    trades_manager.add_trades(
+        _buy("13", "ETH/USDT", START_TIME + 7 * HOUR, 2000, 1),
+        _sell("14", "ETH/USDT", START_TIME + 8 * HOUR, 2200, 1, ["13"]),
+    )
+    _assert_same_history(exchange_manager)
+    assert len(trading_model.get_pnl_history()) == 1
+    trades_manager.trades.clear()
+    _assert_same_history(exchange_manager)
+    assert trading_model.get_pnl_history() == []
+
+
+async def test_get_pnl_history_page(exchange_manager):
+    for scale in SCALES:
+        for filters in FILTERS:
+            pnl_history = trading_model.get_pnl_history(scale=scale, **filters)
+            for limit in (1, 2, 10):
+                pages = []
+                cursor = None
+                while True:
+                    page = trading_model.get_pnl_history_page(scale=scale, cursor=cursor, limit=limit, **filters)
+                    pages.append(page[trading_model.PNLS])
+                    assert len(page[trading_model.PNLS]) <= limit
+                    cursor = page[trading_model.NEXT_CURSOR]
+                    if cursor is None:
+                        break
+                    assert cursor == page[trading_model.PNLS][-1][trading_model.EXIT_TIME]
+                    assert len(pages) <= len(pnl_history) + 1, "pagination is not advancing"
+                # each PnL is returned once
+                assert [pnl for page in pages for pnl in page] == pnl_history, (scale, filters, limit)
+    # cursor is exclusive
+    pnl_history = trading_model.get_pnl_history()
+    assert trading_model.get_pnl_history(cursor=pnl_history[0][trading_model.EXIT_TIME]) == pnl_history[1:]
+    assert trading_model.get_pnl_history(cursor=pnl_history[-1][trading_model.EXIT_TIME]) == []
+
+
+async def test_pnl_history_with_exits_of_several_entries(exchange_manager):
+    trades_manager = exchange_manager.exchange_personal_data.trades_manager
+    trades_manager.trades.clear()
+    trades_manager.add_trades(
+        _buy("e1", "BTC/USDT", START_TIME, 100, 1),
+        _buy("e3", "BTC/USDT", START_TIME + 10, 100, 1),
+        # exit of both entries
+        _sell("x1", "BTC/USDT", START_TIME + 20, 110, 0.5, ["e1", "e3"]),
+        _sell("x3", "BTC/USDT", START_TIME + 30, 130, 0.5, ["e3"]),
+    )
+    _assert_same_history(exchange_manager)
+    # new exit of e1 only: e3 PnL is still created from all its exits
+    trades_manager.add_trades(_sell("x2", "BTC/USDT", START_TIME + 40, 120, 0.5, ["e1"]))
+    _assert_same_history(exchange_manager)
+    pnl_history = trading_model.get_pnl_history(scale="1d")
+    trading_model._PNL_HISTORY_BY_EXCHANGE_ID.clear()
+    assert pnl_history == trading_model.get_pnl_history(scale="1d")
+    assert [pnl[trading_model.PNL] for pnl in pnl_history] == [35]
@@ -14,6 +14,7 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 
+import flask
 import flask_socketio
 
 import octobot_commons.pretty_printer as pretty_printer
@@ -27,6 +28,11 @@ import tentacles.Services.Interfaces.web_interface.websockets as websockets
 
 class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
 
+    def __init__(self, namespace=None):
+        super().__init__(namespace)
+        # time of the last candle sent to each client, by graph
+        self.last_candle_time_by_graph_by_client = {}
+
     @staticmethod
     def _get_profitability():
         profitability_digits = None
@@ -86,15 +92,23 @@ class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
     @websockets.websocket_with_login_required_when_activated
     def on_candle_graph_update(self, data):
         try:
+            symbol = models.get_value_from_dict_or_string(data["symbol"])
+            # the whole graph is sent once, only send updated candles to clients that already received candles
+            last_candle_time_by_graph = self.last_candle_time_by_graph_by_client.setdefault(flask.request.sid, {})
+            graph_key = (data["exchange_id"], symbol, data["time_frame"])
+            graph_data = models.get_currency_price_graph_update(data["exchange_id"],
+                                                                symbol,
+                                                                data["time_frame"],
+                                                                backtesting=False,
+                                                                minimal_candles=True,
+                                                                ignore_trades=True,
+                                                                ignore_orders=not models.get_display_orders(),
+                                                                since_time=last_candle_time_by_graph.get(graph_key))
+            if graph_data and graph_data.get("last_candle_time") is not None:
+                last_candle_time_by_graph[graph_key] = graph_data["last_candle_time"]
             flask_socketio.emit("candle_graph_update_data", {
                 "request": data,
-                "data": models.get_currency_price_graph_update(data["exchange_id"],
-                                                               models.get_value_from_dict_or_string(data["symbol"]),
-                                                               data["time_frame"],
-                                                               backtesting=False,
-                                                               minimal_candles=True,
-                                                               ignore_trades=True,
-                                                               ignore_orders=not models.get_display_orders())
+                "data": graph_data
             })
         except KeyError:
             flask_socketio.emit("error", "missing exchange manager")
@@ -104,6 +118,10 @@ class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
         super().on_connect()
         self.on_profitability()
 
+    def on_disconnect(self):
+        super().on_disconnect()
+        self.last_candle_time_by_graph_by_client.pop(flask.request.sid, None)
+
 
 notifier = DashboardNamespace('/dashboard')
 web_interface.register_notifier(web_interface.DASHBOARD_NOTIFICATION_KEY, notifier)
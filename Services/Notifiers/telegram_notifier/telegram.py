@@ -13,7 +13,11 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import time
+
 import octobot_commons.enums as commons_enums
+import octobot_services.enums as services_enums
 import octobot_services.notification as notification
 import octobot_services.notifier as notifier
 import tentacles.Services.Services_bases as Services_bases
@@ -24,10 +28,140 @@ class TelegramNotifier(notifier.AbstractNotifier):
     NOTIFICATION_TYPE_KEY = "telegram"
     USE_MAIN_LOOP = True
 
+    HIGH_PRIORITY = 0
+    MEDIUM_PRIORITY = 1
+    LOW_PRIORITY = 2
+    PRIORITY_BY_LEVEL = {
+        services_enums.NotificationLevel.CRITICAL: HIGH_PRIORITY,
+        services_enums.NotificationLevel.ERROR: HIGH_PRIORITY,
+        services_enums.NotificationLevel.WARNING: MEDIUM_PRIORITY,
+        services_enums.NotificationLevel.INFO: LOW_PRIORITY,
+        services_enums.NotificationLevel.SUCCESS: LOW_PRIORITY,
+    }
+    # low priority notifications received within this time are sent as a single digest message
+    DIGEST_WINDOW = 2
+    # minimum time between two messages sent in the same chat, telegram throttles faster messages
+    MIN_MESSAGES_INTERVAL = 1
+    MAX_MESSAGE_LENGTH = 4096
+    DIGEST_SEPARATOR = "\n\n"
+
+    def __init__(self, config):
+        super().__init__(config)
+        # (priority, sequence, enqueue time, notifications)
+        self.messages_queue = asyncio.PriorityQueue()
+        self.digest_notifications = []
+        self.digest_enqueue_time = None
+        self.last_message_time_by_chat = {}
+        self.queue_metrics = {
+            "sent_messages": 0,
+            "digested_notifications": 0,
+            "total_latency": 0,
+            "max_latency": 0,
+        }
+        self._queued_messages_count = 0
+        self._pending_notifications_count = 0
+        self._sender_task = None
+
     async def _handle_notification(self, notification: notification.Notification):
-        self.logger.debug(f"sending notification: {notification}")
-        text, use_markdown = self._get_message_text(notification)
-        await self._send_message(notification, text, use_markdown)
+        self.logger.debug(f"queuing notification: {notification}")
+        priority = self.PRIORITY_BY_LEVEL.get(notification.level, self.MEDIUM_PRIORITY)
+        if priority == self.LOW_PRIORITY:
+            if not self.digest_notifications:
+                self.digest_enqueue_time = time.time()
+                asyncio.get_event_loop().call_later(self.DIGEST_WINDOW, self._enqueue_digest)
+            self.digest_notifications.append(notification)
+            self._pending_notifications_count += 1
+        else:
+            self._enqueue(priority, time.time(), [notification])
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = asyncio.create_task(self._send_queued_messages())
+
+    def _enqueue_digest(self):
+        if self.digest_notifications:
+            self._enqueue(self.LOW_PRIORITY, self.digest_enqueue_time, self.digest_notifications)
+            self.digest_notifications = []
+
+    def _enqueue(self, priority, enqueue_time, notifications):
+        self._queued_messages_count += 1
+        if priority != self.LOW_PRIORITY:
+            # digested notifications are counted when received
+            self._pending_notifications_count += len(notifications)
+        self.messages_queue.put_nowait((priority, self._queued_messages_count, enqueue_time, notifications))
+
+    async def _send_queued_messages(self):
+        while True:
+            _, _, enqueue_time, notifications = await self.messages_queue.get()
+            try:
+                if len(notifications) == 1:
+                    text, use_markdown = self._get_message_text(notifications[0])
+                    await self._send_message(notifications[0], text, use_markdown)
+                else:
+                    await self._send_digest(notifications)
+                self._update_queue_metrics(enqueue_time, notifications)
+            except Exception as e:
+                self.logger.exception(e, True, f"Exception when sending telegram message: {e}")
+            finally:
+                self._pending_notifications_count -= len(notifications)
+                self.messages_queue.task_done()
+
+    async def _wait_for_chat_rate_limit(self):
+        chat_id = self.services[0].chat_id
+        last_message_time = self.last_message_time_by_chat.get(chat_id)
+        if last_message_time is not None:
+            delay = last_message_time + self.MIN_MESSAGES_INTERVAL - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.last_message_time_by_chat[chat_id] = time.time()
+
+    def _update_queue_metrics(self, enqueue_time, notifications):
+        latency = time.time() - enqueue_time
+        self.queue_metrics["sent_messages"] += 1
+        if len(notifications) > 1:
+            self.queue_metrics["digested_notifications"] += len(notifications)
+        self.queue_metrics["total_latency"] += latency
+        self.queue_metrics["max_latency"] = max(self.queue_metrics["max_latency"], latency)
+
+    def get_queue_metrics(self) -> dict:
+        """
+        :return: the current queue depth and sent messages latencies, in seconds
+        """
+        return {
+            "queue_depth": self.messages_queue.qsize() + (1 if self.digest_notifications else 0),
+            "pending_notifications": self._pending_notifications_count,
+            "sent_messages": self.queue_metrics["sent_messages"],
+            "digested_notifications": self.queue_metrics["digested_notifications"],
+            "average_latency": self.queue_metrics["total_latency"] / self.queue_metrics["sent_messages"]
+            if self.queue_metrics["sent_messages"] else 0,
+            "max_latency": self.queue_metrics["max_latency"],
+        }
+
+    async def _send_digest(self, notifications):
+        texts = []
+        use_markdown = True
+        for digested_notification in notifications:
+            text, notification_use_markdown = self._get_message_text(digested_notification)
+            texts.append(text)
+            use_markdown = use_markdown and notification_use_markdown
+        sent_message = None
+        for content in self._get_digest_messages_contents(texts):
+            await self._wait_for_chat_rate_limit()
+            sent_message = await self.services[0].send_message(content, markdown=use_markdown)
+        for digested_notification in notifications:
+            # linked notifications reply to the digest
+            digested_notification.metadata[self.NOTIFICATION_TYPE_KEY] = sent_message
+
+    @classmethod
+    def _get_digest_messages_contents(cls, texts):
+        contents = []
+        content = ""
+        for text in texts:
+            if content and len(content) + len(cls.DIGEST_SEPARATOR) + len(text) > cls.MAX_MESSAGE_LENGTH:
+                contents.append(content)
+                content = ""
+            content = f"{content}{cls.DIGEST_SEPARATOR}{text}" if content else text
+        if content:
+            contents.append(content)
+        return contents
 
     async def _send_message(self, notification, text, use_markdown):
         try:
@@ -36,12 +170,14 @@ class TelegramNotifier(notifier.AbstractNotifier):
                    self.NOTIFICATION_TYPE_KEY in notification.linked_notification.metadata else None
         except (KeyError, AttributeError):
             previous_message_id = None
+        await self._wait_for_chat_rate_limit()
         sent_message = await self.services[0].send_message(text,
                                                            markdown=use_markdown,
                                                            reply_to_message_id=previous_message_id)
         if sent_message is None and previous_message_id is not None:
             # failed to reply, try regular message
             self.logger.warning(f"Failed to reply to message with id {previous_message_id}, sending regular message.")
+            await self._wait_for_chat_rate_limit()
             sent_message = await self.services[0].send_message(text,
                                                                markdown=use_markdown,
                                                                reply_to_message_id=None)
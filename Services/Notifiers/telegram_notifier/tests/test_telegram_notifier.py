@@ -0,0 +1,112 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+
+import mock
+import pytest
+
+import octobot_commons.enums as commons_enums
+import octobot_services.enums as services_enums
+import octobot_services.notifier as notifier
+import tentacles.Services.Notifiers.telegram_notifier.telegram as telegram
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SEND_MESSAGE_DURATION = 0.01
+
+
+def _notification(text, level, linked_notification=None):
+    return mock.Mock(
+        title=None, text=text, markdown_text=None, markdown_format=commons_enums.MarkdownFormat.NONE,
+        level=level, linked_notification=linked_notification, metadata={}
+    )
+
+
+@pytest.fixture
+def telegram_notifier():
+    sent_messages = []
+
+    async def send_message(content, markdown=False, reply_to_message_id=None):
+        await asyncio.sleep(SEND_MESSAGE_DURATION)
+        sent_messages.append(content)
+        return mock.Mock(message_id=len(sent_messages))
+
+    with mock.patch.object(notifier.AbstractNotifier, "__init__", mock.Mock(return_value=None)), \
+         mock.patch.object(telegram.TelegramNotifier, "DIGEST_WINDOW", 0.1), \
+         mock.patch.object(telegram.TelegramNotifier, "MIN_MESSAGES_INTERVAL", 0.05):
+        telegram_notifier = telegram.TelegramNotifier({})
+        telegram_notifier.logger = mock.Mock()
+        telegram_notifier.services = [mock.Mock(chat_id="1", send_message=mock.AsyncMock(side_effect=send_message))]
+        telegram_notifier.sent_messages = sent_messages
+        yield telegram_notifier
+        telegram_notifier._sender_task.cancel()
+
+
+async def test_priorities_and_digest(telegram_notifier):
+    info_notifications = [
+        _notification(f"order {i} filled", services_enums.NotificationLevel.INFO) for i in range(20)
+    ]
+    for info_notification in info_notifications[:10]:
+        await telegram_notifier._handle_notification(info_notification)
+    await telegram_notifier._handle_notification(_notification("error", services_enums.NotificationLevel.ERROR))
+    await telegram_notifier._handle_notification(_notification("warning", services_enums.NotificationLevel.WARNING))
+    for info_notification in info_notifications[10:]:
+        await telegram_notifier._handle_notification(info_notification)
+    assert telegram_notifier.get_queue_metrics()["pending_notifications"] == 22
+    await asyncio.sleep(0.3)
+    # higher priorities first, info notifications are sent in a single message
+    assert telegram_notifier.sent_messages == [
+        "error",
+        "warning",
+        "\n\n".join(info_notification.text for info_notification in info_notifications),
+    ]
+    # linked notifications reply to the digest
+    assert all(
+        info_notification.metadata[telegram.TelegramNotifier.NOTIFICATION_TYPE_KEY].message_id == 3
+        for info_notification in info_notifications
+    )
+    metrics = telegram_notifier.get_queue_metrics()
+    assert metrics["queue_depth"] == metrics["pending_notifications"] == 0
+    assert metrics["sent_messages"] == 3
+    assert metrics["digested_notifications"] == 20
+    assert 0 < metrics["average_latency"] <= metrics["max_latency"] < 0.3
+
+    # a single notification is not a digest and replies to its linked notification
+    linked_notification = _notification("order 1 cancelled", services_enums.NotificationLevel.INFO,
+                                        linked_notification=info_notifications[1])
+    await telegram_notifier._handle_notification(linked_notification)
+    await asyncio.sleep(0.2)
+    telegram_notifier.services[0].send_message.assert_awaited_with(
+        "order 1 cancelled", markdown=False, reply_to_message_id=3
+    )
+
+
+async def test_chat_rate_limit(telegram_notifier):
+    for i in range(4):
+        await telegram_notifier._handle_notification(_notification(f"{i}", services_enums.NotificationLevel.ERROR))
+    await asyncio.sleep(0.075)
+    # first message is sent right away, next ones after MIN_MESSAGES_INTERVAL
+    assert telegram_notifier.sent_messages == ["0", "1"]
+    await asyncio.sleep(0.15)
+    assert telegram_notifier.sent_messages == ["0", "1", "2", "3"]
+
+
+async def test_get_digest_messages_contents():
+    with mock.patch.object(telegram.TelegramNotifier, "MAX_MESSAGE_LENGTH", 10):
+        assert telegram.TelegramNotifier._get_digest_messages_contents(
+            ["123", "456", "7890", "1234567890", "1"]
+        ) == ["123\n\n456", "7890", "1234567890", "1"]
@@ -0,0 +1,122 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+
+import flask
+import mock
+import pytest
+
+import octobot_commons.logging as logging
+import tentacles.Services.Services_bases.webhook_service.webhook as webhook
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+FEED_NAME = "feed"
+CALLBACK_DURATION = 0.05
+
+
+def _create_service(received_data, batch_callback=None):
+    service = webhook.WebHookService()
+    # set by ServiceFactory when creating services
+    service.logger = logging.get_logger(service.get_name())
+
+    async def callback(data):
+        await asyncio.sleep(CALLBACK_DURATION)
+        received_data.append(data)
+
+    service.subscribe_feed(FEED_NAME, callback, lambda data: "TOKEN=1" in data, batch_callback=batch_callback)
+    app = flask.Flask(__name__)
+    service._register_webhook_routes(app)
+    return service, app.test_client()
+
+
+def _post(client, data, webhook_name=FEED_NAME):
+    return client.post(f"/webhook/{webhook_name}", data=data).status_code
+
+
+async def test_queued_webhook_calls():
+    received_data = []
+    service, client = _create_service(received_data)
+    service._start_webhook_queue_consumer()
+    try:
+        start_time = time.time()
+        for i in range(3):
+            assert _post(client, f"signal {i} TOKEN=1") == 200
+        # acknowledged without waiting for callbacks
+        assert time.time() - start_time < CALLBACK_DURATION
+        assert received_data == []
+        # invalid calls are not queued
+        assert _post(client, "signal TOKEN=2") == 400
+        assert _post(client, "signal TOKEN=1", webhook_name="other") == 400
+        await asyncio.sleep(CALLBACK_DURATION * 4)
+        assert received_data == ["signal 0 TOKEN=1", "signal 1 TOKEN=1", "signal 2 TOKEN=1"]
+        metrics = service.get_webhook_queue_metrics()
+        assert metrics["queue_depth"] == metrics["overflowed_calls"] == 0
+        assert metrics["received_calls"] == metrics["processed_calls"] == 3
+        assert CALLBACK_DURATION <= metrics["average_latency"] <= metrics["max_latency"]
+    finally:
+        await service.stop()
+
+
+async def test_webhook_queue_overflow():
+    received_data = []
+    with mock.patch.object(webhook.WebHookService, "WEBHOOK_QUEUE_SIZE", 2):
+        service, client = _create_service(received_data)
+    assert _post(client, "signal 0 TOKEN=1") == 200
+    assert _post(client, "signal 1 TOKEN=1") == 200
+    assert _post(client, "signal 2 TOKEN=1") == 503
+    metrics = service.get_webhook_queue_metrics()
+    assert metrics["queue_depth"] == metrics["received_calls"] == 2
+    assert metrics["overflowed_calls"] == 1
+    # calls received before starting are processed
+    service._start_webhook_queue_consumer()
+    try:
+        await asyncio.sleep(CALLBACK_DURATION * 3)
+        assert received_data == ["signal 0 TOKEN=1", "signal 1 TOKEN=1"]
+    finally:
+        await service.stop()
+
+
+async def test_batched_webhook_calls():
+    batch_callback = mock.AsyncMock()
+    service, client = _create_service([], batch_callback=batch_callback)
+    for i in range(3):
+        assert _post(client, f"signal {i} TOKEN=1") == 200
+    service._start_webhook_queue_consumer()
+    try:
+        await asyncio.sleep(0.01)
+        batch_callback.assert_awaited_once_with(["signal 0 TOKEN=1", "signal 1 TOKEN=1", "signal 2 TOKEN=1"])
+        assert service.get_webhook_queue_metrics()["processed_batches"] == 1
+    finally:
+        await service.stop()
+
+
+async def test_stop_with_pending_webhook_calls():
+    received_data = []
+    service, client = _create_service(received_data)
+    for i in range(3):
+        assert _post(client, f"signal {i} TOKEN=1") == 200
+    service._start_webhook_queue_consumer()
+    await asyncio.sleep(CALLBACK_DURATION * 1.5)
+    consumer_task = service._webhook_queue_consumer_task
+    with mock.patch.object(service.logger, "warning", mock.Mock()) as warning_mock:
+        await service.stop()
+        assert consumer_task.done()
+        assert received_data == ["signal 0 TOKEN=1"]
+        warning_mock.assert_called_once()
+        assert "dropped 2 received webhook calls" in warning_mock.call_args[0][0]
@@ -16,6 +16,7 @@
 import asyncio
 import logging
 import os
+import queue
 import time
 import flask
 import threading
@@ -37,6 +38,10 @@ import octobot.community.errors as community_errors
 class WebHookService(services.AbstractService):
     CONNECTION_TIMEOUT = 8  # can take up to 5s on slow setups
     LOGGERS = ["pyngrok.ngrok", "werkzeug"]
+    # received webhook calls waiting to be processed by service feeds, calls are rejected when full
+    WEBHOOK_QUEUE_SIZE = 1000
+    # maximum number of calls processed at once, calls are grouped by webhook name
+    WEBHOOK_BATCH_MAX_SIZE = 50
 
     def get_fields_description(self):
         if self.use_web_interface_for_webhook:
@@ -77,8 +82,23 @@ class WebHookService(services.AbstractService):
         self.ngrok_domain = None
 
         self.service_feed_webhooks = {}
+        self.service_feed_batch_webhooks = {}
         self.service_feed_auth_callbacks = {}
 
+        # (webhook name, data, received time)
+        self.webhook_queue = queue.Queue(maxsize=self.WEBHOOK_QUEUE_SIZE)
+        self.webhook_queue_metrics = {
+            "received_calls": 0,
+            "overflowed_calls": 0,
+            "processed_calls": 0,
+            "processed_batches": 0,
+            "total_latency": 0,
+            "max_latency": 0,
+        }
+        self._webhook_queue_loop = None
+        self._webhook_queue_event = None
+        self._webhook_queue_consumer_task = None
+
         self.webhook_app = None
         self.webhook_host = None
         self.webhook_port = None
@@ -163,16 +183,20 @@ class WebHookService(services.AbstractService):
         """
         return ngrok.connect(port, protocol, domain=domain)
 
-    def subscribe_feed(self, service_feed_name, service_feed_callback, auth_callback) -> None:
+    def subscribe_feed(self, service_feed_name, service_feed_callback, auth_callback, batch_callback=None) -> None:
         """
         Subscribe a service feed to the webhook
         :param service_feed_name: the service feed name
         :param service_feed_callback: the service feed callback reference
+        :param batch_callback: optional async callback called with every queued data of this feed at once instead
+        of calling service_feed_callback for each queued data
         :return: the service feed webhook url
         """
         if service_feed_name not in self.service_feed_webhooks:
             self.service_feed_webhooks[service_feed_name] = service_feed_callback
             self.service_feed_auth_callbacks[service_feed_name] = auth_callback
+            if batch_callback is not None:
+                self.service_feed_batch_webhooks[service_feed_name] = batch_callback
             return
         raise KeyError(f"Service feed has already subscribed to a webhook : {service_feed_name}")
 
@@ -212,11 +236,98 @@ class WebHookService(services.AbstractService):
     def _flask_webhook_call(self, webhook_name):
         if flask.request.method == 'POST':
             data = flask.request.get_data(as_text=True)
-            if self._default_webhook_call(webhook_name, data):
+            if not self.is_valid_webhook_call(webhook_name, data):
+                return 'invalid or missing input parameters', 400
+            # processed later in the bot loop: don't wait for service feeds
+            if self._enqueue_webhook_call(webhook_name, data):
                 return '', 200
-            return 'invalid or missing input parameters', 400
+            return 'too many webhook calls', 503
         flask.abort(405)
 
+    def _enqueue_webhook_call(self, webhook_name: str, data: str) -> bool:
+        try:
+            self.webhook_queue.put_nowait((webhook_name, data, time.time()))
+        except queue.Full:
+            self.webhook_queue_metrics["overflowed_calls"] += 1
+            self.logger.error(f"Ignored {webhook_name} webhook call: webhook queue is full ({data})")
+            return False
+        self.webhook_queue_metrics["received_calls"] += 1
+        if self._webhook_queue_loop is not None:
+            self._webhook_queue_loop.call_soon_threadsafe(self._webhook_queue_event.set)
+        return True
+
+    def _start_webhook_queue_consumer(self):
+        if self._webhook_queue_consumer_task is None:
+            self._webhook_queue_loop = asyncio.get_event_loop()
+            self._webhook_queue_event = asyncio.Event()
+            self._webhook_queue_consumer_task = asyncio.create_task(self._consume_webhook_queue())
+            # process calls received before starting
+            self._webhook_queue_event.set()
+
+    async def _consume_webhook_queue(self):
+        while True:
+            await self._webhook_queue_event.wait()
+            # cleared before getting calls: calls received from now on will set it again
+            self._webhook_queue_event.clear()
+            while calls_by_webhook_name := self._get_webhook_calls_batch():
+                await asyncio.gather(*(
+                    self._process_webhook_calls(webhook_name, calls)
+                    for webhook_name, calls in calls_by_webhook_name.items()
+                ))
+                self.webhook_queue_metrics["processed_batches"] += 1
+
+    def _get_webhook_calls_batch(self) -> dict:
+        calls_by_webhook_name = {}
+        for _ in range(self.WEBHOOK_BATCH_MAX_SIZE):
+            try:
+                webhook_name, data, received_time = self.webhook_queue.get_nowait()
+            except queue.Empty:
+                break
+            calls_by_webhook_name.setdefault(webhook_name, []).append((data, received_time))
+        return calls_by_webhook_name
+
+    async def _process_webhook_calls(self, webhook_name: str, calls: list):
+        if webhook_name in self.service_feed_batch_webhooks:
+            try:
+                await self.service_feed_batch_webhooks[webhook_name]([data for data, _ in calls])
+            except Exception as err:
+                self.logger.exception(err, True, f"Error when processing {webhook_name} webhook calls: {err}")
+            for _, received_time in calls:
+                self._update_processed_call_metrics(received_time)
+            return
+        callback = self.service_feed_webhooks[webhook_name]
+        for data, received_time in calls:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(data)
+                else:
+                    # synchronous callbacks can wait for the bot loop: call them from another thread
+                    await asyncio.get_event_loop().run_in_executor(None, callback, data)
+            except Exception as err:
+                self.logger.exception(err, True, f"Error when processing {webhook_name} webhook call: {err}")
+            self._update_processed_call_metrics(received_time)
+
+    def _update_processed_call_metrics(self, received_time):
+        latency = time.time() - received_time
+        self.webhook_queue_metrics["processed_calls"] += 1
+        self.webhook_queue_metrics["total_latency"] += latency
+        self.webhook_queue_metrics["max_latency"] = max(self.webhook_queue_metrics["max_latency"], latency)
+
+    def get_webhook_queue_metrics(self) -> dict:
+        """
+        :return: the webhook queue depth, calls counts and latencies between reception and processing, in seconds
+        """
+        processed_calls = self.webhook_queue_metrics["processed_calls"]
+        return {
+            "queue_depth": self.webhook_queue.qsize(),
+            "received_calls": self.webhook_queue_metrics["received_calls"],
+            "overflowed_calls": self.webhook_queue_metrics["overflowed_calls"],
+            "processed_calls": processed_calls,
+            "processed_batches": self.webhook_queue_metrics["processed_batches"],
+            "average_latency": self.webhook_queue_metrics["total_latency"] / processed_calls if processed_calls else 0,
+            "max_latency": self.webhook_queue_metrics["max_latency"],
+        }
+
     def _community_webhook_call_factory(self, service_name: str):
 
         async def _community_webhook_callback(data: dict) -> bool:
@@ -226,12 +337,6 @@ class WebHookService(services.AbstractService):
 
         return _community_webhook_callback
 
-    def _default_webhook_call(self, webhook_name: str, data: str) -> bool:
-        if self.is_valid_webhook_call(webhook_name, data):
-            self.service_feed_webhooks[webhook_name](data)
-            return True
-        return False
-
     async def _async_default_webhook_call(self, webhook_name: str, data: str) -> bool:
         if self.is_valid_webhook_call(webhook_name, data):
             await self.service_feed_webhooks[webhook_name](data)
@@ -369,6 +474,7 @@ class WebHookService(services.AbstractService):
 
     async def start_webhooks(self) -> bool:
         if self.use_web_interface_for_webhook:
+            self._start_webhook_queue_consumer()
             return await self._register_on_web_interface()
         if self.is_using_cloud_webhooks():
             try:
@@ -379,6 +485,7 @@ class WebHookService(services.AbstractService):
                     f"is required to use OctoBot {'email' if self.use_octobot_cloud_email_webhook else 'webhook' } "
                     f"alerts for TradingView."
                 )
+        self._start_webhook_queue_consumer()
         return await self._start_isolated_server()
 
     def _is_healthy(self):
@@ -398,6 +505,18 @@ class WebHookService(services.AbstractService):
         return f"Webhook configured on {webhook_endpoint}", self._is_healthy()
 
     async def stop(self):
+        if self._webhook_queue_consumer_task is not None:
+            self._webhook_queue_consumer_task.cancel()
+            try:
+                await self._webhook_queue_consumer_task
+            except asyncio.CancelledError:
+                pass
+            self._webhook_queue_consumer_task = None
+        # calls are acknowledged when received: log those that will never be processed
+        dropped_calls = self.webhook_queue_metrics["received_calls"] - self.webhook_queue_metrics["processed_calls"]
+        if dropped_calls:
+            self.logger.warning(f"Stopping webhook service: dropped {dropped_calls} received webhook calls that "
+                                f"were not processed yet")
         if not self.use_web_interface_for_webhook and self.connected:
             ngrok.kill()
             if self.webhook_server:
@@ -14,6 +14,10 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import asyncio
+import collections
+import copy
+import functools
+import random
 import time
 import decimal
 import typing
@@ -30,37 +34,132 @@ import octobot_trading.constants as constants
 import octobot_trading.enums as trading_enums
 
 
+class _RetryBudget:
+    """
+    Token bucket limiting retries of an endpoint: each retry takes a token and tokens are refilled over time.
+    Prevents retries from amplifying rate limit errors when many requests fail at the same time.
+    """
+
+    def __init__(self, size, refill_per_second):
+        self.size = size
+        self.refill_per_second = refill_per_second
+        self.tokens = size
+        self.last_refill_time = time.monotonic()
+
+    def try_consume(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.size, self.tokens + (now - self.last_refill_time) * self.refill_per_second)
+        self.last_refill_time = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+# retry budgets are shared by every kucoin exchange of the process
+_RETRY_BUDGET_BY_ENDPOINT = {}
+# in-flight coalesced requests by instance, request name and arguments
+_PENDING_REQUESTS = {}
+REQUESTS_METRICS = collections.Counter()
+
+
+def _get_retry_budget(endpoint):
+    try:
+        return _RETRY_BUDGET_BY_ENDPOINT[endpoint]
+    except KeyError:
+        budget = _RETRY_BUDGET_BY_ENDPOINT[endpoint] = _RetryBudget(
+            Kucoin.RETRY_BUDGET_SIZE, Kucoin.RETRY_BUDGET_REFILL_PER_SECOND
+        )
+        return budget
+
+
+def _get_retry_delay(attempt):
+    # exponential backoff with full jitter to spread retries of concurrent requests
+    return random.uniform(0, min(Kucoin.RETRY_MAX_DELAY, Kucoin.RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _get_last_http_response(element):
+    # element is either a Kucoin exchange, a KucoinConnector or a ccxt client
+    connector = getattr(element, "connector", element)
+    client = getattr(connector, "client", connector)
+    return getattr(client, "last_http_response", None)
+
+
 def _kucoin_retrier(f):
+    @functools.wraps(f)
     async def kucoin_retrier_wrapper(*args, **kwargs):
         last_error = None
+        endpoint = f.__name__
         for i in range(0, Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT):
             try:
                 return await f(*args, **kwargs)
             except (octobot_trading.errors.FailedRequest, ccxt.ExchangeError) as err:
                 last_error = err
-                rest_exchange = args[0]  # self
-                if (rest_exchange.connector is not None) and \
-                    rest_exchange.connector.client.last_http_response and \
-                    Kucoin.INSTANT_RETRY_ERROR_CODE in rest_exchange.connector.client.last_http_response:
-                    # should retry instantly, error on kucoin side
+                last_http_response = _get_last_http_response(args[0])
+                if last_http_response and Kucoin.INSTANT_RETRY_ERROR_CODE in last_http_response:
+                    # should retry, error on kucoin side
                     # see https://github.com/Drakkar-Software/OctoBot/issues/2000
+                    if i == Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT - 1:
+                        break
+                    if not _get_retry_budget(endpoint).try_consume():
+                        REQUESTS_METRICS[f"{endpoint}_exhausted_retry_budget"] += 1
+                        logging.get_logger(Kucoin.get_name()).debug(
+                            f"{Kucoin.INSTANT_RETRY_ERROR_CODE} error on {endpoint}(args={args[1:]} "
+                            f"kwargs={kwargs}) request, not retrying: {endpoint} retry budget is exhausted."
+                        )
+                        break
+                    delay = _get_retry_delay(i)
+                    REQUESTS_METRICS[f"{endpoint}_retries"] += 1
                     logging.get_logger(Kucoin.get_name()).debug(
-                        f"{Kucoin.INSTANT_RETRY_ERROR_CODE} error on {f.__name__}(args={args[1:]} kwargs={kwargs}) "
-                        f"request, retrying now. Attempt {i+1} / {Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT}, "
+                        f"{Kucoin.INSTANT_RETRY_ERROR_CODE} error on {endpoint}(args={args[1:]} kwargs={kwargs}) "
+                        f"request, retrying in {delay:.3f}s. "
+                        f"Attempt {i+1} / {Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT}, "
                         f"error: {err} ({last_error.__class__.__name__})."
                     )
+                    await asyncio.sleep(delay)
                 else:
                     raise
         last_error = last_error or RuntimeError("Unknown Kucoin error")  # to be able to "raise from" in next line
         raise octobot_trading.errors.FailedRequest(
             f"Failed Kucoin request after {Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT} "
-            f"retries on {f.__name__}(args={args[1:]} kwargs={kwargs}) due "
+            f"retries on {endpoint}(args={args[1:]} kwargs={kwargs}) due "
             f"to {Kucoin.INSTANT_RETRY_ERROR_CODE} error code. "
             f"Last error: {last_error} ({last_error.__class__.__name__})"
         ) from last_error
     return kucoin_retrier_wrapper
 
 
+def _kucoin_coalesced_request(f):
+    """
+    Identical concurrent calls share the result of the first one instead of sending the same request again.
+    Only use on read requests.
+    """
+    @functools.wraps(f)
+    async def kucoin_coalesced_request_wrapper(self, *args, **kwargs):
+        key = (id(self), f.__name__, repr(args), repr(sorted(kwargs.items())))
+        try:
+            pending_request = _PENDING_REQUESTS[key]
+        except KeyError:
+            pending_request = _PENDING_REQUESTS[key] = asyncio.ensure_future(f(self, *args, **kwargs))
+            # forget the request when done, even when every caller has been cancelled before
+            pending_request.add_done_callback(functools.partial(_forget_pending_request, key))
+            # shield: cancelling the first call should not cancel the request shared with waiting calls
+            return await asyncio.shield(pending_request)
+        REQUESTS_METRICS[f"{f.__name__}_coalesced_calls"] += 1
+        # shield: cancelling a waiting call should not cancel the shared request
+        # copy: waiters can't alter each other's result
+        return copy.deepcopy(await asyncio.shield(pending_request))
+    return kucoin_coalesced_request_wrapper
+
+
+def _forget_pending_request(key, pending_request):
+    if _PENDING_REQUESTS.get(key) is pending_request:
+        _PENDING_REQUESTS.pop(key)
+    if not pending_request.cancelled():
+        # retrieve the exception: it might not be awaited when every caller has been cancelled
+        pending_request.exception()
+
+
 class KucoinConnector(ccxt_connector.CCXTConnector):
 
     @_kucoin_retrier
@@ -81,6 +180,12 @@ class Kucoin(exchanges.RestExchange):
 
     FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT = 5
     INSTANT_RETRY_ERROR_CODE = "429000"
+    # retry delays: random between 0 and min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) seconds
+    RETRY_BASE_DELAY = 0.05
+    RETRY_MAX_DELAY = 2
+    # retries of each endpoint are limited to RETRY_BUDGET_SIZE, refilled by RETRY_BUDGET_REFILL_PER_SECOND
+    RETRY_BUDGET_SIZE = 20
+    RETRY_BUDGET_REFILL_PER_SECOND = 1
     FUTURES_CCXT_CLASS_NAME = "kucoinfutures"
     MAX_INCREASED_POSITION_QUANTITY_MULTIPLIER = decimal.Decimal("0.95")
 
@@ -134,6 +239,13 @@ class Kucoin(exchanges.RestExchange):
     def get_name(cls):
         return 'kucoin'
 
+    @staticmethod
+    def get_requests_metrics() -> dict:
+        """
+        :return: the retries, exhausted retry budgets and coalesced calls count by request
+        """
+        return dict(REQUESTS_METRICS)
+
     def get_rest_name(self):
         if self.exchange_manager.is_future:
             return self.FUTURES_CCXT_CLASS_NAME
@@ -291,6 +403,7 @@ class Kucoin(exchanges.RestExchange):
     async def _update_balance(self, balance, currency, **kwargs):
         balance.update(await super().get_balance(code=currency, **kwargs))
 
+    @_kucoin_coalesced_request
     @_kucoin_retrier
     async def get_balance(self, **kwargs: dict):
         balance = {}
@@ -325,6 +438,7 @@ class Kucoin(exchanges.RestExchange):
         # leverage is set via orders on kucoin
         return None
 
+    @_kucoin_coalesced_request
     @_kucoin_retrier
     async def get_open_orders(self, symbol=None, since=None, limit=None, **kwargs) -> list:
         if limit is None:
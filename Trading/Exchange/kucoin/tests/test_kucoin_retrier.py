@@ -0,0 +1,182 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+
+import ccxt
+import mock
+import pytest
+
+import octobot_trading.errors
+from ...kucoin import kucoin_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+REQUEST_LATENCY = 0.05
+
+
+class FakeExchange:
+    """
+    Fails its first failures_count requests with a kucoin 429000 error
+    """
+
+    def __init__(self, failures_count=0):
+        self.failures_count = failures_count
+        self.connector = mock.Mock(client=mock.Mock(last_http_response=None))
+        self.requests = []
+
+    @kucoin_exchange._kucoin_coalesced_request
+    @kucoin_exchange._kucoin_retrier
+    async def get_balance(self, **kwargs):
+        return await self._request("get_balance", kwargs)
+
+    @kucoin_exchange._kucoin_coalesced_request
+    @kucoin_exchange._kucoin_retrier
+    async def get_open_orders(self, symbol=None, **kwargs):
+        return await self._request("get_open_orders", symbol)
+
+    async def _request(self, name, arg):
+        self.requests.append((name, arg))
+        await asyncio.sleep(REQUEST_LATENCY)
+        if len(self.requests) <= self.failures_count:
+            self.connector.client.last_http_response = \
+                f'{{"code":"{kucoin_exchange.Kucoin.INSTANT_RETRY_ERROR_CODE}","msg":"Too Many Requests"}}'
+            raise ccxt.ExchangeError("kucoin Too Many Requests")
+        self.connector.client.last_http_response = '{"code":"200000"}'
+        return {"name": name, "arg": arg, "values": [1, 2]}
+
+
+@pytest.fixture(autouse=True)
+def reset_retrier_state():
+    kucoin_exchange._RETRY_BUDGET_BY_ENDPOINT.clear()
+    kucoin_exchange.REQUESTS_METRICS.clear()
+    with mock.patch.object(kucoin_exchange.Kucoin, "RETRY_BASE_DELAY", 0.001):
+        yield
+
+
+async def test_retry_with_backoff():
+    exchange = FakeExchange(failures_count=2)
+    with mock.patch.object(asyncio, "sleep", mock.AsyncMock(wraps=asyncio.sleep)) as sleep_mock:
+        assert (await exchange.get_balance())["name"] == "get_balance"
+    assert len(exchange.requests) == 3
+    retry_delays = [call.args[0] for call in sleep_mock.mock_calls if call.args[0] != REQUEST_LATENCY]
+    assert len(retry_delays) == 2
+    assert 0 <= retry_delays[0] <= 0.001
+    assert 0 <= retry_delays[1] <= 0.002
+    assert kucoin_exchange.Kucoin.get_requests_metrics() == {"get_balance_retries": 2}
+
+
+async def test_retry_failure():
+    exchange = FakeExchange(failures_count=10)
+    with pytest.raises(octobot_trading.errors.FailedRequest):
+        await exchange.get_balance()
+    assert len(exchange.requests) == kucoin_exchange.Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT
+    assert kucoin_exchange.Kucoin.get_requests_metrics() == {
+        "get_balance_retries": kucoin_exchange.Kucoin.FAKE_DDOS_ERROR_INSTANT_RETRY_COUNT - 1
+    }
+
+    # not a 429000 error: no retry
+    exchange = FakeExchange()
+    exchange._request = mock.AsyncMock(side_effect=ccxt.ExchangeError("kucoin error"))
+    with pytest.raises(ccxt.ExchangeError):
+        await exchange.get_balance()
+    exchange._request.assert_awaited_once()
+
+
+async def test_exhausted_retry_budget():
+    with mock.patch.object(kucoin_exchange.Kucoin, "RETRY_BUDGET_SIZE", 3), \
+         mock.patch.object(kucoin_exchange.Kucoin, "RETRY_BUDGET_REFILL_PER_SECOND", 0):
+        # the budget is shared by exchanges
+        exchange = FakeExchange(failures_count=2)
+        assert await exchange.get_balance()
+        exchange = FakeExchange(failures_count=10)
+        with pytest.raises(octobot_trading.errors.FailedRequest):
+            await exchange.get_balance()
+        # 1 retry left in budget
+        assert len(exchange.requests) == 2
+        # other endpoints have their own budget
+        exchange = FakeExchange(failures_count=3)
+        assert await exchange.get_open_orders("BTC/USDT")
+    assert kucoin_exchange.Kucoin.get_requests_metrics() == {
+        "get_balance_retries": 3,
+        "get_balance_exhausted_retry_budget": 1,
+        "get_open_orders_retries": 3,
+    }
+
+
+async def test_coalesced_requests():
+    exchange = FakeExchange()
+    results = await asyncio.gather(
+        exchange.get_balance(),
+        exchange.get_balance(),
+        exchange.get_open_orders("BTC/USDT"),
+        exchange.get_open_orders("BTC/USDT"),
+        exchange.get_open_orders("ETH/USDT"),
+        exchange.get_open_orders(symbol="ETH/USDT"),
+    )
+    assert exchange.requests == [
+        ("get_balance", {}),
+        ("get_open_orders", "BTC/USDT"),
+        ("get_open_orders", "ETH/USDT"),
+        ("get_open_orders", "ETH/USDT"),
+    ]
+    assert results[0] == results[1]
+    # waiters get their own copy
+    assert results[0] is not results[1]
+    assert results[0]["values"] is not results[1]["values"]
+    assert results[2] == results[3]
+    assert kucoin_exchange.Kucoin.get_requests_metrics() == {
+        "get_balance_coalesced_calls": 1,
+        "get_open_orders_coalesced_calls": 1,
+    }
+
+    # completed requests are not coalesced
+    await exchange.get_balance()
+    assert len(exchange.requests) == 5
+
+
+async def test_coalesced_requests_error():
+    exchange = FakeExchange()
+    exchange._request = mock.AsyncMock(side_effect=ccxt.ExchangeError("kucoin error"))
+    results = await asyncio.gather(exchange.get_balance(), exchange.get_balance(), return_exceptions=True)
+    assert all(isinstance(result, ccxt.ExchangeError) for result in results)
+    exchange._request.assert_awaited_once()
+    assert kucoin_exchange._PENDING_REQUESTS == {}
+
+
+async def test_coalesced_requests_first_call_cancelled():
+    exchange = FakeExchange()
+    first_call = asyncio.create_task(exchange.get_balance())
+    await asyncio.sleep(0)
+    waiting_call = asyncio.create_task(exchange.get_balance())
+    await asyncio.sleep(0)
+    first_call.cancel()
+    # the shared request is not cancelled: waiting calls get its result
+    assert await waiting_call == {"name": "get_balance", "arg": {}, "values": [1, 2]}
+    with pytest.raises(asyncio.CancelledError):
+        await first_call
+    assert exchange.requests == [("get_balance", {})]
+    assert kucoin_exchange._PENDING_REQUESTS == {}
+
+    # request of a cancelled call without waiting calls completes and is forgotten
+    cancelled_call = asyncio.create_task(exchange.get_balance())
+    await asyncio.sleep(0)
+    cancelled_call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled_call
+    await asyncio.sleep(REQUEST_LATENCY * 2)
+    assert len(exchange.requests) == 2
+    assert kucoin_exchange._PENDING_REQUESTS == {}
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import decimal
 import typing
 
@@ -258,18 +259,27 @@ class Okx(exchanges.RestExchange):
         is_stop_order = kwargs.get("stop", False)
         if is_stop_order and self.connector.adapter.OKX_ORDER_TYPE not in kwargs:
             kwargs[self.connector.adapter.OKX_ORDER_TYPE] = self.connector.adapter.OKX_CONDITIONAL_ORDER_TYPE
-        regular_orders = await method(symbol=symbol, since=since, limit=limit, **kwargs)
         if is_stop_order:
             # only require stop orders
-            return regular_orders
-        # add order types of order (different param in api endpoint)
-        other_orders = []
+            return await method(symbol=symbol, since=since, limit=limit, **kwargs)
+        fetches = [method(symbol=symbol, since=since, limit=limit, **kwargs)]
         if self.exchange_manager.is_future:
+            # add order types of order (different param in api endpoint)
             # stop orders are futures only for now
-            for order_type in self._get_used_order_types():
-                kwargs["ordType"] = order_type
-                other_orders += await method(symbol=symbol, since=since, limit=limit, **kwargs)
-        return regular_orders + other_orders
+            fetches += [
+                method(symbol=symbol, since=since, limit=limit,
+                       **{**kwargs, self.connector.adapter.OKX_ORDER_TYPE: order_type})
+                for order_type in self._get_used_order_types()
+            ]
+        # concurrent requests are still delayed by the ccxt rate limiter when necessary
+        orders_by_type = await asyncio.gather(*fetches)
+        # the same order might be returned by different order type requests
+        orders_by_id = {}
+        for orders in orders_by_type:
+            for order in orders:
+                order_id = order.get(trading_enums.ExchangeConstantsOrderColumns.EXCHANGE_ID.value)
+                orders_by_id.setdefault(order_id if order_id is not None else id(order), order)
+        return list(orders_by_id.values())
 
     async def get_open_orders(self, symbol=None, since=None, limit=None, **kwargs) -> list:
         return await self._get_all_typed_orders(
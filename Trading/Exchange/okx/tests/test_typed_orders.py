@@ -0,0 +1,117 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+
+import mock
+import pytest
+
+import octobot_trading.enums as trading_enums
+from ...okx import okx_exchange
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+REQUEST_LATENCY = 0.1
+
+
+class FakeCCXTClient:
+    """
+    Returns open orders by okx order type after REQUEST_LATENCY
+    """
+
+    def __init__(self, orders_by_order_type):
+        self.orders_by_order_type = orders_by_order_type
+        self.requested_params = []
+
+    async def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        self.requested_params.append(params)
+        await asyncio.sleep(REQUEST_LATENCY)
+        return [
+            dict(order)
+            for order in self.orders_by_order_type.get(params.get(okx_exchange.OKXCCXTAdapter.OKX_ORDER_TYPE), [])
+        ]
+
+
+def _create_exchange(client, is_future):
+    exchange = okx_exchange.Okx.__new__(okx_exchange.Okx)
+    exchange.exchange_manager = mock.Mock(is_future=is_future)
+    exchange.connector = mock.Mock(client=client, adapter=okx_exchange.OKXCCXTAdapter)
+    return exchange
+
+
+def _get_open_orders_method(client):
+    async def get_open_orders(symbol=None, since=None, limit=None, **kwargs):
+        # adapted orders store exchange ids in EXCHANGE_ID
+        return [
+            {trading_enums.ExchangeConstantsOrderColumns.EXCHANGE_ID.value: order.pop("id"), **order}
+            for order in await client.fetch_open_orders(symbol=symbol, since=since, limit=limit, params=kwargs)
+        ]
+    return get_open_orders
+
+
+def _order(order_id, order_type):
+    return {"id": order_id, "type": order_type}
+
+
+async def _timed_get_all_typed_orders(exchange, **kwargs):
+    start = time.perf_counter()
+    orders = await exchange._get_all_typed_orders(
+        _get_open_orders_method(exchange.connector.client), symbol="BTC/USDT:USDT", **kwargs
+    )
+    return orders, time.perf_counter() - start
+
+
+async def test_get_all_typed_orders_concurrently():
+    client = FakeCCXTClient({
+        None: [_order("1", "limit"), _order("2", "limit"), _order("3", "stop_loss")],
+        okx_exchange.OKXCCXTAdapter.OKX_CONDITIONAL_ORDER_TYPE: [_order("3", "stop_loss"), _order("4", "stop_loss")],
+    })
+    exchange = _create_exchange(client, True)
+    with mock.patch.object(exchange, "_get_used_order_types", mock.Mock(return_value=[
+        okx_exchange.OKXCCXTAdapter.OKX_CONDITIONAL_ORDER_TYPE,
+        okx_exchange.OKXCCXTAdapter.OKX_OCO_ORDER_TYPE,
+    ])):
+        orders, elapsed = await _timed_get_all_typed_orders(exchange)
+    assert client.requested_params == [
+        {},
+        {okx_exchange.OKXCCXTAdapter.OKX_ORDER_TYPE: okx_exchange.OKXCCXTAdapter.OKX_CONDITIONAL_ORDER_TYPE},
+        {okx_exchange.OKXCCXTAdapter.OKX_ORDER_TYPE: okx_exchange.OKXCCXTAdapter.OKX_OCO_ORDER_TYPE},
+    ]
+    # de-duplicated orders
+    assert [order[trading_enums.ExchangeConstantsOrderColumns.EXCHANGE_ID.value] for order in orders] == \
+        ["1", "2", "3", "4"]
+    # requests are concurrent: sync latency is the latency of a single request
+    assert REQUEST_LATENCY <= elapsed < REQUEST_LATENCY * 2
+
+
+async def test_get_all_typed_orders_spot_and_stop_orders():
+    client = FakeCCXTClient({
+        None: [_order("1", "limit")],
+        okx_exchange.OKXCCXTAdapter.OKX_CONDITIONAL_ORDER_TYPE: [_order("2", "stop_loss")],
+    })
+    # spot: regular orders only
+    orders, _ = await _timed_get_all_typed_orders(_create_exchange(client, False))
+    assert [order[trading_enums.ExchangeConstantsOrderColumns.EXCHANGE_ID.value] for order in orders] == ["1"]
+    assert client.requested_params == [{}]
+
+    # stop orders: conditional orders only
+    client.requested_params = []
+    orders, _ = await _timed_get_all_typed_orders(_create_exchange(client, True), stop=True)
+    assert [order[trading_enums.ExchangeConstantsOrderColumns.EXCHANGE_ID.value] for order in orders] == ["2"]
+    assert client.requested_params == [
+        {"stop": True, okx_exchange.OKXCCXTAdapter.OKX_ORDER_TYPE: okx_exchange.OKXCCXTAdapter.OKX_CONDITIONAL_ORDER_TYPE}
+    ]
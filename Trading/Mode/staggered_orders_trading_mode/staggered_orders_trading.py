@@ -19,6 +19,7 @@ import dataclasses
 import math
 import asyncio
 import decimal
+import bisect
 
 import async_channel.constants as channel_constants
 import octobot_commons.constants as commons_constants
@@ -100,6 +101,138 @@ class OrderData:
     associated_entry_id: str = None
 
 
+class PriceIndex:
+    """
+    Price sorted index of orders or trades, used to find elements in a price range in O(log(n)).
+    Found elements are returned in their original order.
+    """
+
+    def __init__(self, elements, get_price):
+        self.elements = elements
+        self._size = len(elements)
+        # stable sort: equal prices keep their original order
+        self._positions = sorted(range(self._size), key=lambda position: get_price(elements[position]))
+        self._prices = [get_price(elements[position]) for position in self._positions]
+
+    def is_indexing(self, elements):
+        return self.elements is elements and self._size == len(elements)
+
+    def get_first_in_range(self, lower_price, higher_price, predicate=None):
+        """
+        :return: the first element (in original order) with a price in [lower_price, higher_price]
+        that satisfies predicate, None when not found
+        """
+        position = self.get_first_position_in_range(lower_price, higher_price, predicate)
+        return None if position is None else self.elements[position]
+
+    def get_first_position_in_range(self, lower_price, higher_price, predicate=None):
+        start = bisect.bisect_left(self._prices, lower_price)
+        end = bisect.bisect_right(self._prices, higher_price, lo=start)
+        for position in sorted(self._positions[start:end]):
+            if predicate is None or predicate(self.elements[position]):
+                return position
+        return None
+
+    def has_in_range(self, lower_price, higher_price):
+        start = bisect.bisect_left(self._prices, lower_price)
+        return start < self._size and self._prices[start] <= higher_price
+
+    def get_surrounding_elements(self, price):
+        """
+        Requires elements to be sorted by price
+        :return: the last element (not considering the first one) with a price lower or equal to price
+        and the following one, which is None when price is higher or equal to the highest price
+        """
+        following_position = bisect.bisect_right(self._prices, price, lo=1)
+        if following_position < self._size:
+            return self.elements[following_position - 1], self.elements[following_position]
+        return (self.elements[-1] if self.elements else None), None
+
+
+@dataclasses.dataclass
+class GridLevel:
+    price: decimal.Decimal
+    side: trading_enums.TradeOrderSide
+    order_id: str
+
+
+class GridState:
+    """
+    In-memory model of the open orders grid: one level per open order price, updated on orders updates.
+    The grid is synchronized when the last full orders analysis found no missing order. It remains synchronized
+    as long as filled orders are replaced by their mirror orders, any other change invalidates it.
+    """
+
+    def __init__(self):
+        self.levels = {}
+        self.pending_mirror_orders_count = 0
+        self.is_synchronized = False
+        self._level_price_by_order_id = {}
+
+    def synchronize(self, open_orders, is_complete):
+        self.levels = {}
+        self._level_price_by_order_id = {}
+        self.pending_mirror_orders_count = 0
+        self.is_synchronized = is_complete
+        for order in open_orders:
+            self._add_level(order.origin_price, order.side, order.order_id)
+
+    def invalidate(self):
+        self.is_synchronized = False
+
+    def is_up_to_date(self, open_orders) -> bool:
+        return (
+            self.is_synchronized
+            and self.pending_mirror_orders_count == 0
+            and len(open_orders) == len(self._level_price_by_order_id)
+            and all(order.order_id in self._level_price_by_order_id for order in open_orders)
+        )
+
+    def on_order_update(self, order: dict, is_from_bot: bool):
+        order_id = order[trading_enums.ExchangeConstantsOrderColumns.ID.value]
+        status = order[trading_enums.ExchangeConstantsOrderColumns.STATUS.value]
+        if status in (trading_enums.OrderStatus.OPEN.value, trading_enums.OrderStatus.PARTIALLY_FILLED.value):
+            if order_id in self._level_price_by_order_id:
+                # already known order
+                return
+            if self.pending_mirror_orders_count > 0:
+                # mirror order of a filled order
+                self.pending_mirror_orders_count -= 1
+            else:
+                # order created outside of mirror orders
+                self.invalidate()
+            self._add_level(
+                decimal.Decimal(str(order[trading_enums.ExchangeConstantsOrderColumns.PRICE.value])),
+                trading_enums.TradeOrderSide(order[trading_enums.ExchangeConstantsOrderColumns.SIDE.value]),
+                order_id
+            )
+        elif status == trading_enums.OrderStatus.FILLED.value:
+            self._remove_level(order_id)
+            if is_from_bot and order[trading_enums.ExchangeConstantsOrderColumns.TYPE.value] \
+                    == trading_enums.TradeOrderType.LIMIT.value:
+                # a mirror order is to be created
+                self.pending_mirror_orders_count += 1
+            else:
+                self.invalidate()
+        elif status not in (trading_enums.OrderStatus.PENDING_CREATION.value,
+                            trading_enums.OrderStatus.CANCELING.value):
+            # cancelled, closed, expired or rejected order
+            self._remove_level(order_id)
+            self.invalidate()
+
+    def _add_level(self, price, side, order_id):
+        if price in self.levels:
+            # 2 orders at the same price: not a valid grid
+            self.invalidate()
+        self.levels[price] = GridLevel(price, side, order_id)
+        self._level_price_by_order_id[order_id] = price
+
+    def _remove_level(self, order_id):
+        if (price := self._level_price_by_order_id.pop(order_id, None)) is not None:
+            if (level := self.levels.get(price)) is not None and level.order_id == order_id:
+                self.levels.pop(price)
+
+
 class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
     CONFIG_PAIR_SETTINGS = "pair_settings"
     CONFIG_PAIR = "pair"
@@ -238,6 +371,7 @@ class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
 
     async def _order_notification_callback(self, exchange, exchange_id, cryptocurrency, symbol, order,
                                            update_type, is_from_bot):
+        self.producers[0].grid_state.on_order_update(order, is_from_bot)
         if (
             order[trading_enums.ExchangeConstantsOrderColumns.STATUS.value] == trading_enums.OrderStatus.FILLED.value
             and order[trading_enums.ExchangeConstantsOrderColumns.TYPE.value] in (
@@ -529,6 +663,11 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         self._skip_order_restore_on_recently_closed_orders = True
         self._use_recent_trades_for_order_restore = False
         self.compensate_for_missed_mirror_order = False
+        # price indexes of the orders and trades of the current orders refresh
+        self._price_indexes = {}
+        # open orders grid model, used to skip full orders analysis when the grid is up to date
+        self.grid_state = GridState()
+        self._is_last_orders_analysis_complete = False
 
         self.healthy = False
 
@@ -816,11 +955,33 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             # already on exchange): only initialize increment and order fill events will do the rest
             self._set_increment_and_spread(current_price)
         else:
+            if self._is_grid_state_up_to_date(ignore_mirror_orders_only):
+                return
             async with self.producer_exchange_wide_lock(self.exchange_manager):
                 # use exchange level lock to prevent funds double spend
                 buy_orders, sell_orders = await self._generate_staggered_orders(current_price, ignore_available_funds)
                 staggered_orders = self._merged_and_sort_not_virtual_orders(buy_orders, sell_orders)
                 await self._create_not_virtual_orders(staggered_orders, current_price)
+                self._synchronize_grid_state(staggered_orders)
+
+    def _is_grid_state_up_to_date(self, ignore_mirror_orders_only):
+        # explicit orders creation triggers and funds redispatch always require a full orders analysis
+        if ignore_mirror_orders_only or self.allow_order_funds_redispatch:
+            return False
+        if self.grid_state.is_up_to_date(
+            self.exchange_manager.exchange_personal_data.orders_manager.get_open_orders(self.symbol)
+        ):
+            self.logger.debug(f"{self.symbol} {self.ORDERS_DESC} orders are up to date: skipping orders analysis")
+            return True
+        return False
+
+    def _synchronize_grid_state(self, created_orders):
+        # the grid is complete when the orders analysis didn't find any missing order
+        self.grid_state.synchronize(
+            self.exchange_manager.exchange_personal_data.orders_manager.get_open_orders(self.symbol),
+            self._is_last_orders_analysis_complete and not created_orders
+        )
+        self._is_last_orders_analysis_complete = False
 
     def _ensure_current_price_in_limit_parameters(self, current_price):
         message = None
@@ -1190,10 +1351,15 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         return trades_with_missing_mirror_order_fills
 
     def _analyse_current_orders_situation(self, sorted_orders, recently_closed_trades, lower_bound, higher_bound, current_price):
+        self._is_last_orders_analysis_complete = False
         if not sorted_orders:
             return None, self.NEW, None
         # check if orders are staggered orders
-        return self._bootstrap_parameters(sorted_orders, recently_closed_trades, lower_bound, higher_bound, current_price)
+        missing_orders, state, candidate_flat_increment = self._bootstrap_parameters(
+            sorted_orders, recently_closed_trades, lower_bound, higher_bound, current_price
+        )
+        self._is_last_orders_analysis_complete = state == self.FILL and not missing_orders
+        return missing_orders, state, candidate_flat_increment
 
     def _create_orders(self, lower_bound, upper_bound, side, sorted_orders,
                        current_price, missing_orders, state, allowed_funds, ignore_available_funds, recent_trades):
@@ -1268,16 +1434,9 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             missing_orders_around_spread = []
             for missing_order_price, missing_order_side in missing_orders:
                 if missing_order_side == side:
-                    previous_o = None
-                    following_o = None
-                    for o in sorted_orders:
-                        if previous_o is None:
-                            previous_o = o
-                        elif o.origin_price > missing_order_price:
-                            following_o = o
-                            break
-                        else:
-                            previous_o = o
+                    previous_o, following_o = self._get_orders_price_index(sorted_orders).get_surrounding_elements(
+                        missing_order_price
+                    )
                     if following_o is None or previous_o.side == following_o.side:
                         decimal_missing_order_price = decimal.Decimal(str(missing_order_price))
                         # missing order between similar orders
@@ -1429,14 +1588,11 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
 
     def _get_quantity_from_existing_orders(self, price, sorted_orders, selling):
         increment_window = self.flat_increment / 4
-        price_window_lower_bound = price - increment_window
-        price_window_higher_bound = price + increment_window
-        for order in sorted_orders:
-            if price_window_lower_bound <= order.origin_price <= price_window_higher_bound and (
-                order.side is (trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY)
-            ):
-                return order.origin_quantity
-        return None
+        side = trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY
+        order = self._get_orders_price_index(sorted_orders).get_first_in_range(
+            price - increment_window, price + increment_window, lambda o: o.side is side
+        )
+        return None if order is None else order.origin_quantity
 
     def _get_quantity_from_existing_boundary_orders(self, price, sorted_orders, selling):
         # Should be the last attempt: compute price from existing orders using cost
@@ -1468,22 +1624,33 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         increment_window = self.flat_increment / 4
         price_window_lower_bound = price - increment_window
         price_window_higher_bound = price + increment_window
-        for trade in trades:
-            is_sell_trade = trade.side == trading_enums.TradeOrderSide.SELL
-            if is_sell_trade == selling:
-                # same side
-                if price_window_lower_bound <= trade.executed_price <= price_window_higher_bound:
-                    # found the exact same trade
-                    return trade
-            else:
-                # different side: use spread to compute mirror order price
-                price_increment = self.flat_spread - self.flat_increment
-                mirror_order_price = (trade.executed_price - price_increment) \
-                    if is_sell_trade else (trade.executed_price + price_increment)
-                if price_window_lower_bound <= mirror_order_price <= price_window_higher_bound:
-                    # found mirror trade
-                    return trade
-        return None
+        price_increment = self.flat_spread - self.flat_increment
+        trades_index = self._get_trades_price_index(trades)
+        # found the exact same trade
+        same_side_trade_position = trades_index.get_first_position_in_range(
+            price_window_lower_bound, price_window_higher_bound,
+            lambda trade: (trade.side == trading_enums.TradeOrderSide.SELL) == selling
+        )
+        # different side: use spread to compute mirror order price
+        if selling:
+            # buy trade: mirror order price is executed_price + price_increment
+            mirror_trade_position = trades_index.get_first_position_in_range(
+                price_window_lower_bound - price_increment, price_window_higher_bound - price_increment,
+                lambda trade: trade.side != trading_enums.TradeOrderSide.SELL
+                and price_window_lower_bound <= trade.executed_price + price_increment <= price_window_higher_bound
+            )
+        else:
+            # sell trade: mirror order price is executed_price - price_increment
+            mirror_trade_position = trades_index.get_first_position_in_range(
+                price_window_lower_bound + price_increment, price_window_higher_bound + price_increment,
+                lambda trade: trade.side == trading_enums.TradeOrderSide.SELL
+                and price_window_lower_bound <= trade.executed_price - price_increment <= price_window_higher_bound
+            )
+        positions = [
+            position for position in (same_side_trade_position, mirror_trade_position) if position is not None
+        ]
+        # keep the first trade in trades order
+        return trades[min(positions)] if positions else None
 
     def _get_maximum_traded_funds(self, allowed_funds, total_available_funds, currency, selling, ignore_available_funds):
         to_trade_funds = total_available_funds
@@ -1735,10 +1902,21 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             return len(recently_closed_trades)
         else:
             inc = self.flat_spread * decimal.Decimal("1.5")
-            for trade in recently_closed_trades:
-                if trade.executed_price - inc <= price <= trade.executed_price + inc:
-                    return True
-        return False
+            # trade.executed_price - inc <= price <= trade.executed_price + inc
+            return self._get_trades_price_index(recently_closed_trades).has_in_range(price - inc, price + inc)
+
+    def _get_orders_price_index(self, sorted_orders) -> PriceIndex:
+        return self._get_price_index("orders", sorted_orders, lambda order: order.origin_price)
+
+    def _get_trades_price_index(self, trades) -> PriceIndex:
+        return self._get_price_index("trades", trades, lambda trade: trade.executed_price)
+
+    def _get_price_index(self, key, elements, get_price) -> PriceIndex:
+        # orders and trades lists are created once per orders refresh: index them once and reuse
+        # the index as long as the same list is given
+        if (price_index := self._price_indexes.get(key)) is None or not price_index.is_indexing(elements):
+            price_index = self._price_indexes[key] = PriceIndex(elements, get_price)
+        return price_index
 
     @staticmethod
     def _spread_in_recently_closed_order(min_amount, max_amount, sorted_closed_orders):
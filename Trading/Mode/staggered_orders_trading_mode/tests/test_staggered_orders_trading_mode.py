@@ -1489,6 +1489,192 @@ async def test_single_exchange_process_optimize_initial_portfolio():
         assert final_portfolio["USD"].available == decimal.Decimal("5545")
 
 
+async def test_price_index_lookups():
+    async with _get_tools("BTC/USD") as tools:
+        producer, _, exchange_manager = tools
+        producer.flat_increment = decimal.Decimal("10")
+        producer.flat_spread = decimal.Decimal("30")
+        producer._skip_order_restore_on_recently_closed_orders = True
+        buy, sell = trading_enums.TradeOrderSide.BUY, trading_enums.TradeOrderSide.SELL
+        sorted_orders = [
+            mock.Mock(origin_price=decimal.Decimal(str(price)), origin_quantity=decimal.Decimal(str(index)), side=side)
+            for index, (price, side) in enumerate(
+                [(100, buy), (110, buy), (110, buy), (140, buy), (190, sell), (200, sell), (230, sell)]
+            )
+        ]
+        # trades sorted by time, not by price
+        trades = [
+            mock.Mock(executed_price=decimal.Decimal(str(price)), side=side)
+            for price, side in [(150, sell), (120, buy), (130, buy), (180, sell), (150, sell), (121, buy)]
+        ]
+        for price in range(90, 250):
+            price = decimal.Decimal(str(price))
+            for selling in (True, False):
+                assert producer._get_quantity_from_existing_orders(price, sorted_orders, selling) == \
+                    _loop_get_quantity_from_existing_orders(producer, price, sorted_orders, selling)
+                assert producer._get_associated_trade(price, trades, selling) is \
+                    _loop_get_associated_trade(producer, price, trades, selling)
+            assert producer._is_just_closed_order(price, trades) is \
+                _loop_is_just_closed_order(producer, price, trades)
+            assert producer._get_orders_price_index(sorted_orders).get_surrounding_elements(price) == \
+                _loop_get_surrounding_orders(price, sorted_orders)
+        assert producer._is_just_closed_order(decimal.Decimal("150"), []) is False
+        # index is built once and rebuilt on other lists
+        orders_index = producer._get_orders_price_index(sorted_orders)
+        assert producer._get_orders_price_index(sorted_orders) is orders_index
+        assert producer._get_orders_price_index(sorted_orders[1:]) is not orders_index
+
+
+async def test_grid_state():
+    buy, sell = trading_enums.TradeOrderSide.BUY, trading_enums.TradeOrderSide.SELL
+    open_orders = [
+        mock.Mock(origin_price=decimal.Decimal(str(price)), side=side, order_id=str(price))
+        for price, side in [(90, buy), (100, buy), (120, sell), (130, sell)]
+    ]
+
+    def _order_update(order_id, price, side, status, order_type=trading_enums.TradeOrderType.LIMIT):
+        return {
+            trading_enums.ExchangeConstantsOrderColumns.ID.value: order_id,
+            trading_enums.ExchangeConstantsOrderColumns.PRICE.value: price,
+            trading_enums.ExchangeConstantsOrderColumns.SIDE.value: side.value,
+            trading_enums.ExchangeConstantsOrderColumns.STATUS.value: status.value,
+            trading_enums.ExchangeConstantsOrderColumns.TYPE.value: order_type.value,
+        }
+
+    grid_state = staggered_orders_trading.GridState()
+    assert grid_state.is_up_to_date([]) is False
+    grid_state.synchronize(open_orders, False)
+    assert grid_state.is_up_to_date(open_orders) is False
+    grid_state.synchronize(open_orders, True)
+    assert grid_state.is_up_to_date(open_orders) is True
+    assert grid_state.levels[decimal.Decimal("100")] == staggered_orders_trading.GridLevel(
+        decimal.Decimal("100"), buy, "100"
+    )
+    assert grid_state.is_up_to_date(open_orders[1:]) is False
+
+    # 100 buy order is filled and replaced by a 110 sell order
+    grid_state.on_order_update(_order_update("100", 100, buy, trading_enums.OrderStatus.FILLED), True)
+    assert decimal.Decimal("100") not in grid_state.levels
+    assert grid_state.is_up_to_date(open_orders[:1] + open_orders[2:]) is False
+    mirror_order = mock.Mock(origin_price=decimal.Decimal("110"), side=sell, order_id="110")
+    grid_state.on_order_update(_order_update("110", 110, sell, trading_enums.OrderStatus.OPEN), True)
+    # partially filled: already known order
+    grid_state.on_order_update(_order_update("110", 110, sell, trading_enums.OrderStatus.PARTIALLY_FILLED), True)
+    open_orders = open_orders[:1] + [mirror_order] + open_orders[2:]
+    assert grid_state.is_up_to_date(open_orders) is True
+    assert grid_state.levels[decimal.Decimal("110")].side is sell
+
+    # not mirrored order creation
+    grid_state.on_order_update(_order_update("140", 140, sell, trading_enums.OrderStatus.OPEN), True)
+    assert grid_state.is_synchronized is False
+    grid_state.synchronize(open_orders, True)
+    # cancelled order
+    grid_state.on_order_update(_order_update("90", 90, buy, trading_enums.OrderStatus.CANCELED), True)
+    assert decimal.Decimal("90") not in grid_state.levels
+    assert grid_state.is_up_to_date(open_orders[1:]) is False
+    grid_state.synchronize(open_orders, True)
+    # market order fill: no mirror order
+    grid_state.on_order_update(
+        _order_update("90", 90, buy, trading_enums.OrderStatus.FILLED, trading_enums.TradeOrderType.MARKET), True
+    )
+    assert grid_state.is_synchronized is False
+    grid_state.synchronize(open_orders, True)
+    # 2 orders at the same price
+    grid_state.on_order_update(_order_update("100", 100, buy, trading_enums.OrderStatus.FILLED), True)
+    grid_state.on_order_update(_order_update("other", 110, buy, trading_enums.OrderStatus.OPEN), True)
+    assert grid_state.is_synchronized is False
+
+
+async def test_skip_orders_analysis_when_grid_state_is_up_to_date():
+    async with _get_tools("BTC/USD", fees=0) as tools:
+        producer, _, exchange_manager = tools
+        producer.mode = staggered_orders_trading.StrategyModes.NEUTRAL
+        trading_api.force_set_mark_price(exchange_manager, producer.symbol, 100)
+        # orders creation
+        await producer._ensure_staggered_orders()
+        await asyncio.create_task(_wait_for_orders_creation(producer.operational_depth))
+        assert producer.grid_state.is_synchronized is False
+        # full analysis: no missing order
+        await producer._ensure_staggered_orders()
+        assert producer.grid_state.is_synchronized is True
+        with mock.patch.object(producer, "_generate_staggered_orders", mock.AsyncMock()) \
+                as _generate_staggered_orders_mock:
+            await producer._ensure_staggered_orders()
+            _generate_staggered_orders_mock.assert_not_called()
+
+            # filled order replaced by its mirror order
+            await _fill_order(trading_api.get_open_orders(exchange_manager)[-2], exchange_manager, producer=producer)
+            await asyncio.create_task(_wait_for_orders_creation(2))
+            await producer._ensure_staggered_orders()
+            _generate_staggered_orders_mock.assert_not_called()
+
+            # explicit orders creation
+            _generate_staggered_orders_mock.return_value = ([], [])
+            await producer.trigger_staggered_orders_creation()
+            _generate_staggered_orders_mock.assert_awaited_once()
+            _generate_staggered_orders_mock.reset_mock()
+
+        producer.grid_state.synchronize(trading_api.get_open_orders(exchange_manager), True)
+        # cancelled order
+        await exchange_manager.trader.cancel_order(trading_api.get_open_orders(exchange_manager)[0])
+        with mock.patch.object(producer, "_generate_staggered_orders", mock.AsyncMock(return_value=([], []))) \
+                as _generate_staggered_orders_mock:
+            await producer._ensure_staggered_orders()
+            _generate_staggered_orders_mock.assert_awaited_once()
+
+
+def _loop_get_quantity_from_existing_orders(producer, price, sorted_orders, selling):
+    # previous linear scan implementation
+    increment_window = producer.flat_increment / 4
+    for order in sorted_orders:
+        if price - increment_window <= order.origin_price <= price + increment_window and (
+            order.side is (trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY)
+        ):
+            return order.origin_quantity
+    return None
+
+
+def _loop_get_associated_trade(producer, price, trades, selling):
+    # previous linear scan implementation
+    increment_window = producer.flat_increment / 4
+    for trade in trades:
+        is_sell_trade = trade.side == trading_enums.TradeOrderSide.SELL
+        if is_sell_trade == selling:
+            if price - increment_window <= trade.executed_price <= price + increment_window:
+                return trade
+        else:
+            price_increment = producer.flat_spread - producer.flat_increment
+            mirror_order_price = (trade.executed_price - price_increment) \
+                if is_sell_trade else (trade.executed_price + price_increment)
+            if price - increment_window <= mirror_order_price <= price + increment_window:
+                return trade
+    return None
+
+
+def _loop_is_just_closed_order(producer, price, trades):
+    # previous linear scan implementation
+    inc = producer.flat_spread * decimal.Decimal("1.5")
+    for trade in trades:
+        if trade.executed_price - inc <= price <= trade.executed_price + inc:
+            return True
+    return False
+
+
+def _loop_get_surrounding_orders(price, sorted_orders):
+    # previous linear scan implementation
+    previous_o = None
+    following_o = None
+    for o in sorted_orders:
+        if previous_o is None:
+            previous_o = o
+        elif o.origin_price > price:
+            following_o = o
+            break
+        else:
+            previous_o = o
+    return previous_o, following_o
+
+
 async def _wait_for_orders_creation(orders_count=1):
     for _ in range(orders_count):
         await asyncio_tools.wait_asyncio_next_cycle()
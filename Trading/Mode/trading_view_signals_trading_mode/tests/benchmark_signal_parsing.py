@@ -0,0 +1,107 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Compares TradingViewSignalsTradingMode previous signal parsing to the cached signal parsing
+on a stream of alerts from many strategies.
+Run with: python -m tentacles.Trading.Mode.trading_view_signals_trading_mode.tests.benchmark_signal_parsing
+"""
+import time
+
+import tentacles.Trading.Mode as Mode
+
+SYMBOLS_COUNT = 50
+SIGNALS_PER_SYMBOL = 2000
+
+
+def _signals():
+    signals = []
+    for symbol_index in range(SYMBOLS_COUNT):
+        for signal_index in range(SIGNALS_PER_SYMBOL):
+            separator = ("\n", ";", "\\n")[signal_index % 3]
+            signals.append(separator.join((
+                "EXCHANGE=binance",
+                f"SYMBOL=COIN{symbol_index}USDT{'.P' if symbol_index % 2 else ''}",
+                f"SIGNAL={'buy' if signal_index % 2 else 'sell'}",
+                "ORDER_TYPE=limit",
+                f"PRICE={100 + signal_index * 0.01}",
+                "VOLUME=1%",
+                f"REDUCE_ONLY={'true' if signal_index % 5 else 'false'}",
+                f"TAG=strategy-{signal_index % 10}",
+            )))
+    return signals
+
+
+def _previous_parse_signal_data(mode_class, signal_data, errors):
+    parsed_data = {}
+    splittable_data = signal_data
+    final_split_char = mode_class.PARAM_SEPARATORS[0]
+    for split_char in mode_class.PARAM_SEPARATORS[1:]:
+        splittable_data = splittable_data.replace(split_char, final_split_char)
+    for line in splittable_data.split(final_split_char):
+        if not line.strip():
+            continue
+        values = line.split("=")
+        try:
+            value = values[1].strip()
+            lower_val = value.lower()
+            if lower_val in ("true", "false"):
+                value = lower_val == "true"
+            parsed_data[values[0].strip()] = value
+        except IndexError:
+            errors.append(f"Invalid signal line in trading view signal, ignoring it. Line: \"{line}\"")
+    if mode_class.SYMBOL_KEY in parsed_data:
+        symbol = parsed_data[mode_class.SYMBOL_KEY]
+        for suffix in mode_class.TRADINGVIEW_FUTURES_SUFFIXES:
+            if symbol.endswith(suffix):
+                parsed_data[mode_class.SYMBOL_KEY] = symbol.split(suffix)[0]
+                break
+    return parsed_data
+
+
+def run_previous_implementation(signals):
+    return [
+        _previous_parse_signal_data(Mode.TradingViewSignalsTradingMode, signal, [])
+        for signal in signals
+    ]
+
+
+def run_cached_parsing(signals):
+    return [
+        Mode.TradingViewSignalsTradingMode.parse_signal_data(signal, [])
+        for signal in signals
+    ]
+
+
+def _print_signals_per_second(name, function, signals):
+    start = time.perf_counter()
+    parsed_signals = function(signals)
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {len(signals)} signals in {elapsed * 1000:.2f}ms: {len(signals) / elapsed:.0f} signals/s")
+    return elapsed, parsed_signals
+
+
+def main():
+    signals = _signals()
+    print(f"{SYMBOLS_COUNT} symbols, {SIGNALS_PER_SYMBOL} signals per symbol")
+    previous_time, previous_signals = _print_signals_per_second("previous implementation",
+                                                                run_previous_implementation, signals)
+    cached_time, cached_signals = _print_signals_per_second("cached parsing", run_cached_parsing, signals)
+    assert previous_signals == cached_signals
+    print(f"x{previous_time / cached_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
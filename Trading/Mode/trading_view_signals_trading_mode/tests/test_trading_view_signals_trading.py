@@ -189,6 +189,33 @@ async def test_parse_signal_data():
     assert "nPLOp" not in str(errors[0])
     assert "KEY" not in str(errors[0])
 
+    errors = []
+    assert Mode.TradingViewSignalsTradingMode.parse_signal_data(
+        " SYMBOL = BTCUSDT.P ;PRICE=1=2;\\n;REDUCE_ONLY=TRUE",
+        errors
+    ) == {
+        "SYMBOL": "BTCUSDT",
+        "PRICE": "1",
+        "REDUCE_ONLY": True,
+    }
+    assert errors == []
+
+
+async def test_adapt_symbol():
+    for symbol, adapted_symbol in (
+        ("BTCUSDT.P", "BTCUSDT"),
+        ("BTCUSDT", "BTCUSDT"),
+        ("BTC/USDT", "BTC/USDT"),
+        # cached value
+        ("BTCUSDT.P", "BTCUSDT"),
+    ):
+        parsed_data = {Mode.TradingViewSignalsTradingMode.SYMBOL_KEY: symbol}
+        Mode.TradingViewSignalsTradingMode._adapt_symbol(parsed_data)
+        assert parsed_data == {Mode.TradingViewSignalsTradingMode.SYMBOL_KEY: adapted_symbol}
+    parsed_data = {}
+    Mode.TradingViewSignalsTradingMode._adapt_symbol(parsed_data)
+    assert parsed_data == {}
+
 
 async def test_trading_view_signal_callback(tools):
     exchange_manager, symbol, mode, producer, consumer = tools
@@ -14,6 +14,7 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import decimal
+import functools
 import math
 
 import async_channel.channels as channels
@@ -29,6 +30,36 @@ import octobot_trading.errors as trading_errors
 import octobot_trading.modes.script_keywords as script_keywords
 
 
+_SIGNAL_LINES_CACHE_SIZE = 4096
+_SYMBOLS_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=_SIGNAL_LINES_CACHE_SIZE)
+def _parse_signal_line(line):
+    """
+    :return: the (key, value) tuple of a KEY=VALUE signal line, None when the line is invalid.
+    Lines are cached: alerts from the same strategies keep sending the same lines.
+    """
+    key, separator, value = line.partition("=")
+    if not separator:
+        return None
+    # ignore anything after a second "="
+    value = value.partition("=")[0].strip()
+    # restore booleans
+    lower_val = value.lower()
+    if lower_val in ("true", "false"):
+        value = lower_val == "true"
+    return key.strip(), value
+
+
+@functools.lru_cache(maxsize=_SYMBOLS_CACHE_SIZE)
+def _get_adapted_symbol(symbol, suffixes: tuple):
+    for suffix in suffixes:
+        if symbol.endswith(suffix):
+            return symbol.split(suffix)[0]
+    return symbol
+
+
 class TradingViewSignalsTradingMode(trading_modes.AbstractTradingMode):
     SERVICE_FEED_CLASS = trading_view_service_feed.TradingViewServiceFeed
     TRADINGVIEW_FUTURES_SUFFIXES = [".P"]
@@ -132,11 +163,10 @@ class TradingViewSignalsTradingMode(trading_modes.AbstractTradingMode):
     def _adapt_symbol(cls, parsed_data):
         if cls.SYMBOL_KEY not in parsed_data:
             return
-        symbol = parsed_data[cls.SYMBOL_KEY]
-        for suffix in cls.TRADINGVIEW_FUTURES_SUFFIXES:
-            if symbol.endswith(suffix):
-                parsed_data[cls.SYMBOL_KEY] = symbol.split(suffix)[0]
-                return
+        # normalized symbols are cached: alerts keep sending the same symbols
+        parsed_data[cls.SYMBOL_KEY] = _get_adapted_symbol(
+            parsed_data[cls.SYMBOL_KEY], tuple(cls.TRADINGVIEW_FUTURES_SUFFIXES)
+        )
 
     @classmethod
     def parse_signal_data(cls, signal_data: str, errors: list) -> dict:
@@ -150,16 +180,11 @@ class TradingViewSignalsTradingMode(trading_modes.AbstractTradingMode):
             if not line.strip():
                 # ignore empty lines
                 continue
-            values = line.split("=")
-            try:
-                value = values[1].strip()
-                # restore booleans
-                lower_val = value.lower()
-                if lower_val in ("true", "false"):
-                    value = lower_val == "true"
-                parsed_data[values[0].strip()] = value
-            except IndexError:
+            parsed_line = _parse_signal_line(line)
+            if parsed_line is None:
                 errors.append(f"Invalid signal line in trading view signal, ignoring it. Line: \"{line}\"")
+                continue
+            parsed_data[parsed_line[0]] = parsed_line[1]
 
         cls._adapt_symbol(parsed_data)
         return parsed_data